@@ -1,8 +1,37 @@
-import random
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
+import mmap
 import os
+import random
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, NamedTuple
+
+# Moduł ładuje przy imporcie tylko lekkie moduły biblioteki standardowej.
+# NumPy, pandas, matplotlib oraz moduły współbieżności importowane są
+# w funkcjach, które ich potrzebują (zob. zmierz_czas_importu).
+if TYPE_CHECKING:
+    import argparse
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    import numpy as np
+    import pandas as pd
 
 NAZWA_PLIKU_FASTA = "sekwencje.txt"
 MIN_DLUGOSC_SEKWENCJI = 50
@@ -20,6 +49,369 @@ WYMAGANE_MIN_SEKWENCJI_DLA_OSTRZEZENIA = 30
 
 LICZBA_WYSWIETLANYCH_POCZATKOWYCH_SEKWENCJI = 5
 LICZBA_WYSWIETLANYCH_INFO_SEKWENCJI_OD_UZYTKOWNIKA = 3
+LICZBA_WYSWIETLANYCH_WIERSZY_TABELI = 100
+
+LIMIT_POWTORZEN_KOMUNIKATU = 10
+LICZBA_POZYCJI_PROFILU = 20
+PREFIKS_METRYK = "projekt"
+PREFIKSY_POZIOMOW_LOGOWANIA = {logging.WARNING: "OSTRZEŻENIE: ", logging.ERROR: "BŁĄD: "}
+
+KOD_ZNALEZIONO_PROBLEMY = 1
+KOD_BLEDU_ARGUMENTOW = 2
+KOD_BLEDU_ODCZYTU = 3
+
+MAKS_WPISOW_PAMIECI_PODRECZNEJ = 50_000_000
+LIMIT_PARAMETROW_SQLITE = 900
+DOKLADNOSC_LRU = 16
+
+ROZMIAR_BLOKU_ODCZYTU = 1 << 20
+ROZMIAR_BLOKU_BGZF = 0xFF00
+LICZBA_WATKOW_BGZF = 4
+BLOKI_BGZF_NA_WATEK = 4
+POZIOM_KOMPRESJI = 6
+ROZSZERZENIE_INDEKSU_BGZF = ".gzi"
+ROZSZERZENIA_KOMPRESJI = {".gz": "gzip", ".bgz": "bgzf", ".zst": "zstd"}
+FORMATY_KOMPRESJI = ("brak", "gzip", "bgzf", "zstd")
+MAGIA_ZSTD = b"\x28\xb5\x2f\xfd"
+ZNACZNIK_KONCA_BGZF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+ROZSZERZENIE_INDEKSU_FASTA = ".fai.projekt"
+ROZSZERZENIE_STANU_INDEKSU_FASTA = ".stan"
+ROZSZERZENIE_SKROTOW_PUNKTU_KONTROLNEGO = ".skroty"
+ROZMIAR_FRAGMENTU_PREFIKSU = 16 << 20
+FRAGMENTY_NA_PROCES = 4
+SEKWENCJE_FRAGMENTU_PAKOWANIA = 10_000
+DLUGOSC_SKROTU = 16
+LICZBA_PARTYCJI_DEDUPLIKACJI = 64
+ROZMIAR_PARTYCJI = 64 << 20
+MAKS_LICZBA_PARTYCJI = 512
+ZASADY_PARTII_PARTYCJI = 16 << 20
+SZACOWANY_STOPIEN_KOMPRESJI = 4
+NAGLOWEK_WPISU_PARTYCJI = struct.Struct(f"<QIQ{DLUGOSC_SKROTU}sII")
+NAGLOWEK_WYNIKU_PARTYCJI = struct.Struct("<QIQBBdIQII")
+STATUSY_WPISOW = ("Zachowana", "Duplikat", "Niepoprawna")
+KOLUMNY_TABELI_WPISOW = ("Plik", "Linia", "Nazwa", "Status", "Dlugosc", "Zawartosc_GC",
+                         "Typ_Sekwencji", "Zrodlo_duplikatu")
+
+DLUGOSC_KMERU_MINHASH = 12
+LICZBA_PERMUTACJI_MINHASH = 128
+PROG_BLISKICH_DUPLIKATOW = 0.5
+ROZMIAR_PARTII_MINHASH = 10_000
+ROZMIAR_PARTII_WYNIKOW = 100_000
+ROZMIAR_BLOKU_GENERATORA = 100_000
+ROZMIAR_PARTII_WCZYTYWANIA = 10_000
+ROZMIAR_KOLEJKI_WCZYTYWANIA = 8
+LICZBA_WATKOW_WCZYTYWANIA = 4
+ODSTEP_OBSERWACJI_KATALOGU = 1.0
+WZORZEC_PLIKOW_FASTA = "*.fa*"
+LICZBA_PRZEDZIALOW_DLUGOSCI = 256
+LICZBA_PRZEDZIALOW_GC = 100
+ETAPY_TESTU_WYDAJNOSCI = ("parsowanie", "walidacja", "zawartosc_gc", "deduplikacja",
+                          "budowa_tabeli", "wykresy")
+ROZMIARY_KORPUSOW_TESTOWYCH = (1_000, 100_000, 10_000_000)
+UDZIALY_WADLIWYCH_I_DUPLIKATOW_TESTOWYCH = ((0.01, 0.01), (0.25, 0.25))
+KATALOG_KORPUSOW_TESTOWYCH = "korpusy_testowe"
+TOLERANCJA_REGRESJI = 0.10
+MINIMALNY_CZAS_POROWNANIA = 0.05
+POWTORZENIA_POMIARU_IMPORTU = 7
+LICZBA_NAJWOLNIEJSZYCH_MODULOW = 5
+CIEZKIE_MODULY = ("numpy", "pandas", "matplotlib", "pyarrow", "zstandard", "asyncio",
+                  "concurrent", "multiprocessing", "sqlite3")
+PODSTAWA_SKROTU_KMEROW = 0x100000001B3
+MIESZANIE_SKROTU_KMEROW = 0xBF58476D1CE4E5B9
+MAKS_DLUGOSC_KMERU = 31
+MAKS_K_TABLICY_KMEROW = 10
+ZASADY_PARTII_KMEROW = 1 << 22
+DLUGOSC_KMERU_INDEKSU = 10
+MAKS_DLUGOSC_KMERU_INDEKSU = 13
+MAKS_ROZWINIEC_WZORCA = 1024
+ROZMIAR_FRAGMENTU_WERYFIKACJI = 1 << 22
+ROZSZERZENIE_INDEKSU_MOTYWOW = ".kmi"
+MAGIA_INDEKSU_MOTYWOW = b"PKMI0001"
+NAGLOWEK_INDEKSU_MOTYWOW = struct.Struct("<8sII6Qq")
+ROZSZERZENIA_PLIKOW_POMOCNICZYCH = (".fai", ROZSZERZENIE_INDEKSU_FASTA,
+                                    ROZSZERZENIE_INDEKSU_FASTA + ROZSZERZENIE_STANU_INDEKSU_FASTA,
+                                    ROZSZERZENIE_INDEKSU_BGZF, ROZSZERZENIE_INDEKSU_MOTYWOW)
+PRZESUNIECIE_PHRED = 33
+MAKS_JAKOSC_PHRED = 93
+DLUGOSC_OKNA_JAKOSCI = 4
+MAKS_DLUGOSC_OKNA_JAKOSCI = 64
+DLUGOSC_ODCZYTU_TESTOWEGO = 150
+ZNAKI_JAKOSCI = bytes(range(PRZESUNIECIE_PHRED, PRZESUNIECIE_PHRED + MAKS_JAKOSC_PHRED + 1))
+
+# Tablice przekodowań bajtów są typu bytes, a obliczenia czytają je przez
+# np.frombuffer, dzięki czemu import modułu nie wymaga NumPy.
+TABLICA_GC = bytes(bajt in b"GC" for bajt in range(256))
+TABLICA_NIEPOPRAWNYCH = bytes(bajt not in b"ATCG" for bajt in range(256))
+TABLICA_NIEPOPRAWNYCH_ODCZYTOW = bytes(bajt not in b"ATCGN" for bajt in range(256))
+TABLICA_KODOW_2BIT = bytes(max(b"ACGT".find(bajt), 0) for bajt in range(256))
+KODY_IUPAC = {"A": 1, "C": 2, "G": 4, "T": 8, "U": 8, "R": 5, "Y": 10, "S": 6, "W": 9,
+              "K": 12, "M": 3, "B": 14, "D": 13, "H": 11, "V": 7, "N": 15}
+TABLICA_BITOW_NUKLEOTYDOW = bytes(KODY_IUPAC[chr(bajt)] if chr(bajt) in "ACGT" else 0
+                                  for bajt in range(256))
+ALFABET_GENERATORA = b"ATCGNXZ"
+TYPY_SEKWENCJI = ("Bogata_w_AT", "Standardowa", "Bogata_w_GC")
+
+ALFABET_2BIT = b"ACGT"
+PRZESUNIECIA_2BIT = (6, 4, 2, 0)
+KODOWANIE_2BIT = [bytes.maketrans(ALFABET_2BIT, bytes(kod << przesuniecie for kod in range(4)))
+                  for przesuniecie in PRZESUNIECIA_2BIT]
+DEKODOWANIE_2BIT = [bytes(ALFABET_2BIT[(bajt >> przesuniecie) & 3] for bajt in range(256))
+                    for przesuniecie in PRZESUNIECIA_2BIT]
+GC_W_BAJCIE_2BIT = bytes(sum((bajt >> przesuniecie) & 3 in (1, 2)
+                             for przesuniecie in PRZESUNIECIA_2BIT)
+                         for bajt in range(256))
+WZORZEC_NIEPOPRAWNEGO_ZNAKU = re.compile("[^ACGT]")
+TABLICA_KOMPLEMENTARNOSCI = str.maketrans("ACGT", "TGCA")
+TABLICA_POPRAWNYCH_ZASAD_ODCZYTU = str.maketrans("", "", "ACGTN")
+
+
+dziennik = logging.getLogger("projekt")
+
+
+class FormatKomunikatow(logging.Formatter):
+    """
+    Formatuje komunikaty tak jak dotychczasowe wydruki programu:
+    ostrzeżenia i błędy poprzedzone są słowem "OSTRZEŻENIE:" lub "BŁĄD:".
+    """
+
+    def format(self, rekord: logging.LogRecord) -> str:
+        return PREFIKSY_POZIOMOW_LOGOWANIA.get(rekord.levelno, "") + super().format(rekord)
+
+
+class OgranicznikKomunikatow(logging.Filter):
+    """
+    Filtr dziennika przepuszczający najwyżej `limit` komunikatów o tym
+    samym szablonie (np. jedno ostrzeżenie na każdy wadliwy wpis).
+    Pozostałe są jedynie liczone, a podsumuj() wypisuje ich liczbę.
+
+    Atrybuty:
+        limit (int): Maksymalna liczba komunikatów o tym samym szablonie.
+        wystapienia (dict[tuple[int, str], int]): Liczba wystąpień każdego
+                                                  szablonu od ostatniego
+                                                  podsumowania.
+    """
+
+    def __init__(self, limit: int = LIMIT_POWTORZEN_KOMUNIKATU):
+        super().__init__()
+        self.limit = limit
+        self.wystapienia = {}
+
+    def filter(self, rekord: logging.LogRecord) -> bool:
+        klucz = (rekord.levelno, rekord.msg)
+        liczba = self.wystapienia.get(klucz, 0) + 1
+        self.wystapienia[klucz] = liczba
+        return liczba <= self.limit
+
+    def przepuszcza(self, poziom: int, szablon: str) -> bool:
+        """
+        Sprawdza, czy komunikat zostałby jeszcze wypisany. Jeśli nie,
+        zlicza go od razu, bez kosztownego tworzenia rekordu dziennika.
+
+        Args:
+            poziom (int): Poziom komunikatu.
+            szablon (str): Szablon komunikatu (przed podstawieniem argumentów).
+
+        Returns:
+            bool: True, jeśli limit dla szablonu nie został wyczerpany.
+        """
+        klucz = (poziom, szablon)
+        liczba = self.wystapienia.get(klucz, 0)
+        if liczba < self.limit:
+            return True
+        self.wystapienia[klucz] = liczba + 1
+        return False
+
+    def podsumuj(self):
+        """
+        Wypisuje liczbę pominiętych komunikatów i zeruje liczniki.
+        """
+        wystapienia, self.wystapienia = self.wystapienia, {}
+        for (poziom, szablon), liczba in wystapienia.items():
+            if liczba > self.limit:
+                dziennik.log(poziom, "Pominięto %d podobnych komunikatów: %s",
+                             liczba - self.limit,
+                             re.sub(r"%[-.0-9]*[sdf]", "…", str(szablon)).strip())
+
+
+class Metryki:
+    """
+    Liczniki i łączne czasy etapów przetwarzania (parsowanie, walidacja,
+    deduplikacja, budowa tabeli, wykresy), eksportowane jako JSON lub
+    w formacie tekstowym Prometheusa.
+
+    Atrybuty:
+        liczniki (dict[str, int]): Liczniki zdarzeń, np. wczytanych wpisów.
+        czasy (dict[str, float]): Łączny czas każdego etapu w sekundach.
+        wywolania (dict[str, int]): Liczba pomiarów każdego etapu.
+    """
+
+    def __init__(self):
+        self.liczniki = {}
+        self.czasy = {}
+        self.wywolania = {}
+
+    def zwieksz(self, nazwa: str, wartosc: int = 1):
+        """
+        Zwiększa licznik o podaną wartość.
+
+        Args:
+            nazwa (str): Nazwa licznika.
+            wartosc (int): Przyrost.
+        """
+        self.liczniki[nazwa] = self.liczniki.get(nazwa, 0) + wartosc
+
+    def dodaj_czas(self, etap: str, sekundy: float):
+        """
+        Dolicza czas do etapu.
+
+        Args:
+            etap (str): Nazwa etapu.
+            sekundy (float): Zmierzony czas.
+        """
+        self.czasy[etap] = self.czasy.get(etap, 0.0) + sekundy
+        self.wywolania[etap] = self.wywolania.get(etap, 0) + 1
+
+    @contextlib.contextmanager
+    def mierz(self, etap: str) -> Iterator[None]:
+        """
+        Mierzy czas wykonania bloku with i dolicza go do etapu.
+
+        Args:
+            etap (str): Nazwa etapu.
+        """
+        poczatek = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.dodaj_czas(etap, time.perf_counter() - poczatek)
+
+    def wyzeruj(self):
+        """
+        Usuwa wszystkie zebrane liczniki i czasy.
+        """
+        self.liczniki.clear()
+        self.czasy.clear()
+        self.wywolania.clear()
+
+    def do_json(self) -> str:
+        """
+        Returns:
+            str: Metryki jako dokument JSON.
+        """
+        return json.dumps({
+            "liczniki": self.liczniki,
+            "etapy": {etap: {"sekundy": czas, "wywolania": self.wywolania[etap]}
+                      for etap, czas in self.czasy.items()},
+        }, indent=2, ensure_ascii=False)
+
+    def do_prometheus(self) -> str:
+        """
+        Returns:
+            str: Metryki w formacie tekstowym Prometheusa.
+        """
+        linie = [f"# TYPE {PREFIKS_METRYK}_zdarzenia_total counter"]
+        linie += [f'{PREFIKS_METRYK}_zdarzenia_total{{nazwa="{nazwa}"}} {wartosc}'
+                  for nazwa, wartosc in self.liczniki.items()]
+        linie.append(f"# TYPE {PREFIKS_METRYK}_czas_etapu_sekundy_total counter")
+        linie += [f'{PREFIKS_METRYK}_czas_etapu_sekundy_total{{etap="{etap}"}} {czas:.6f}'
+                  for etap, czas in self.czasy.items()]
+        linie.append(f"# TYPE {PREFIKS_METRYK}_wywolania_etapu_total counter")
+        linie += [f'{PREFIKS_METRYK}_wywolania_etapu_total{{etap="{etap}"}} {liczba}'
+                  for etap, liczba in self.wywolania.items()]
+        return "\n".join(linie) + "\n"
+
+    def zapisz(self, sciezka: str, format_wyjscia: str = "json"):
+        """
+        Zapisuje metryki do pliku.
+
+        Args:
+            sciezka (str): Ścieżka pliku.
+            format_wyjscia (str): "json" lub "prometheus".
+        """
+        with open(sciezka, 'w', encoding='utf-8') as f:
+            f.write(self.do_prometheus() if format_wyjscia == "prometheus" else self.do_json())
+
+
+OGRANICZNIK_KOMUNIKATOW = OgranicznikKomunikatow()
+dziennik.addFilter(OGRANICZNIK_KOMUNIKATOW)
+METRYKI = Metryki()
+
+
+def loguj_z_limitem(poziom: int, szablon: str, *argumenty):
+    """
+    Wypisuje komunikat przez dziennik z limitem powtórzeń; przeznaczona
+    dla komunikatów wysyłanych dla każdego wpisu.
+
+    Args:
+        poziom (int): Poziom komunikatu.
+        szablon (str): Szablon komunikatu w stylu %.
+        *argumenty: Argumenty szablonu.
+    """
+    if OGRANICZNIK_KOMUNIKATOW.przepuszcza(poziom, szablon):
+        dziennik.log(poziom, szablon, *argumenty)
+
+
+def skonfiguruj_logowanie(poziom: int = logging.INFO):
+    """
+    Kieruje komunikaty programu na standardowe wyjście w dotychczasowym
+    formacie. Ponowne wywołanie jedynie zmienia poziom.
+
+    Args:
+        poziom (int): Minimalny poziom wypisywanych komunikatów.
+    """
+    obsluga = logging.StreamHandler(sys.stdout)
+    obsluga.setFormatter(FormatKomunikatow("%(message)s"))
+    dziennik.handlers[:] = [obsluga]
+    dziennik.setLevel(poziom)
+    dziennik.propagate = False
+
+
+@contextlib.contextmanager
+def profiluj(
+    sciezka_profilu: str | None = None, sledz_pamiec: bool = False,
+    liczba_pozycji: int = LICZBA_POZYCJI_PROFILU
+) -> Iterator[None]:
+    """
+    Opcjonalnie profiluje blok with: cProfile zapisuje profil do pliku
+    (do odczytu przez pstats lub snakeviz), a tracemalloc wskazuje linie,
+    które zaalokowały najwięcej pamięci. Najważniejsze pozycje trafiają
+    do dziennika.
+
+    Args:
+        sciezka_profilu (str | None): Plik profilu cProfile; None wyłącza
+                                      profilowanie czasu.
+        sledz_pamiec (bool): Czy śledzić alokacje przez tracemalloc.
+        liczba_pozycji (int): Liczba wypisywanych pozycji.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profil = cProfile.Profile() if sciezka_profilu else None
+    if sledz_pamiec:
+        tracemalloc.start()
+    if profil is not None:
+        profil.enable()
+    try:
+        yield
+    finally:
+        if profil is not None:
+            profil.disable()
+        if sledz_pamiec:
+            migawka = tracemalloc.take_snapshot()
+            _, szczyt = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            pozycje = migawka.statistics("lineno")[:liczba_pozycji]
+            dziennik.info("Szczytowe zużycie pamięci: %.1f MiB. Najwięcej pamięci "
+                          "zajmują obiekty zaalokowane w:\n%s", szczyt / 2 ** 20,
+                          "\n".join(f"  {pozycja}" for pozycja in pozycje))
+        if profil is not None:
+            profil.dump_stats(sciezka_profilu)
+            raport = io.StringIO()
+            pstats.Stats(profil, stream=raport).sort_stats("cumulative").print_stats(
+                liczba_pozycji)
+            dziennik.info("Profil zapisano do '%s'.\n%s", sciezka_profilu,
+                          raport.getvalue().strip())
 
 
 class SekwencjaDNA:
@@ -31,6 +423,8 @@ class SekwencjaDNA:
         sekwencja (str): Ciąg nukleotydów (ATCG).
     """
 
+    __slots__ = ("nazwa", "sekwencja")
+
     def __init__(self, nazwa: str, sekwencja: str):
         """
         Inicjalizuje obiekt SekwencjaDNA.
@@ -98,6 +492,243 @@ class SekwencjaDNA:
             return "Standardowa"
 
 
+def koduj_sekwencje_2bit(sekwencja: str) -> tuple[bytes, array | None, str]:
+    """
+    Koduje sekwencję po 2 bity na nukleotyd (A=0, C=1, G=2, T=3).
+
+    Znaki spoza ACGT trafiają do rzadkiej tabeli wyjątków, a w danych
+    spakowanych zastępowane są kodem A.
+
+    Args:
+        sekwencja (str): Sekwencja do zakodowania (wielkie litery).
+
+    Returns:
+        tuple[bytes, array | None, str]: Spakowane dane (4 nukleotydy na bajt),
+        pozycje znaków niepoprawnych (None, jeśli ich nie ma) oraz same te znaki.
+    """
+    pozycje_wyjatkow = None
+    znaki_wyjatkow = ""
+    if WZORZEC_NIEPOPRAWNEGO_ZNAKU.search(sekwencja):
+        trafienia = list(WZORZEC_NIEPOPRAWNEGO_ZNAKU.finditer(sekwencja))
+        pozycje_wyjatkow = array('I', (t.start() for t in trafienia))
+        znaki_wyjatkow = "".join(t.group() for t in trafienia)
+        sekwencja = WZORZEC_NIEPOPRAWNEGO_ZNAKU.sub("A", sekwencja)
+
+    surowe = sekwencja.encode('ascii') + b"A" * (-len(sekwencja) % 4)
+    spakowane = 0
+    for pozycja, tablica in enumerate(KODOWANIE_2BIT):
+        spakowane |= int.from_bytes(surowe[pozycja::4].translate(tablica), 'big')
+    spakowane = spakowane.to_bytes(len(surowe) // 4, 'big')
+    return spakowane, pozycje_wyjatkow, znaki_wyjatkow
+
+
+def dekoduj_sekwencje_2bit(
+    spakowane: bytes, dlugosc: int,
+    pozycje_wyjatkow: array | None = None, znaki_wyjatkow: str = ""
+) -> str:
+    """
+    Odtwarza sekwencję zakodowaną przez koduj_sekwencje_2bit.
+
+    Args:
+        spakowane (bytes): Spakowane dane (4 nukleotydy na bajt).
+        dlugosc (int): Długość oryginalnej sekwencji.
+        pozycje_wyjatkow (array | None): Pozycje znaków niepoprawnych.
+        znaki_wyjatkow (str): Znaki niepoprawne w kolejności pozycji.
+
+    Returns:
+        str: Odtworzona sekwencja.
+    """
+    surowe = bytearray(len(spakowane) * 4)
+    for pozycja, tablica in enumerate(DEKODOWANIE_2BIT):
+        surowe[pozycja::4] = spakowane.translate(tablica)
+    sekwencja = surowe[:dlugosc].decode('ascii')
+    if not znaki_wyjatkow:
+        return sekwencja
+    znaki = list(sekwencja)
+    for pozycja, znak in zip(pozycje_wyjatkow, znaki_wyjatkow):
+        znaki[pozycja] = znak
+    return "".join(znaki)
+
+
+class SekwencjaDNAKompaktowa(SekwencjaDNA):
+    """
+    Wariant SekwencjaDNA przechowujący nukleotydy po 2 bity na zasadę.
+
+    Niepoprawne znaki (np. N, X, Z) trzymane są w rzadkiej tabeli wyjątków,
+    a tekst sekwencji odtwarzany jest dopiero przy odczycie atrybutu
+    sekwencja. Długość, zawartość GC i poprawność liczone są bezpośrednio
+    na danych spakowanych.
+
+    Atrybuty:
+        nazwa (str): Nazwa sekwencji (nagłówek FASTA).
+        sekwencja (str): Ciąg nukleotydów, dekodowany przy każdym odczycie.
+    """
+
+    __slots__ = ("_spakowane", "_dlugosc", "_pozycje_wyjatkow", "_znaki_wyjatkow")
+
+    @property
+    def sekwencja(self) -> str:
+        return dekoduj_sekwencje_2bit(self._spakowane, self._dlugosc,
+                                      self._pozycje_wyjatkow, self._znaki_wyjatkow)
+
+    @sekwencja.setter
+    def sekwencja(self, wartosc: str):
+        self._dlugosc = len(wartosc)
+        (self._spakowane, self._pozycje_wyjatkow,
+         self._znaki_wyjatkow) = koduj_sekwencje_2bit(wartosc)
+
+    def pobierz_dlugosc(self) -> int:
+        return self._dlugosc
+
+    def oblicz_zawartosc_gc(self) -> float:
+        if not self._dlugosc:
+            return 0.0
+        ilosc_gc = sum(self._spakowane.translate(GC_W_BAJCIE_2BIT))
+        return (ilosc_gc / self._dlugosc) * 100
+
+    def jest_poprawna(self) -> bool:
+        return not self._znaki_wyjatkow
+
+
+class SekwencjaDNAZJakoscia(SekwencjaDNA):
+    """
+    Wariant SekwencjaDNA dla odczytów FASTQ, przechowujący jakość każdej
+    zasady w kodowaniu Phred+33.
+
+    Metody liczą jakość dla pojedynczego odczytu; odpowiadające im
+    obliczenia dla całych partii to oblicz_srednia_jakosc_bufora,
+    przytnij_oknem_bufora i maskuj_niska_jakosc.
+
+    Atrybuty:
+        nazwa (str): Nazwa odczytu (nagłówek FASTQ bez '@').
+        sekwencja (str): Ciąg nukleotydów.
+        jakosc (str): Znaki jakości, po jednym na nukleotyd.
+    """
+
+    __slots__ = ("jakosc",)
+
+    def __init__(self, nazwa: str, sekwencja: str, jakosc: str):
+        """
+        Inicjalizuje obiekt SekwencjaDNAZJakoscia.
+
+        Args:
+            nazwa (str): Nazwa odczytu.
+            sekwencja (str): Ciąg znaków reprezentujących sekwencję DNA.
+            jakosc (str): Znaki jakości Phred+33 tej samej długości
+                          co sekwencja; inna długość zgłasza ValueError.
+        """
+        super().__init__(nazwa, sekwencja)
+        self.jakosc = jakosc.strip()
+        if len(self.jakosc) != len(self.sekwencja):
+            raise ValueError(f"Długość jakości ({len(self.jakosc)}) różni się od "
+                             f"długości sekwencji ({len(self.sekwencja)}) "
+                             f"odczytu '{self.nazwa}'.")
+
+    def pobierz_jakosci(self) -> list[int]:
+        """
+        Dekoduje jakości Phred kolejnych zasad.
+
+        Returns:
+            list[int]: Jakość Phred każdej zasady.
+        """
+        return [ord(znak) - PRZESUNIECIE_PHRED for znak in self.jakosc]
+
+    def oblicz_srednia_jakosc(self) -> float:
+        """
+        Oblicza średnią jakość Phred odczytu.
+
+        Returns:
+            float: Średnia jakość. Zwraca 0.0 dla pustego odczytu.
+        """
+        if not self.jakosc:
+            return 0.0
+        return sum(self.pobierz_jakosci()) / len(self.jakosc)
+
+    def dlugosc_po_przycieciu(self, dlugosc_okna: int, prog: float) -> int:
+        """
+        Wyznacza długość odczytu po przycięciu oknem przesuwnym: odczyt
+        jest ucinany przed pierwszym oknem, którego średnia jakość jest
+        niższa niż prog. Odczyty krótsze niż okno nie są przycinane.
+
+        Args:
+            dlugosc_okna (int): Liczba zasad w oknie.
+            prog (float): Minimalna średnia jakość Phred w oknie.
+
+        Returns:
+            int: Liczba zasad, które pozostają.
+        """
+        jakosci = self.pobierz_jakosci()
+        for poczatek in range(len(jakosci) - dlugosc_okna + 1):
+            if sum(jakosci[poczatek:poczatek + dlugosc_okna]) < prog * dlugosc_okna:
+                return poczatek
+        return len(jakosci)
+
+    def jest_poprawna(self) -> bool:
+        """
+        Sprawdza, czy odczyt zawiera tylko A, T, C, G lub N. W odczytach N
+        oznacza zasadę nieodczytaną lub zamaskowaną (zob. maskuj_niska_jakosc)
+        i nie czyni odczytu wadliwym.
+
+        Returns:
+            bool: True, jeśli odczyt jest poprawny; False w przeciwnym razie.
+        """
+        return not self.sekwencja.translate(TABLICA_POPRAWNYCH_ZASAD_ODCZYTU)
+
+    def maskuj_niska_jakosc(self, prog: int) -> str:
+        """
+        Zwraca sekwencję, w której zasady o jakości niższej niż prog
+        zastąpiono przez N.
+
+        Args:
+            prog (int): Minimalna jakość Phred zasady.
+
+        Returns:
+            str: Zamaskowana sekwencja.
+        """
+        return "".join(nukleotyd if jakosc >= prog else "N"
+                       for nukleotyd, jakosc in zip(self.sekwencja, self.pobierz_jakosci()))
+
+
+def zmierz_pamiec_sekwencji(
+    liczba_sekwencji: int = 100_000, dlugosc: int = 150, ziarno: int = 0
+):
+    """
+    Porównuje zużycie pamięci oraz szybkość kodowania i dekodowania
+    SekwencjaDNA i SekwencjaDNAKompaktowa.
+
+    Args:
+        liczba_sekwencji (int): Liczba losowych sekwencji w teście.
+        dlugosc (int): Długość każdej sekwencji.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import tracemalloc
+
+    generator = random.Random(ziarno)
+    teksty = ["".join(generator.choices("ACGT", k=dlugosc))
+              for _ in range(liczba_sekwencji)]
+    liczba_zasad = liczba_sekwencji * dlugosc
+
+    print(f"\n--- Pamięć i przepustowość dla {liczba_sekwencji} sekwencji "
+          f"po {dlugosc} nt ---")
+    for klasa in (SekwencjaDNA, SekwencjaDNAKompaktowa):
+        tracemalloc.start()
+        start = time.perf_counter()
+        obiekty = [klasa(f"Sekwencja_{i + 1}", tekst) for i, tekst in enumerate(teksty)]
+        czas_kodowania = time.perf_counter() - start
+        zajeta_pamiec, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for obiekt_sekwencji in obiekty:
+            obiekt_sekwencji.sekwencja
+        czas_dekodowania = time.perf_counter() - start
+
+        print(f"  {klasa.__name__}: {zajeta_pamiec / liczba_zasad:.2f} B/nt, "
+              f"tworzenie {liczba_zasad / czas_kodowania / 1e6:.1f} Mnt/s, "
+              f"odczyt {liczba_zasad / max(czas_dekodowania, 1e-9) / 1e6:.1f} Mnt/s")
+        del obiekty
+
+
 def generuj_losowa_sekwencje_dna(
     dlugosc: int, wymus_niepoprawny_znak: bool = False
 ) -> str:
@@ -213,128 +844,1372 @@ def utworz_plik_fasta(
     print(f"Plik '{nazwa_pliku}' został utworzony pomyślnie.")
 
 
-def wczytaj_plik_fasta(nazwa_pliku: str) -> dict[str, SekwencjaDNA] | None:
+def generuj_sekwencje_wektorowo(
+    generator: np.random.Generator, dlugosci: np.ndarray,
+    zaszumione: np.ndarray | None = None, wymus_niepoprawny_znak: bool = False
+) -> tuple[bytes, np.ndarray]:
     """
-    Odczytuje sekwencje DNA z pliku FASTA.
+    Generuje naraz wiele losowych sekwencji DNA.
+
+    Semantyka odpowiada generuj_losowa_sekwencje_dna: sekwencje
+    zaszumione losują znaki spośród ATCG oraz N, X, Z, a przy wymuszeniu
+    jedna losowa pozycja każdej sekwencji dostaje niepoprawny znak.
 
     Args:
-        nazwa_pliku (str): Nazwa pliku FASTA do odczytania.
+        generator (np.random.Generator): Źródło losowości.
+        dlugosci (np.ndarray): Długości kolejnych sekwencji.
+        zaszumione (np.ndarray | None): Maska sekwencji z losowymi
+                                        nieprawidłowymi znakami.
+        wymus_niepoprawny_znak (bool): Czy wstawić niepoprawny znak
+                                       do każdej sekwencji.
 
     Returns:
-        dict[str, SekwencjaDNA] | None: Słownik zawierający nazwy sekwencji
-        jako klucze i obiekty SekwencjaDNA jako wartości. Zwraca None w
-        przypadku krytycznego błędu (np. plik nie istnieje) lub pusty słownik,
-        jeśli plik jest pusty lub nie zawiera poprawnych wpisów.
+        tuple[bytes, np.ndarray]: Złączone sekwencje oraz tablica
+        przesunięć o długości n + 1.
     """
-    sekwencje = {}
-    aktualna_nazwa = None
-    linie_aktualnej_sekwencji = []
-    numer_linii = 0
-
-    try:
-        if not os.path.exists(nazwa_pliku):
-            print(f"BŁĄD: Plik '{nazwa_pliku}' nie został znaleziony przed "
-                  "odczytem.")
-            return None
-
-        if os.path.getsize(nazwa_pliku) == 0:
-            print(f"OSTRZEŻENIE: Plik '{nazwa_pliku}' jest pusty.")
-            return {}
+    import numpy as np
 
-        with open(nazwa_pliku, 'r') as f:
-            for linia in f:
-                numer_linii += 1
-                linia = linia.strip()
-                if not linia:
-                    continue
-
-                if linia.startswith('>'):
-                    if aktualna_nazwa is not None:
-                        if not linie_aktualnej_sekwencji:
-                            print(f"OSTRZEŻENIE: Brak sekwencji dla nagłówka "
-                                  f"'{aktualna_nazwa}' przed linią "
-                                  f"{numer_linii}. Pomijam ten wpis.")
-                        else:
-                            sekwencje[aktualna_nazwa] = SekwencjaDNA(
-                                aktualna_nazwa, "".join(linie_aktualnej_sekwencji))
-                    aktualna_nazwa = linia[1:]
-                    if not aktualna_nazwa:
-                        print(f"OSTRZEŻENIE: Pusty nagłówek w linii "
-                              f"{numer_linii}. Ten wpis może zostać pominięty "
-                              "lub źle zinterpretowany.")
-                    linie_aktualnej_sekwencji = []
-                else:
-                    if aktualna_nazwa is None:
-                        print(f"OSTRZEŻENIE: Znaleziono linię sekwencji bez "
-                              "poprzedzającego nagłówka w linii "
-                              f"{numer_linii}: '{linia}'. Pomijam.")
-                        continue
-                    linie_aktualnej_sekwencji.append(linia)
-
-            if aktualna_nazwa is not None:
-                if not linie_aktualnej_sekwencji:
-                    print(f"OSTRZEŻENIE: Brak sekwencji dla ostatniego "
-                          f"nagłówka '{aktualna_nazwa}'. Pomijam ten wpis.")
-                else:
-                    sekwencje[aktualna_nazwa] = SekwencjaDNA(
-                        aktualna_nazwa, "".join(linie_aktualnej_sekwencji))
-            elif not sekwencje:
-                print(f"OSTRZEŻENIE: Plik '{nazwa_pliku}' nie zawiera żadnych "
-                      "poprawnych wpisów FASTA.")
+    przesuniecia = np.zeros(len(dlugosci) + 1, dtype=np.int64)
+    np.cumsum(dlugosci, out=przesuniecia[1:])
+    kody = generator.integers(0, 4, int(przesuniecia[-1]), dtype=np.uint8)
+    if zaszumione is not None and zaszumione.any():
+        maska = np.repeat(zaszumione, dlugosci)
+        kody[maska] = generator.integers(0, len(ALFABET_GENERATORA),
+                                         int(np.count_nonzero(maska)), dtype=np.uint8)
 
-    except FileNotFoundError:
-        print(f"BŁĄD: Plik '{nazwa_pliku}' nie został znaleziony. "
-              "Upewnij się, że jest w tym samym katalogu co skrypt.")
-        return None
-    except Exception as e:
-        print(f"Wystąpił błąd podczas odczytu pliku '{nazwa_pliku}': {e}")
-        return None
-    return sekwencje
+    if wymus_niepoprawny_znak:
+        niepuste = np.flatnonzero(dlugosci > 0)
+        pozycje = przesuniecia[niepuste] + (generator.random(len(niepuste))
+                                             * dlugosci[niepuste]).astype(np.int64)
+        kody[pozycje] = generator.integers(4, len(ALFABET_GENERATORA), len(niepuste))
+    return np.frombuffer(ALFABET_GENERATORA, dtype=np.uint8)[kody].tobytes(), przesuniecia
 
 
-def dodaj_sekwencje_uzytkownika(
-    slownik_sekwencji: dict[str, SekwencjaDNA], nazwa_pliku: str = NAZWA_PLIKU_FASTA
-) -> dict[str, SekwencjaDNA]:
+def generuj_blok_fasta(
+    ziarno: int, numer_bloku: int, pierwszy_numer: int, liczba_wpisow: int,
+    indeks_bazy_duplikatu: int = -1, sekwencja_bazy_duplikatu: bytes = b""
+) -> bytes:
     """
-    Prosi użytkownika o podanie własnej sekwencji DNA i dodaje ją
-    do pamięci programu oraz do pliku FASTA.
+    Generuje blok wpisów Sekwencja_{n} pliku FASTA.
+
+    Każdy blok ma własny strumień losowy wyznaczony przez ziarno i numer
+    bloku, więc wynik nie zależy od liczby procesów ani kolejności
+    generowania bloków.
 
     Args:
-        slownik_sekwencji (dict): Słownik istniejących sekwencji DNA.
-        nazwa_pliku (str): Nazwa pliku FASTA, do którego ma być dopisana sekwencja.
+        ziarno (int): Ziarno całego pliku.
+        numer_bloku (int): Numer bloku (od 0).
+        pierwszy_numer (int): Numer pierwszej sekwencji w bloku.
+        liczba_wpisow (int): Liczba wpisów w bloku.
+        indeks_bazy_duplikatu (int): Numer sekwencji, która ma być bazą
+                                     duplikatów (-1, jeśli brak).
+        sekwencja_bazy_duplikatu (bytes): Treść bazy duplikatów.
 
     Returns:
-        dict[str, SekwencjaDNA]: Zaktualizowany słownik sekwencji DNA.
+        bytes: Gotowy fragment pliku FASTA.
     """
-    print("\n--- Dodaj swoją sekwencję ---")
-    nazwa = input("Podaj nazwę dla Twojej sekwencji (np. Moja_Sekwencja): ").strip()
-    if not nazwa:
-        print("Nazwa sekwencji nie może być pusta. Anulowano dodawanie "
-              "sekwencji.")
-        return slownik_sekwencji
+    import numpy as np
 
-    dane_sekwencji = input("Wklej sekwencję DNA (tylko A, T, C, G): ").strip().upper()
+    generator = np.random.default_rng([ziarno, numer_bloku + 1])
+    dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                  liczba_wpisow)
+    zaszumione = (generator.random(liczba_wpisow)
+                  < PRAWDOPODOBIENSTWO_LOSOWYCH_NIEPRAWIDLOWYCH_ZNAKOW)
+    dane, przesuniecia = generuj_sekwencje_wektorowo(generator, dlugosci, zaszumione)
+    granice = przesuniecia.tolist()
 
-    if not dane_sekwencji:
-        print("Sekwencja nie może być pusta. Anulowano dodawanie sekwencji.")
-        return slownik_sekwencji
+    czesci = []
+    for i in range(liczba_wpisow):
+        numer = pierwszy_numer + i
+        czesci.append(f">Sekwencja_{numer}\n".encode())
+        if numer == indeks_bazy_duplikatu:
+            czesci.append(sekwencja_bazy_duplikatu)
+        else:
+            czesci.append(dane[granice[i]:granice[i + 1]])
+        czesci.append(b"\n")
+    return b"".join(czesci)
 
-    tymczasowy_obiekt_sekwencji = SekwencjaDNA(nazwa, dane_sekwencji)
-    if not tymczasowy_obiekt_sekwencji.jest_poprawna():
-        print("UWAGA: Twoja sekwencja zawiera nieprawidłowe znaki. Zostanie "
-              "oznaczona jako niepoprawna.")
 
-    if nazwa in slownik_sekwencji:
-        print(f"UWAGA: Sekwencja o nazwie '{nazwa}' już istnieje w pamięci. "
-              "Zostanie nadpisana.")
+def utworz_plik_fasta_wektorowo(
+    nazwa_pliku: str = NAZWA_PLIKU_FASTA,
+    liczba_wszystkich_sekwencji_do_wygenerowania: int = MIN_LOSOWYCH_SEKWENCJI,
+    ziarno: int = 0, procesy: int = 1
+):
+    """
+    Szybka odmiana utworz_plik_fasta do generowania dużych plików testowych.
 
-    slownik_sekwencji[nazwa] = tymczasowy_obiekt_sekwencji
-    print(f"Sekwencja '{nazwa}' została dodana do pamięci programu.")
+    Sekwencje powstają hurtowo z generatora numpy.random.Generator
+    i zapisywane są dużymi blokami, opcjonalnie generowanymi w wielu
+    procesach. Liczba duplikatów, wadliwych wpisów, prawdopodobieństwo
+    losowych błędów i zakres długości są takie jak w utworz_plik_fasta.
+    To samo ziarno zawsze daje ten sam plik, niezależnie od liczby procesów.
 
-    try:
-        with open(nazwa_pliku, 'a') as f:
-            f.write(f">{nazwa}\n{dane_sekwencji}\n")
-        print(f"Sekwencja '{nazwa}' została trwale dopisana do pliku "
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA do utworzenia.
+        liczba_wszystkich_sekwencji_do_wygenerowania (int): Całkowita liczba
+                                                           sekwencji w pliku.
+        ziarno (int): Ziarno generatora liczb losowych.
+        procesy (int): Liczba procesów generujących bloki.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+
+    liczba = liczba_wszystkich_sekwencji_do_wygenerowania
+    print(f"Tworzę plik '{nazwa_pliku}' z przykładowymi sekwencjami "
+          f"(łącznie {liczba} wpisów)...")
+    liczba_duplikatow = min(LICZBA_DUPLIKATOW_DO_DODANIA, liczba // 4)
+    liczba_niepoprawnych = min(LICZBA_NIEPOPRAWNYCH_DO_DODANIA, liczba // 4)
+    liczba_bazowych = max(liczba - liczba_duplikatow - liczba_niepoprawnych, 0)
+    if liczba_duplikatow > 0 and liczba_bazowych < 1:
+        liczba_bazowych = 1
+
+    generator = np.random.default_rng([ziarno, 0])
+    indeks_bazy_duplikatu = -1
+    sekwencja_bazy_duplikatu = b""
+    if liczba_duplikatow > 0:
+        indeks_bazy_duplikatu = int(generator.integers(1, liczba_bazowych + 1))
+        dlugosc = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1, 1)
+        zaszumiona = (generator.random(1)
+                      < PRAWDOPODOBIENSTWO_LOSOWYCH_NIEPRAWIDLOWYCH_ZNAKOW)
+        sekwencja_bazy_duplikatu, _ = generuj_sekwencje_wektorowo(
+            generator, dlugosc, zaszumiona)
+
+    bloki = [(ziarno, numer_bloku, poczatek + 1,
+              min(ROZMIAR_BLOKU_GENERATORA, liczba_bazowych - poczatek),
+              indeks_bazy_duplikatu, sekwencja_bazy_duplikatu)
+             for numer_bloku, poczatek in enumerate(
+                 range(0, liczba_bazowych, ROZMIAR_BLOKU_GENERATORA))]
+
+    with open(nazwa_pliku, 'wb') as f:
+        if procesy > 1:
+            with ProcessPoolExecutor(max_workers=procesy) as pula:
+                for poczatek in range(0, len(bloki), procesy * 2):
+                    okno = bloki[poczatek:poczatek + procesy * 2]
+                    for blok in pula.map(generuj_blok_fasta, *zip(*okno)):
+                        f.write(blok)
+        else:
+            for argumenty in bloki:
+                f.write(generuj_blok_fasta(*argumenty))
+
+        czesci = []
+        for i in range(1, liczba_duplikatow + 1):
+            czesci.append(f">Duplikat_A_{i}\n".encode() + sekwencja_bazy_duplikatu + b"\n")
+
+        dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                      liczba_niepoprawnych)
+        dane, przesuniecia = generuj_sekwencje_wektorowo(
+            generator, dlugosci, wymus_niepoprawny_znak=True)
+        for i in range(liczba_niepoprawnych):
+            czesci.append(f">Niepoprawna_{i + 1}\n".encode()
+                          + dane[przesuniecia[i]:przesuniecia[i + 1]] + b"\n")
+        f.write(b"".join(czesci))
+
+    print(f"Plik '{nazwa_pliku}' został utworzony pomyślnie.")
+
+
+def wykryj_kompresje(nazwa_pliku: str) -> str:
+    """
+    Rozpoznaje format kompresji pliku po jego pierwszych bajtach.
+
+    Args:
+        nazwa_pliku (str): Ścieżka pliku.
+
+    Returns:
+        str: "bgzf", "gzip", "zstd" lub "brak".
+    """
+    with open(nazwa_pliku, 'rb') as f:
+        naglowek = f.read(18)
+    if naglowek.startswith(MAGIA_ZSTD):
+        return "zstd"
+    if not naglowek.startswith(b"\x1f\x8b"):
+        return "brak"
+    if len(naglowek) == 18 and naglowek[3] & 4 and naglowek[12:14] == b"BC":
+        return "bgzf"
+    return "gzip"
+
+
+def kompresja_z_rozszerzenia(sciezka: str) -> str:
+    """
+    Dobiera format kompresji pliku wynikowego na podstawie rozszerzenia
+    (.gz, .bgz, .zst).
+
+    Args:
+        sciezka (str): Ścieżka pliku wynikowego.
+
+    Returns:
+        str: Format kompresji lub "brak".
+    """
+    return ROZSZERZENIA_KOMPRESJI.get(os.path.splitext(sciezka)[1].lower(), "brak")
+
+
+def zbuduj_indeks_bgzf(mapa: mmap.mmap | bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wyznacza granice bloków pliku BGZF, czytając wyłącznie ich nagłówki.
+
+    Args:
+        mapa (mmap.mmap | bytes): Zawartość pliku BGZF.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Przesunięcia początków bloków
+        w pliku skompresowanym i w danych rozpakowanych, każda z końcowym
+        elementem równym rozmiarowi całości.
+    """
+    import numpy as np
+
+    skompresowane = [0]
+    rozpakowane = [0]
+    przesuniecie = 0
+    while przesuniecie < len(mapa):
+        if mapa[przesuniecie:przesuniecie + 4] != b"\x1f\x8b\x08\x04":
+            raise OSError(f"Uszkodzony blok BGZF na bajcie {przesuniecie}.")
+        dlugosc_dodatkow, = struct.unpack_from("<H", mapa, przesuniecie + 10)
+        pole = przesuniecie + 12
+        rozmiar_bloku = None
+        while pole < przesuniecie + 12 + dlugosc_dodatkow:
+            identyfikator = mapa[pole:pole + 2]
+            dlugosc_pola, = struct.unpack_from("<H", mapa, pole + 2)
+            if identyfikator == b"BC":
+                rozmiar_bloku = struct.unpack_from("<H", mapa, pole + 4)[0] + 1
+            pole += 4 + dlugosc_pola
+        if rozmiar_bloku is None:
+            raise OSError(f"Blok na bajcie {przesuniecie} nie ma pola BC formatu BGZF.")
+        przesuniecie += rozmiar_bloku
+        skompresowane.append(przesuniecie)
+        rozpakowane.append(rozpakowane[-1]
+                           + struct.unpack_from("<I", mapa, przesuniecie - 4)[0])
+    return np.array(skompresowane, dtype=np.int64), np.array(rozpakowane, dtype=np.int64)
+
+
+def wczytaj_indeks_bgzf(
+    nazwa_pliku: str, mapa: mmap.mmap | bytes
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wczytuje indeks bloków BGZF z pliku .gzi (format bgzip) albo buduje
+    go i zapisuje, jeśli nie istnieje lub jest starszy niż plik danych.
+
+    Args:
+        nazwa_pliku (str): Ścieżka pliku BGZF.
+        mapa (mmap.mmap | bytes): Zawartość pliku BGZF.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Jak w zbuduj_indeks_bgzf.
+    """
+    import numpy as np
+
+    sciezka_indeksu = nazwa_pliku + ROZSZERZENIE_INDEKSU_BGZF
+    try:
+        if os.path.getmtime(sciezka_indeksu) >= os.path.getmtime(nazwa_pliku):
+            with open(sciezka_indeksu, 'rb') as f:
+                dane = f.read()
+            liczba, = struct.unpack_from("<Q", dane)
+            wpisy = np.frombuffer(dane, dtype="<u8", count=2 * liczba,
+                                  offset=8).astype(np.int64)
+            skompresowane = np.concatenate(([0], wpisy[0::2]))
+            rozpakowane = np.concatenate(([0], wpisy[1::2]))
+            # Bloki za ostatnim wpisem (np. pusty blok końca pliku, którego
+            # bgzip nie indeksuje) są odczytywane z nagłówków.
+            ogon_skompresowany, ogon_rozpakowany = zbuduj_indeks_bgzf(
+                mapa[skompresowane[-1]:])
+            return (np.concatenate((skompresowane[:-1], skompresowane[-1] + ogon_skompresowany)),
+                    np.concatenate((rozpakowane[:-1], rozpakowane[-1] + ogon_rozpakowany)))
+    except (OSError, ValueError, struct.error):
+        pass
+
+    skompresowane, rozpakowane = zbuduj_indeks_bgzf(mapa)
+    try:
+        with open(sciezka_indeksu, 'wb') as f:
+            wpisy = np.empty(2 * (len(skompresowane) - 2), dtype="<u8")
+            wpisy[0::2] = skompresowane[1:-1]
+            wpisy[1::2] = rozpakowane[1:-1]
+            f.write(struct.pack("<Q", len(wpisy) // 2) + wpisy.tobytes())
+    except OSError as e:
+        dziennik.warning("Nie udało się zapisać indeksu BGZF '%s': %s", sciezka_indeksu, e)
+    return skompresowane, rozpakowane
+
+
+def rozpakuj_blok_bgzf(blok: bytes) -> bytes:
+    """
+    Rozpakowuje pojedynczy blok BGZF i sprawdza jego sumę CRC32.
+    zlib zwalnia GIL, więc bloki mogą być rozpakowywane w wątkach.
+
+    Args:
+        blok (bytes): Cały blok (nagłówek, dane, CRC32 i ISIZE).
+
+    Returns:
+        bytes: Rozpakowane dane bloku.
+    """
+    dlugosc_dodatkow, = struct.unpack_from("<H", blok, 10)
+    dane = zlib.decompress(blok[12 + dlugosc_dodatkow:-8], -15)
+    crc, rozmiar = struct.unpack_from("<II", blok, len(blok) - 8)
+    if len(dane) != rozmiar or zlib.crc32(dane) != crc:
+        raise OSError("Niezgodna suma kontrolna bloku BGZF.")
+    return dane
+
+
+def spakuj_blok_bgzf(dane: bytes, poziom: int = POZIOM_KOMPRESJI) -> bytes:
+    """
+    Kompresuje dane (najwyżej ROZMIAR_BLOKU_BGZF bajtów) do jednego bloku
+    BGZF.
+
+    Args:
+        dane (bytes): Dane do skompresowania.
+        poziom (int): Poziom kompresji zlib.
+
+    Returns:
+        bytes: Kompletny blok BGZF.
+    """
+    kompresor = zlib.compressobj(poziom, zlib.DEFLATED, -15)
+    skompresowane = kompresor.compress(dane) + kompresor.flush()
+    return (struct.pack("<4sIBBHHHH", b"\x1f\x8b\x08\x04", 0, 0, 0xff, 6,
+                        0x4342, 2, len(skompresowane) + 25)
+            + skompresowane + struct.pack("<II", zlib.crc32(dane), len(dane)))
+
+
+class CzytnikBGZF(io.RawIOBase):
+    """
+    Strumień rozpakowanych danych pliku BGZF z dostępem swobodnym.
+
+    Bloki są rozpakowywane grupami w puli wątków, a kolejna grupa jest
+    przygotowywana z wyprzedzeniem, gdy bieżąca jest jeszcze czytana.
+    Pozycje (tell, seek) odnoszą się do danych rozpakowanych; blok
+    zawierający daną pozycję wyznaczany jest z indeksu .gzi.
+
+    Atrybuty:
+        nazwa_pliku (str): Ścieżka pliku BGZF.
+        rozmiar (int): Rozmiar danych po rozpakowaniu.
+    """
+
+    def __init__(self, nazwa_pliku: str, watki: int = LICZBA_WATKOW_BGZF):
+        """
+        Otwiera plik BGZF i wczytuje (lub buduje) indeks jego bloków.
+
+        Args:
+            nazwa_pliku (str): Ścieżka pliku BGZF.
+            watki (int): Liczba wątków rozpakowujących.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        super().__init__()
+        self.nazwa_pliku = nazwa_pliku
+        self._plik = open(nazwa_pliku, 'rb')
+        self._mapa = (mmap.mmap(self._plik.fileno(), 0, access=mmap.ACCESS_READ)
+                      if os.path.getsize(nazwa_pliku) else b"")
+        self._skompresowane, self._rozpakowane = wczytaj_indeks_bgzf(nazwa_pliku, self._mapa)
+        self.rozmiar = int(self._rozpakowane[-1])
+        self._bloki_w_grupie = max(1, watki) * BLOKI_BGZF_NA_WATEK
+        self._pula = ThreadPoolExecutor(max_workers=watki) if watki > 1 else None
+        self._pozycja = 0
+        self._bufor = b""
+        self._poczatek_bufora = 0
+        self._nastepna_grupa = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pozycja
+
+    def seek(self, przesuniecie: int, skad: int = io.SEEK_SET) -> int:
+        if skad == io.SEEK_CUR:
+            przesuniecie += self._pozycja
+        elif skad == io.SEEK_END:
+            przesuniecie += self.rozmiar
+        self._pozycja = max(0, przesuniecie)
+        return self._pozycja
+
+    def _rozpakuj_grupe(self, pierwszy_blok: int) -> tuple[int, Callable[[], list[bytes]]]:
+        """
+        Zleca rozpakowanie grupy bloków od pierwszy_blok.
+
+        Returns:
+            tuple[int, Callable]: Numer pierwszego bloku oraz funkcja
+            zwracająca rozpakowane bloki (czekająca na wątki).
+        """
+        ostatni_blok = min(pierwszy_blok + self._bloki_w_grupie, len(self._skompresowane) - 1)
+        bloki = [self._mapa[self._skompresowane[i]:self._skompresowane[i + 1]]
+                 for i in range(pierwszy_blok, ostatni_blok)]
+        if self._pula is None:
+            return pierwszy_blok, lambda: [rozpakuj_blok_bgzf(blok) for blok in bloki]
+        zadania = [self._pula.submit(rozpakuj_blok_bgzf, blok) for blok in bloki]
+        return pierwszy_blok, lambda: [zadanie.result() for zadanie in zadania]
+
+    def _wczytaj_grupe(self):
+        """
+        Ustawia bufor na grupę bloków zawierającą bieżącą pozycję i zleca
+        rozpakowanie następnej grupy.
+        """
+        import numpy as np
+
+        pierwszy_blok = int(np.searchsorted(self._rozpakowane, self._pozycja,
+                                            side='right')) - 1
+        if self._nastepna_grupa is not None and self._nastepna_grupa[0] == pierwszy_blok:
+            bloki = self._nastepna_grupa[1]()
+        else:
+            bloki = self._rozpakuj_grupe(pierwszy_blok)[1]()
+        self._bufor = b"".join(bloki)
+        self._poczatek_bufora = int(self._rozpakowane[pierwszy_blok])
+        nastepny_blok = pierwszy_blok + len(bloki)
+        self._nastepna_grupa = (self._rozpakuj_grupe(nastepny_blok)
+                                if nastepny_blok < len(self._skompresowane) - 1 else None)
+
+    def readinto(self, bufor) -> int:
+        if self._pozycja >= self.rozmiar:
+            return 0
+        if not 0 <= self._pozycja - self._poczatek_bufora < len(self._bufor):
+            self._wczytaj_grupe()
+        poczatek = self._pozycja - self._poczatek_bufora
+        dane = self._bufor[poczatek:poczatek + len(bufor)]
+        bufor[:len(dane)] = dane
+        self._pozycja += len(dane)
+        return len(dane)
+
+    def close(self):
+        if self.closed:
+            return
+        if self._pula is not None:
+            self._pula.shutdown(cancel_futures=True)
+        self._bufor = b""
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._plik.close()
+        super().close()
+
+
+class PisarzBGZF(io.RawIOBase):
+    """
+    Strumień zapisujący dane jako plik BGZF (zgodny z bgzip), z kompresją
+    bloków w puli wątków. Zamknięcie dopisuje pusty blok końca pliku.
+    """
+
+    def __init__(
+        self, sciezka: str, dopisz: bool = False, watki: int = LICZBA_WATKOW_BGZF,
+        poziom: int = POZIOM_KOMPRESJI
+    ):
+        """
+        Args:
+            sciezka (str): Ścieżka pliku wynikowego.
+            dopisz (bool): Dopisz nowe bloki na końcu istniejącego pliku.
+            watki (int): Liczba wątków kompresujących.
+            poziom (int): Poziom kompresji zlib.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        super().__init__()
+        self._plik = open(sciezka, 'ab' if dopisz else 'wb')
+        self._poziom = poziom
+        self._bufor = bytearray()
+        self._bloki_w_grupie = max(1, watki) * BLOKI_BGZF_NA_WATEK
+        self._pula = ThreadPoolExecutor(max_workers=watki) if watki > 1 else None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dane) -> int:
+        self._bufor += dane
+        if len(self._bufor) >= self._bloki_w_grupie * ROZMIAR_BLOKU_BGZF:
+            self._zapisz_pelne_bloki()
+        return len(dane)
+
+    def _zapisz_pelne_bloki(self, wszystkie: bool = False):
+        """
+        Kompresuje i zapisuje pełne bloki z bufora (lub wszystkie dane,
+        jeśli wszystkie jest prawdziwe).
+        """
+        koniec = len(self._bufor) if wszystkie else (
+            len(self._bufor) // ROZMIAR_BLOKU_BGZF * ROZMIAR_BLOKU_BGZF)
+        fragmenty = [bytes(self._bufor[i:i + ROZMIAR_BLOKU_BGZF])
+                     for i in range(0, koniec, ROZMIAR_BLOKU_BGZF)]
+        del self._bufor[:koniec]
+        poziomy = itertools.repeat(self._poziom)
+        bloki = (map(spakuj_blok_bgzf, fragmenty, poziomy) if self._pula is None
+                 else self._pula.map(spakuj_blok_bgzf, fragmenty, poziomy))
+        self._plik.writelines(bloki)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._zapisz_pelne_bloki(wszystkie=True)
+            self._plik.write(ZNACZNIK_KONCA_BGZF)
+        finally:
+            if self._pula is not None:
+                self._pula.shutdown()
+            self._plik.close()
+            super().close()
+
+
+def otworz_plik_wejsciowy(nazwa_pliku: str, watki: int = LICZBA_WATKOW_BGZF) -> BinaryIO:
+    """
+    Otwiera plik do odczytu binarnego, rozpakowując go w locie, jeśli
+    jest skompresowany (gzip, BGZF lub zstd).
+
+    Args:
+        nazwa_pliku (str): Ścieżka pliku.
+        watki (int): Liczba wątków rozpakowujących bloki BGZF.
+
+    Returns:
+        BinaryIO: Strumień danych rozpakowanych.
+    """
+    kompresja = wykryj_kompresje(nazwa_pliku)
+    if kompresja == "bgzf":
+        return io.BufferedReader(CzytnikBGZF(nazwa_pliku, watki), ROZMIAR_BLOKU_ODCZYTU)
+    if kompresja == "gzip":
+        return gzip.open(nazwa_pliku, 'rb')
+    if kompresja == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise OSError(f"Odczyt pliku zstd '{nazwa_pliku}' wymaga biblioteki "
+                          "zstandard.") from None
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(nazwa_pliku, 'rb'), read_across_frames=True, closefd=True)
+    return open(nazwa_pliku, 'rb')
+
+
+def otworz_plik_wyjsciowy(
+    sciezka: str, kompresja: str = "brak", dopisz: bool = False,
+    watki: int = LICZBA_WATKOW_BGZF
+) -> io.TextIOBase:
+    """
+    Otwiera plik tekstowy do zapisu, opcjonalnie kompresowany. Dopisanie
+    do pliku gzip lub zstd tworzy kolejny człon (ramkę), co oba formaty
+    dopuszczają.
+
+    Args:
+        sciezka (str): Ścieżka pliku wynikowego.
+        kompresja (str): "brak", "gzip", "bgzf" lub "zstd".
+        dopisz (bool): Dopisz na końcu istniejącego pliku.
+        watki (int): Liczba wątków kompresujących bloki BGZF.
+
+    Returns:
+        io.TextIOBase: Plik tekstowy (UTF-8).
+    """
+    tryb = 'a' if dopisz else 'w'
+    if kompresja == "brak":
+        return open(sciezka, tryb, encoding='utf-8')
+    if kompresja == "gzip":
+        return gzip.open(sciezka, tryb + 't', compresslevel=POZIOM_KOMPRESJI, encoding='utf-8')
+    if kompresja == "bgzf":
+        return io.TextIOWrapper(io.BufferedWriter(PisarzBGZF(sciezka, dopisz, watki)),
+                                encoding='utf-8')
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError(f"Zapis pliku zstd '{sciezka}' wymaga biblioteki zstandard.") from None
+    return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(
+        open(sciezka, tryb + 'b'), closefd=True), encoding='utf-8')
+
+
+def zmierz_kompresje(
+    liczba_sekwencji: int = 500_000, watki: int = LICZBA_WATKOW_BGZF, ziarno: int = 0
+):
+    """
+    Mierzy przepustowość zapisu, rozpakowywania i parsowania plików FASTA
+    dla każdego formatu kompresji (w MB/s danych nieskompresowanych).
+    Parsowanie (iteruj_plik_fasta) zawsze rozpakowuje BGZF domyślną
+    liczbą wątków.
+
+    Args:
+        liczba_sekwencji (int): Liczba wpisów pliku testowego.
+        watki (int): Liczba wątków dla BGZF.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as katalog:
+        zrodlo = os.path.join(katalog, "zrodlo.fa")
+        with contextlib.redirect_stdout(io.StringIO()):
+            utworz_plik_fasta_wektorowo(zrodlo, liczba_sekwencji, ziarno)
+        with open(zrodlo, encoding='utf-8') as f:
+            tekst = f.read()
+        megabajty = len(tekst.encode()) / 2 ** 20
+        print(f"\n--- Kompresja: {liczba_sekwencji} wpisów, {megabajty:.1f} MB ---")
+
+        for kompresja, liczba_watkow in (("brak", 1), ("gzip", 1), ("bgzf", 1),
+                                         ("bgzf", watki), ("zstd", 1)):
+            sciezka = os.path.join(katalog, f"dane_{kompresja}_{liczba_watkow}.fa")
+            try:
+                start = time.perf_counter()
+                with otworz_plik_wyjsciowy(sciezka, kompresja, watki=liczba_watkow) as f:
+                    f.write(tekst)
+                czas_zapisu = time.perf_counter() - start
+
+                start = time.perf_counter()
+                with otworz_plik_wejsciowy(sciezka, liczba_watkow) as f:
+                    while f.read(ROZMIAR_BLOKU_ODCZYTU):
+                        pass
+                czas_odczytu = time.perf_counter() - start
+            except OSError as e:
+                print(f"  {kompresja}: pominięto ({e})")
+                continue
+
+            start = time.perf_counter()
+            liczba_wpisow = sum(1 for _ in iteruj_plik_fasta(sciezka))
+            czas_parsowania = time.perf_counter() - start
+
+            opis = kompresja if kompresja != "bgzf" else f"bgzf, wątki: {liczba_watkow}"
+            print(f"  {opis}: rozmiar {os.path.getsize(sciezka) / 2 ** 20:.1f} MB, "
+                  f"zapis {megabajty / czas_zapisu:.0f} MB/s, "
+                  f"odczyt {megabajty / czas_odczytu:.0f} MB/s, "
+                  f"odczyt z parsowaniem {megabajty / czas_parsowania:.0f} MB/s "
+                  f"({liczba_wpisow} wpisów)")
+
+
+def iteruj_linie_binarnie(
+    plik: BinaryIO, rozmiar_bloku: int = ROZMIAR_BLOKU_ODCZYTU, koniec: int | None = None
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Dzieli plik otwarty w trybie binarnym na linie, czytając go dużymi blokami.
+
+    Args:
+        plik (BinaryIO): Plik otwarty w trybie 'rb'.
+        rozmiar_bloku (int): Liczba bajtów wczytywanych jednorazowo z dysku.
+        koniec (int | None): Przesunięcie, na którym kończy się odczyt.
+                             Domyślnie koniec pliku.
+
+    Yields:
+        tuple[int, bytes]: Przesunięcie początku linii w bajtach oraz
+        surowa zawartość linii (bez znaku nowej linii).
+    """
+    przesuniecie = plik.tell()
+    pozostalo = -1 if koniec is None else koniec - przesuniecie
+    reszta = b""
+    while True:
+        blok = plik.read(rozmiar_bloku if pozostalo < 0 else min(rozmiar_bloku, pozostalo))
+        pozostalo -= len(blok)
+        if not blok:
+            if reszta:
+                yield przesuniecie, reszta
+            return
+        blok = reszta + blok
+        koniec = blok.rfind(b"\n")
+        if koniec == -1:
+            reszta = blok
+            continue
+        for surowa_linia in blok[:koniec].split(b"\n"):
+            yield przesuniecie, surowa_linia
+            przesuniecie += len(surowa_linia) + 1
+        reszta = blok[koniec + 1:]
+
+
+def iteruj_plik_fasta(
+    nazwa_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU_ODCZYTU,
+    poczatek: int = 0, koniec: int | None = None, numer_linii: int = 0
+) -> Iterator[SekwencjaDNA]:
+    """
+    Strumieniowo odczytuje sekwencje DNA z pliku FASTA, zwracając
+    je po jednej (zob. iteruj_wpisy_fasta).
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA do odczytania.
+        rozmiar_bloku (int): Liczba bajtów wczytywanych jednorazowo z dysku.
+        poczatek (int): Przesunięcie (początek linii), od którego zaczyna
+                        się odczyt.
+        koniec (int | None): Przesunięcie, na którym kończy się odczyt.
+                             Domyślnie koniec pliku.
+        numer_linii (int): Liczba linii przed przesunięciem poczatek.
+
+    Yields:
+        SekwencjaDNA: Kolejne poprawnie zbudowane wpisy z pliku.
+    """
+    for _, obiekt_sekwencji in iteruj_wpisy_fasta(nazwa_pliku, rozmiar_bloku, poczatek,
+                                                  koniec, numer_linii):
+        yield obiekt_sekwencji
+
+
+def iteruj_wpisy_fasta(
+    nazwa_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU_ODCZYTU,
+    poczatek: int = 0, koniec: int | None = None, numer_linii: int = 0
+) -> Iterator[tuple[int, SekwencjaDNA]]:
+    """
+    Strumieniowo odczytuje sekwencje DNA z pliku FASTA, zwracając
+    je po jednej wraz z numerem linii nagłówka.
+
+    Plik jest czytany binarnie dużymi blokami, a w pamięci trzymany jest
+    tylko bieżący wpis, więc zużycie pamięci nie zależy od rozmiaru pliku.
+    Ostrzeżenia zawierają numer linii oraz przesunięcie w bajtach.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA do odczytania.
+        rozmiar_bloku (int): Liczba bajtów wczytywanych jednorazowo z dysku.
+        poczatek (int): Przesunięcie (początek linii), od którego zaczyna
+                        się odczyt.
+        koniec (int | None): Przesunięcie, na którym kończy się odczyt.
+                             Domyślnie koniec pliku.
+        numer_linii (int): Liczba linii przed przesunięciem poczatek,
+                           używana w numeracji linii w ostrzeżeniach.
+
+    Yields:
+        tuple[int, SekwencjaDNA]: Numer linii nagłówka (od 1) i kolejny
+        poprawnie zbudowany wpis z pliku.
+    """
+    aktualna_nazwa = None
+    bajt_naglowka = linia_naglowka = 0
+    linie_aktualnej_sekwencji = []
+    liczba_wpisow = 0
+    # Czas parsowania nie obejmuje czasu, w którym generator jest wstrzymany.
+    czas_parsowania = 0.0
+    wznowienie = time.perf_counter()
+
+    with otworz_plik_wejsciowy(nazwa_pliku) as f:
+        if poczatek:
+            f.seek(poczatek)
+        for poczatek_linii, surowa_linia in iteruj_linie_binarnie(f, rozmiar_bloku, koniec):
+            numer_linii += 1
+            linia = surowa_linia.strip()
+            if not linia:
+                continue
+
+            if linia.startswith(b'>'):
+                if aktualna_nazwa is not None:
+                    if not linie_aktualnej_sekwencji:
+                        METRYKI.zwieksz("ostrzezenia_parsera")
+                        loguj_z_limitem(logging.WARNING,
+                                        "Brak sekwencji dla nagłówka '%s' (bajt %d) "
+                                        "przed linią %d. Pomijam ten wpis.",
+                                        aktualna_nazwa, bajt_naglowka, numer_linii)
+                    else:
+                        obiekt_sekwencji = SekwencjaDNA(
+                            aktualna_nazwa, b"".join(linie_aktualnej_sekwencji).decode())
+                        liczba_wpisow += 1
+                        czas_parsowania += time.perf_counter() - wznowienie
+                        yield linia_naglowka, obiekt_sekwencji
+                        wznowienie = time.perf_counter()
+                aktualna_nazwa = linia[1:].decode()
+                bajt_naglowka = poczatek_linii
+                linia_naglowka = numer_linii
+                if not aktualna_nazwa:
+                    METRYKI.zwieksz("ostrzezenia_parsera")
+                    loguj_z_limitem(logging.WARNING,
+                                    "Pusty nagłówek w linii %d (bajt %d). Ten wpis "
+                                    "może zostać pominięty lub źle zinterpretowany.",
+                                    numer_linii, poczatek_linii)
+                linie_aktualnej_sekwencji = []
+            else:
+                if aktualna_nazwa is None:
+                    METRYKI.zwieksz("ostrzezenia_parsera")
+                    loguj_z_limitem(logging.WARNING,
+                                    "Znaleziono linię sekwencji bez poprzedzającego "
+                                    "nagłówka w linii %d (bajt %d): '%s'. Pomijam.",
+                                    numer_linii, poczatek_linii,
+                                    linia.decode(errors='replace'))
+                    continue
+                linie_aktualnej_sekwencji.append(linia)
+
+    obiekt_sekwencji = None
+    if aktualna_nazwa is not None:
+        if not linie_aktualnej_sekwencji:
+            METRYKI.zwieksz("ostrzezenia_parsera")
+            dziennik.warning("Brak sekwencji dla ostatniego nagłówka '%s' (bajt %d). "
+                             "Pomijam ten wpis.", aktualna_nazwa, bajt_naglowka)
+        else:
+            obiekt_sekwencji = SekwencjaDNA(
+                aktualna_nazwa, b"".join(linie_aktualnej_sekwencji).decode())
+            liczba_wpisow += 1
+    elif not liczba_wpisow:
+        dziennik.warning("Plik '%s' nie zawiera żadnych poprawnych wpisów FASTA.",
+                         nazwa_pliku)
+
+    METRYKI.dodaj_czas("parsowanie", czas_parsowania + time.perf_counter() - wznowienie)
+    METRYKI.zwieksz("wpisy_wczytane", liczba_wpisow)
+    if obiekt_sekwencji is not None:
+        yield linia_naglowka, obiekt_sekwencji
+
+
+def _linia_plusa_pasuje(linia_plusa: bytes, naglowek: bytes) -> bool:
+    """
+    Sprawdza, czy linia '+' jest pusta albo powtarza nagłówek odczytu
+    (w całości lub sam identyfikator przed pierwszą spacją).
+
+    Args:
+        linia_plusa (bytes): Linia zaczynająca się od '+'.
+        naglowek (bytes): Linia nagłówka zaczynająca się od '@'.
+
+    Returns:
+        bool: True, jeśli linia '+' pasuje do nagłówka.
+    """
+    opis = linia_plusa[1:]
+    return not opis or opis == naglowek[1:] or opis == naglowek[1:].split(None, 1)[0]
+
+
+def iteruj_plik_fastq(
+    nazwa_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU_ODCZYTU,
+    liczniki: dict[str, int] | None = None
+) -> Iterator[SekwencjaDNAZJakoscia]:
+    """
+    Strumieniowo odczytuje odczyty z pliku FASTQ (Phred+33), zwracając
+    je po jednym.
+
+    Sekwencja i jakość mogą być zawinięte w wiele linii: linie sekwencji
+    trwają do linii '+', a linie jakości do zebrania tylu znaków, ile
+    nukleotydów ma sekwencja, więc linia jakości zaczynająca się od '@'
+    nie jest mylona z nagłówkiem. Jakość innej długości niż sekwencja,
+    brak linii '+' lub linia '+' z inną nazwą niż nagłówek to uszkodzony
+    wpis: jest liczony i pomijany, a odczyt wznawia się od pierwszego
+    nagłówka '@', po którym przychodzą linie sekwencji i pasująca linia
+    '+'. Jak w iteruj_wpisy_fasta plik jest czytany dużymi blokami,
+    a ostrzeżenia zawierają numer linii oraz przesunięcie w bajtach.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTQ do odczytania.
+        rozmiar_bloku (int): Liczba bajtów wczytywanych jednorazowo z dysku.
+        liczniki (dict[str, int] | None): Jeśli podano (liczniki jak
+                                          w oczysc_partie), pominięte
+                                          uszkodzone wpisy są doliczane
+                                          do "Wczytane" i "Niepoprawne".
+
+    Yields:
+        SekwencjaDNAZJakoscia: Kolejne poprawnie zbudowane odczyty z pliku.
+    """
+    naglowek = None
+    bajt_naglowka = linia_naglowka = numer_linii = 0
+    linie_sekwencji = []
+    linie_jakosci = None
+    dlugosc_sekwencji = dlugosc_jakosci = 0
+    # W trybie synchronizacji kandydat to ostatnia linia '@' (z bajtem
+    # i numerem linii) oraz linie, które po niej nastąpiły.
+    synchronizacja = False
+    kandydat = None
+    linie_kandydata = []
+    liczba_wpisow = uszkodzone = 0
+    czas_parsowania = 0.0
+    wznowienie = time.perf_counter()
+
+    def odrzuc(powod: str, *argumenty):
+        nonlocal uszkodzone, synchronizacja, kandydat
+        uszkodzone += 1
+        synchronizacja = True
+        kandydat = None
+        METRYKI.zwieksz("ostrzezenia_parsera")
+        loguj_z_limitem(logging.WARNING, "Uszkodzony wpis FASTQ w linii %d (bajt %d): "
+                        + powod + ". Pomijam do następnego pełnego wpisu.", *argumenty)
+
+    with otworz_plik_wejsciowy(nazwa_pliku) as f:
+        for poczatek_linii, surowa_linia in iteruj_linie_binarnie(f, rozmiar_bloku):
+            numer_linii += 1
+            linia = surowa_linia.strip()
+
+            if linie_jakosci is not None:
+                linie_jakosci.append(linia)
+                dlugosc_jakosci += len(linia)
+                if dlugosc_jakosci < dlugosc_sekwencji:
+                    continue
+                jakosc = b"".join(linie_jakosci)
+                linie_jakosci = None
+                if dlugosc_jakosci != dlugosc_sekwencji:
+                    odrzuc("jakość ma %d znaków, a sekwencja %d nukleotydów",
+                           linia_naglowka, bajt_naglowka, dlugosc_jakosci, dlugosc_sekwencji)
+                elif not dlugosc_sekwencji:
+                    METRYKI.zwieksz("ostrzezenia_parsera")
+                    loguj_z_limitem(logging.WARNING,
+                                    "Brak sekwencji dla nagłówka '%s' (linia %d, bajt %d). "
+                                    "Pomijam ten wpis.", naglowek[1:].decode(errors='replace'),
+                                    linia_naglowka, bajt_naglowka)
+                elif jakosc.translate(None, ZNAKI_JAKOSCI):
+                    METRYKI.zwieksz("ostrzezenia_parsera")
+                    loguj_z_limitem(logging.WARNING,
+                                    "Znaki jakości spoza Phred+33 w odczycie '%s' (linia %d, "
+                                    "bajt %d). Pomijam ten wpis.",
+                                    naglowek[1:].decode(errors='replace'), linia_naglowka,
+                                    bajt_naglowka)
+                else:
+                    obiekt_sekwencji = SekwencjaDNAZJakoscia(
+                        naglowek[1:].decode(), b"".join(linie_sekwencji).decode(),
+                        jakosc.decode())
+                    liczba_wpisow += 1
+                    czas_parsowania += time.perf_counter() - wznowienie
+                    yield obiekt_sekwencji
+                    wznowienie = time.perf_counter()
+                naglowek = None
+                continue
+
+            if synchronizacja:
+                if linia.startswith(b'@'):
+                    kandydat = (linia, poczatek_linii, numer_linii)
+                    linie_kandydata = []
+                    continue
+                if kandydat is None or not linia:
+                    continue
+                if not linia.startswith(b'+'):
+                    linie_kandydata.append(linia)
+                    continue
+                if not _linia_plusa_pasuje(linia, kandydat[0]):
+                    kandydat = None
+                    continue
+                (naglowek, bajt_naglowka, linia_naglowka), linie_sekwencji = \
+                    kandydat, linie_kandydata
+                synchronizacja = False
+                kandydat = None
+
+            if naglowek is None:
+                if not linia:
+                    continue
+                if not linia.startswith(b'@'):
+                    odrzuc("oczekiwano nagłówka '@', a jest '%s'", numer_linii, poczatek_linii,
+                           linia[:50].decode(errors='replace'))
+                    continue
+                naglowek = linia
+                bajt_naglowka = poczatek_linii
+                linia_naglowka = numer_linii
+                if len(naglowek) == 1:
+                    METRYKI.zwieksz("ostrzezenia_parsera")
+                    loguj_z_limitem(logging.WARNING,
+                                    "Pusty nagłówek w linii %d (bajt %d). Ten wpis "
+                                    "może zostać pominięty lub źle zinterpretowany.",
+                                    numer_linii, poczatek_linii)
+                linie_sekwencji = []
+            elif linia.startswith(b'+'):
+                if not _linia_plusa_pasuje(linia, naglowek):
+                    naglowek = None
+                    odrzuc("linia '+' nie pasuje do nagłówka", numer_linii, poczatek_linii)
+                    continue
+                linie_jakosci = []
+                dlugosc_sekwencji = sum(map(len, linie_sekwencji))
+                dlugosc_jakosci = 0
+            elif linia.startswith(b'@'):
+                naglowek = None
+                odrzuc("brak linii '+' przed kolejnym nagłówkiem", numer_linii, poczatek_linii)
+                kandydat = (linia, poczatek_linii, numer_linii)
+                linie_kandydata = []
+            else:
+                linie_sekwencji.append(linia)
+
+    if naglowek is not None:
+        uszkodzone += 1
+        METRYKI.zwieksz("ostrzezenia_parsera")
+        dziennik.warning("Niekompletny ostatni odczyt '%s' (linia %d, bajt %d). "
+                         "Pomijam ten wpis.", naglowek[1:].decode(errors='replace'),
+                         linia_naglowka, bajt_naglowka)
+    if uszkodzone:
+        dziennik.warning("Pominięto uszkodzonych wpisów FASTQ w pliku '%s': %d.",
+                         nazwa_pliku, uszkodzone)
+        if liczniki is not None:
+            for klucz in ("Wczytane", "Niepoprawne"):
+                liczniki[klucz] = liczniki.get(klucz, 0) + uszkodzone
+    if not liczba_wpisow:
+        dziennik.warning("Plik '%s' nie zawiera żadnych poprawnych wpisów FASTQ.",
+                         nazwa_pliku)
+
+    METRYKI.dodaj_czas("parsowanie", czas_parsowania + time.perf_counter() - wznowienie)
+    METRYKI.zwieksz("wpisy_wczytane", liczba_wpisow)
+    METRYKI.zwieksz("wpisy_fastq_uszkodzone", uszkodzone)
+
+
+def wykryj_format_pliku(nazwa_pliku: str) -> str:
+    """
+    Rozpoznaje format pliku sekwencji po pierwszym niepustym wierszu
+    (po rozpakowaniu).
+
+    Args:
+        nazwa_pliku (str): Ścieżka pliku.
+
+    Returns:
+        str: "fastq", jeśli pierwszy niepusty wiersz zaczyna się od '@';
+             w przeciwnym razie "fasta".
+    """
+    with otworz_plik_wejsciowy(nazwa_pliku) as f:
+        for _, surowa_linia in iteruj_linie_binarnie(f):
+            linia = surowa_linia.strip()
+            if linia:
+                return "fastq" if linia.startswith(b'@') else "fasta"
+    return "fasta"
+
+
+def iteruj_plik_sekwencji(
+    nazwa_pliku: str, liczniki: dict[str, int] | None = None
+) -> Iterator[SekwencjaDNA]:
+    """
+    Strumieniowo odczytuje plik FASTA albo FASTQ, wybierając parser
+    według wykryj_format_pliku.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA lub FASTQ.
+        liczniki (dict[str, int] | None): Liczniki, do których
+                                          iteruj_plik_fastq dolicza
+                                          uszkodzone wpisy.
+
+    Returns:
+        Iterator[SekwencjaDNA]: Wpisy z iteruj_plik_fasta albo odczyty
+        z iteruj_plik_fastq.
+    """
+    if wykryj_format_pliku(nazwa_pliku) == "fastq":
+        return iteruj_plik_fastq(nazwa_pliku, liczniki=liczniki)
+    return iteruj_plik_fasta(nazwa_pliku)
+
+
+def wczytaj_plik_fasta(
+    nazwa_pliku: str, czytnik: Callable[[str], Iterable[SekwencjaDNA]] = iteruj_plik_fasta
+) -> dict[str, SekwencjaDNA] | None:
+    """
+    Odczytuje sekwencje DNA z pliku FASTA.
+
+    Jest to cienka nakładka na iteruj_plik_fasta, zbierająca wszystkie
+    wpisy do słownika.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA do odczytania.
+        czytnik (Callable): Funkcja strumieniowo odczytująca wpisy pliku
+                            (np. iteruj_plik_fastq, zob. wczytaj_plik_fastq).
+
+    Returns:
+        dict[str, SekwencjaDNA] | None: Słownik zawierający nazwy sekwencji
+        jako klucze i obiekty SekwencjaDNA jako wartości. Zwraca None w
+        przypadku krytycznego błędu (np. plik nie istnieje) lub pusty słownik,
+        jeśli plik jest pusty lub nie zawiera poprawnych wpisów.
+    """
+    sekwencje = {}
+
+    try:
+        if not os.path.exists(nazwa_pliku):
+            dziennik.error("Plik '%s' nie został znaleziony przed odczytem.", nazwa_pliku)
+            return None
+
+        if os.path.getsize(nazwa_pliku) == 0:
+            dziennik.warning("Plik '%s' jest pusty.", nazwa_pliku)
+            return {}
+
+        for obiekt_sekwencji in czytnik(nazwa_pliku):
+            sekwencje[obiekt_sekwencji.nazwa] = obiekt_sekwencji
+
+    except FileNotFoundError:
+        dziennik.error("Plik '%s' nie został znaleziony. Upewnij się, że jest "
+                       "w tym samym katalogu co skrypt.", nazwa_pliku)
+        return None
+    except Exception as e:
+        dziennik.error("Wystąpił błąd podczas odczytu pliku '%s': %s", nazwa_pliku, e)
+        return None
+    finally:
+        OGRANICZNIK_KOMUNIKATOW.podsumuj()
+    return sekwencje
+
+
+def wczytaj_plik_fastq(nazwa_pliku: str) -> dict[str, SekwencjaDNAZJakoscia] | None:
+    """
+    Odczytuje odczyty z pliku FASTQ, zachowując jakość każdej zasady.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTQ do odczytania.
+
+    Returns:
+        dict[str, SekwencjaDNAZJakoscia] | None: Słownik odczytów jak
+        w wczytaj_plik_fasta.
+    """
+    return wczytaj_plik_fasta(nazwa_pliku, iteruj_plik_fastq)
+
+
+class WpisIndeksuFasta(NamedTuple):
+    """
+    Opis położenia pojedynczego wpisu w pliku FASTA (format zgodny z .fai).
+
+    Atrybuty:
+        nazwa (str): Nazwa sekwencji.
+        dlugosc (int): Długość sekwencji w nukleotydach.
+        przesuniecie (int): Przesunięcie pierwszego nukleotydu w bajtach.
+        zasady_w_linii (int): Liczba nukleotydów w pełnej linii sekwencji.
+        bajty_w_linii (int): Liczba bajtów pełnej linii, łącznie ze znakiem
+                             nowej linii.
+    """
+    nazwa: str
+    dlugosc: int
+    przesuniecie: int
+    zasady_w_linii: int
+    bajty_w_linii: int
+
+
+def zbuduj_indeks_fasta(
+    nazwa_pliku: str, rozmiar_bloku: int = ROZMIAR_BLOKU_ODCZYTU
+) -> dict[str, WpisIndeksuFasta]:
+    """
+    Skanuje plik FASTA i wyznacza położenie każdego wpisu.
+
+    Wpisy z pustym nagłówkiem, bez sekwencji lub z nierówną szerokością
+    linii (niepozwalające na swobodny dostęp) są pomijane z ostrzeżeniem.
+
+    Args:
+        nazwa_pliku (str): Nazwa pliku FASTA do zindeksowania.
+        rozmiar_bloku (int): Liczba bajtów wczytywanych jednorazowo z dysku.
+
+    Returns:
+        dict[str, WpisIndeksuFasta]: Wpisy indeksu w kolejności z pliku.
+    """
+    indeks = {}
+    aktualna_nazwa = None
+    dlugosc = przesuniecie = zasady_w_linii = bajty_w_linii = 0
+    ostatnia_linia_niepelna = False
+    poprawny_uklad = True
+
+    def zamknij_wpis():
+        if aktualna_nazwa is None:
+            return
+        if not aktualna_nazwa or dlugosc == 0:
+            dziennik.warning("Wpis '%s' ma pusty nagłówek lub nie zawiera sekwencji "
+                             "i nie może zostać zindeksowany. Pomijam.", aktualna_nazwa)
+            return
+        if not poprawny_uklad:
+            dziennik.warning("Wpis '%s' ma nierówne linie sekwencji i nie może "
+                             "zostać zindeksowany. Pomijam.", aktualna_nazwa)
+            return
+        indeks[aktualna_nazwa] = WpisIndeksuFasta(
+            aktualna_nazwa, dlugosc, przesuniecie, zasady_w_linii, bajty_w_linii)
+
+    with otworz_plik_wejsciowy(nazwa_pliku) as f:
+        for poczatek_linii, surowa_linia in iteruj_linie_binarnie(f, rozmiar_bloku):
+            linia = surowa_linia.strip()
+            if linia.startswith(b'>'):
+                zamknij_wpis()
+                aktualna_nazwa = linia[1:].decode().strip()
+                dlugosc = przesuniecie = zasady_w_linii = bajty_w_linii = 0
+                ostatnia_linia_niepelna = False
+                poprawny_uklad = True
+                continue
+            if aktualna_nazwa is None:
+                continue
+            if not linia:
+                if dlugosc:
+                    ostatnia_linia_niepelna = True
+                continue
+
+            if linia != surowa_linia.rstrip(b"\r"):
+                poprawny_uklad = False
+            if dlugosc == 0:
+                przesuniecie = poczatek_linii
+                zasady_w_linii = len(linia)
+                bajty_w_linii = len(surowa_linia) + 1
+            elif ostatnia_linia_niepelna or len(linia) > zasady_w_linii:
+                poprawny_uklad = False
+            if len(linia) < zasady_w_linii:
+                ostatnia_linia_niepelna = True
+            dlugosc += len(linia)
+        zamknij_wpis()
+
+    return indeks
+
+
+def zapisz_indeks_fasta(
+    indeks: dict[str, WpisIndeksuFasta], nazwa_pliku_fasta: str,
+    stan_pliku: os.stat_result | None = None
+) -> str:
+    """
+    Zapisuje indeks do pliku pomocniczego obok pliku FASTA.
+
+    Plik indeksu ma zwykły, pięciokolumnowy format .fai, ale własne
+    rozszerzenie, więc nie nadpisuje indeksu utworzonego przez samtools.
+    Rozmiar i czas modyfikacji pliku FASTA, pozwalające wykryć nieaktualny
+    indeks, trafiają do osobnego pliku stanu zapisywanego na końcu.
+    Powinny pochodzić sprzed budowy indeksu: wpisy dopisane w jej trakcie
+    zmienią wtedy rozmiar pliku i indeks zostanie uznany za nieaktualny.
+
+    Args:
+        indeks (dict[str, WpisIndeksuFasta]): Indeks do zapisania.
+        nazwa_pliku_fasta (str): Nazwa zindeksowanego pliku FASTA.
+        stan_pliku (os.stat_result | None): Stan pliku FASTA sprzed budowy
+                                            indeksu; domyślnie stan bieżący.
+
+    Returns:
+        str: Ścieżka zapisanego pliku indeksu.
+    """
+    if stan_pliku is None:
+        stan_pliku = os.stat(nazwa_pliku_fasta)
+    sciezka_indeksu = nazwa_pliku_fasta + ROZSZERZENIE_INDEKSU_FASTA
+    with open(sciezka_indeksu + ".tmp", 'w') as f:
+        for wpis in indeks.values():
+            f.write("\t".join(str(pole) for pole in wpis) + "\n")
+    os.replace(sciezka_indeksu + ".tmp", sciezka_indeksu)
+    with open(sciezka_indeksu + ROZSZERZENIE_STANU_INDEKSU_FASTA, 'w') as f:
+        f.write(f"{stan_pliku.st_size}\t{stan_pliku.st_mtime_ns}\n")
+    return sciezka_indeksu
+
+
+def wczytaj_indeks_fasta(
+    nazwa_pliku_fasta: str
+) -> dict[str, WpisIndeksuFasta] | None:
+    """
+    Wczytuje plik indeksu, o ile nadal odpowiada plikowi FASTA.
+
+    Args:
+        nazwa_pliku_fasta (str): Nazwa zindeksowanego pliku FASTA.
+
+    Returns:
+        dict[str, WpisIndeksuFasta] | None: Wczytany indeks lub None, jeśli
+        plik indeksu lub jego plik stanu nie istnieje, jest uszkodzony albo
+        rozmiar lub czas modyfikacji pliku FASTA uległy zmianie.
+    """
+    sciezka_indeksu = nazwa_pliku_fasta + ROZSZERZENIE_INDEKSU_FASTA
+    stan_pliku = os.stat(nazwa_pliku_fasta)
+    indeks = {}
+    try:
+        with open(sciezka_indeksu + ROZSZERZENIE_STANU_INDEKSU_FASTA, 'r') as f:
+            if f.read() != f"{stan_pliku.st_size}\t{stan_pliku.st_mtime_ns}\n":
+                return None
+        with open(sciezka_indeksu, 'r') as f:
+            for linia in f:
+                nazwa, *liczby = linia.rstrip("\n").rsplit("\t", 4)
+                indeks[nazwa] = WpisIndeksuFasta(nazwa, *map(int, liczby))
+    except (OSError, ValueError, TypeError):
+        return None
+    return indeks
+
+
+class IndeksFasta(Mapping):
+    """
+    Leniwy słownik sekwencji z pliku FASTA, oparty na mmap i indeksie
+    w formacie .fai.
+
+    Dostęp do sekwencji po nazwie odczytuje wyłącznie bajty danego wpisu,
+    bez parsowania reszty pliku. Indeks jest budowany automatycznie, gdy
+    nie istnieje lub nie odpowiada aktualnemu plikowi; gdy nie da się go
+    zapisać, indeks pozostaje tylko w pamięci. Plik skompresowany
+    w formacie BGZF jest czytany przez CzytnikBGZF (przesunięcia w .fai
+    dotyczą danych rozpakowanych); zwykły gzip i zstd nie pozwalają na
+    swobodny dostęp.
+
+    Atrybuty:
+        nazwa_pliku (str): Nazwa pliku FASTA.
+        wpisy (dict[str, WpisIndeksuFasta]): Wpisy indeksu.
+    """
+
+    def __init__(self, nazwa_pliku: str):
+        """
+        Otwiera plik FASTA i wczytuje (lub buduje) jego indeks.
+
+        Args:
+            nazwa_pliku (str): Nazwa pliku FASTA.
+        """
+        kompresja = wykryj_kompresje(nazwa_pliku)
+        if kompresja not in ("brak", "bgzf"):
+            raise OSError(f"Swobodny dostęp do pliku '{nazwa_pliku}' ({kompresja}) wymaga "
+                          "pliku nieskompresowanego lub BGZF.")
+        self.nazwa_pliku = nazwa_pliku
+        self.wpisy = wczytaj_indeks_fasta(nazwa_pliku)
+        if self.wpisy is None:
+            stan_pliku = os.stat(nazwa_pliku)
+            self.wpisy = zbuduj_indeks_fasta(nazwa_pliku)
+            try:
+                zapisz_indeks_fasta(self.wpisy, nazwa_pliku, stan_pliku)
+            except OSError as e:
+                dziennik.warning("Nie udało się zapisać indeksu pliku '%s' (%s). "
+                                 "Indeks zostanie użyty tylko w pamięci.", nazwa_pliku, e)
+
+        self._mapa = None
+        if kompresja == "bgzf":
+            # Sam CzytnikBGZF zwraca dane najwyżej do końca bieżącej grupy
+            # bloków; BufferedReader doczytuje kolejne grupy.
+            self._plik = io.BufferedReader(CzytnikBGZF(nazwa_pliku, watki=1),
+                                           ROZMIAR_BLOKU_ODCZYTU)
+            return
+        self._plik = open(nazwa_pliku, 'rb')
+        if os.path.getsize(nazwa_pliku) > 0:
+            self._mapa = mmap.mmap(self._plik.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, nazwa: str) -> SekwencjaDNA:
+        return self.pobierz_fragment(nazwa)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.wpisy)
+
+    def __len__(self) -> int:
+        return len(self.wpisy)
+
+    def __enter__(self) -> "IndeksFasta":
+        return self
+
+    def __exit__(self, *args):
+        self.zamknij()
+
+    def pobierz_fragment(
+        self, nazwa: str, poczatek: int = 0, koniec: int | None = None
+    ) -> SekwencjaDNA:
+        """
+        Zwraca sekwencję lub jej fragment [poczatek, koniec) bez czytania
+        pozostałych wpisów.
+
+        Args:
+            nazwa (str): Nazwa sekwencji.
+            poczatek (int): Pozycja pierwszego nukleotydu (od 0).
+            koniec (int | None): Pozycja za ostatnim nukleotydem. Domyślnie
+                                 koniec sekwencji.
+
+        Returns:
+            SekwencjaDNA: Obiekt z żądanym fragmentem sekwencji.
+        """
+        wpis = self.wpisy[nazwa]
+        poczatek, koniec, _ = slice(poczatek, koniec).indices(wpis.dlugosc)
+        if koniec <= poczatek:
+            return SekwencjaDNA(nazwa, "")
+
+        def pozycja_w_pliku(pozycja: int) -> int:
+            return (wpis.przesuniecie
+                    + (pozycja // wpis.zasady_w_linii) * wpis.bajty_w_linii
+                    + pozycja % wpis.zasady_w_linii)
+
+        pierwszy_bajt = pozycja_w_pliku(poczatek)
+        ostatni_bajt = pozycja_w_pliku(koniec - 1)
+        if self._mapa is not None:
+            surowe_dane = self._mapa[pierwszy_bajt:ostatni_bajt + 1]
+        else:
+            self._plik.seek(pierwszy_bajt)
+            surowe_dane = self._plik.read(ostatni_bajt + 1 - pierwszy_bajt)
+        if len(surowe_dane) != ostatni_bajt + 1 - pierwszy_bajt:
+            raise OSError(f"Plik '{self.nazwa_pliku}' jest krótszy niż wskazuje indeks "
+                          f"(wpis '{nazwa}'); usuń indeks, aby go przebudować.")
+        return SekwencjaDNA(nazwa, b"".join(surowe_dane.split()).decode())
+
+    def zamknij(self):
+        """
+        Zwalnia mapowanie pamięci i zamyka plik.
+        """
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._plik.close()
+
+
+def dodaj_sekwencje_uzytkownika(
+    slownik_sekwencji: dict[str, SekwencjaDNA], nazwa_pliku: str = NAZWA_PLIKU_FASTA
+) -> dict[str, SekwencjaDNA]:
+    """
+    Prosi użytkownika o podanie własnej sekwencji DNA i dodaje ją
+    do pamięci programu oraz do pliku FASTA.
+
+    Args:
+        slownik_sekwencji (dict): Słownik istniejących sekwencji DNA.
+        nazwa_pliku (str): Nazwa pliku FASTA, do którego ma być dopisana sekwencja.
+
+    Returns:
+        dict[str, SekwencjaDNA]: Zaktualizowany słownik sekwencji DNA.
+    """
+    print("\n--- Dodaj swoją sekwencję ---")
+    nazwa = input("Podaj nazwę dla Twojej sekwencji (np. Moja_Sekwencja): ").strip()
+    if not nazwa:
+        print("Nazwa sekwencji nie może być pusta. Anulowano dodawanie "
+              "sekwencji.")
+        return slownik_sekwencji
+
+    dane_sekwencji = input("Wklej sekwencję DNA (tylko A, T, C, G): ").strip().upper()
+
+    if not dane_sekwencji:
+        print("Sekwencja nie może być pusta. Anulowano dodawanie sekwencji.")
+        return slownik_sekwencji
+
+    tymczasowy_obiekt_sekwencji = SekwencjaDNA(nazwa, dane_sekwencji)
+    if not tymczasowy_obiekt_sekwencji.jest_poprawna():
+        print("UWAGA: Twoja sekwencja zawiera nieprawidłowe znaki. Zostanie "
+              "oznaczona jako niepoprawna.")
+
+    if nazwa in slownik_sekwencji:
+        print(f"UWAGA: Sekwencja o nazwie '{nazwa}' już istnieje w pamięci. "
+              "Zostanie nadpisana.")
+
+    slownik_sekwencji[nazwa] = tymczasowy_obiekt_sekwencji
+    print(f"Sekwencja '{nazwa}' została dodana do pamięci programu.")
+
+    try:
+        with open(nazwa_pliku, 'a') as f:
+            f.write(f">{nazwa}\n{dane_sekwencji}\n")
+        print(f"Sekwencja '{nazwa}' została trwale dopisana do pliku "
               f"'{nazwa_pliku}'.")
     except IOError as e:
         print(f"BŁĄD: Nie udało się zapisać sekwencji do pliku '{nazwa_pliku}': "
@@ -342,133 +2217,4314 @@ def dodaj_sekwencje_uzytkownika(
     except Exception as e:
         print(f"Wystąpił nieoczekiwany błąd podczas zapisu do pliku: {e}")
 
-    return slownik_sekwencji
+    return slownik_sekwencji
+
+
+def wyswietl_info_o_sekwencji(obiekt_sekwencji: SekwencjaDNA):
+    """
+    Wyświetla szczegółowe informacje o pojedynczej sekwencji DNA.
+
+    Args:
+        obiekt_sekwencji (SekwencjaDNA): Obiekt sekwencji DNA do wyświetlenia.
+    """
+    print(f"\n--- Informacje o sekwencji: {obiekt_sekwencji.nazwa} ---")
+    print(f"  Długość: {obiekt_sekwencji.pobierz_dlugosc()} nukleotydów")
+    print(f"  Zawartość GC: {obiekt_sekwencji.oblicz_zawartosc_gc():.2f}%")
+    print(f"  Poprawna: {'Tak' if obiekt_sekwencji.jest_poprawna() else 'Nie (zawiera niepoprawne nukleotydy)'}")
+    print(f"  Typ: {obiekt_sekwencji.pobierz_typ_sekwencji()}")
+    print(f"  Sekwencja (pierwsze 30 znaków): {obiekt_sekwencji.sekwencja[:30]}...")
+
+
+def spakuj_sekwencje(
+    lista_sekwencji: list[SekwencjaDNA],
+    przydziel_bufor: Callable[[int], memoryview] | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pakuje sekwencje do jednego ciągłego bufora bajtów.
+
+    Znaki spoza ASCII są zastępowane jednym bajtem '?', dzięki czemu
+    długość w bajtach odpowiada długości sekwencji w znakach.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do spakowania.
+        przydziel_bufor (Callable[[int], memoryview] | None): Jeśli podano,
+            zwraca zapisywalny bufor o co najmniej podanym (dodatnim)
+            rozmiarze, np. SharedMemory.buf; sekwencje są wpisywane do
+            niego fragmentami po SEKWENCJE_FRAGMENTU_PAKOWANIA, bez
+            pośredniej kopii całej partii.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Bufor uint8 ze złączonymi sekwencjami
+        oraz tablica przesunięć o długości n + 1 (sekwencja i zajmuje
+        bufor[przesuniecia[i]:przesuniecia[i + 1]]).
+    """
+    import numpy as np
+
+    teksty = [obiekt_sekwencji.sekwencja for obiekt_sekwencji in lista_sekwencji]
+    przesuniecia = np.zeros(len(teksty) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, teksty), dtype=np.int64, count=len(teksty)),
+              out=przesuniecia[1:])
+    if przydziel_bufor is None:
+        bufor = np.frombuffer("".join(teksty).encode('ascii', errors='replace'),
+                              dtype=np.uint8)
+        return bufor, przesuniecia
+
+    rozmiar = int(przesuniecia[-1])
+    bufor = np.ndarray((rozmiar,), dtype=np.uint8, buffer=przydziel_bufor(max(rozmiar, 1)))
+    for poczatek in range(0, len(teksty), SEKWENCJE_FRAGMENTU_PAKOWANIA):
+        koniec = min(poczatek + SEKWENCJE_FRAGMENTU_PAKOWANIA, len(teksty))
+        bufor[przesuniecia[poczatek]:przesuniecia[koniec]] = np.frombuffer(
+            "".join(teksty[poczatek:koniec]).encode('ascii', errors='replace'),
+            dtype=np.uint8)
+    return bufor, przesuniecia
+
+
+def zsumuj_odcinki(
+    wartosci: np.ndarray, przesuniecia: np.ndarray
+) -> np.ndarray:
+    """
+    Sumuje wartości w odcinkach wyznaczonych przez tablicę przesunięć.
+
+    Args:
+        wartosci (np.ndarray): Wartości dla każdego bajtu bufora.
+        przesuniecia (np.ndarray): Tablica przesunięć z spakuj_sekwencje.
+
+    Returns:
+        np.ndarray: Suma wartości dla każdej sekwencji (0 dla pustych).
+    """
+    import numpy as np
+
+    dlugosci = np.diff(przesuniecia)
+    sumy = np.zeros(len(dlugosci), dtype=np.int64)
+    niepuste = dlugosci > 0
+    if niepuste.any():
+        sumy[niepuste] = np.add.reduceat(wartosci, przesuniecia[:-1][niepuste],
+                                         dtype=np.int64)
+    return sumy
+
+
+def typy_z_zawartosci_gc(zawartosc_gc: np.ndarray) -> np.ndarray:
+    """
+    Wyznacza typy sekwencji jak pobierz_typ_sekwencji, dla całej tablicy.
+
+    Args:
+        zawartosc_gc (np.ndarray): Zawartości GC w procentach.
+
+    Returns:
+        np.ndarray: Tablica napisów "Bogata_w_AT", "Standardowa"
+                    lub "Bogata_w_GC".
+    """
+    import numpy as np
+
+    kody_typow = (zawartosc_gc >= 40).astype(np.intp) + (zawartosc_gc > 60)
+    return np.array(TYPY_SEKWENCJI, dtype=object)[kody_typow]
+
+
+def oblicz_poprawnosc_bufora(
+    bufor: np.ndarray, przesuniecia: np.ndarray
+) -> np.ndarray:
+    """
+    Sprawdza poprawność (tylko znaki ACGT) sekwencji spakowanych przez
+    spakuj_sekwencje.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+
+    Returns:
+        np.ndarray: Tablica bool, True dla poprawnych sekwencji.
+    """
+    import numpy as np
+
+    return zsumuj_odcinki(np.frombuffer(TABLICA_NIEPOPRAWNYCH, dtype=np.uint8)[bufor],
+                          przesuniecia) == 0
+
+
+def oblicz_zawartosc_gc_bufora(
+    bufor: np.ndarray, przesuniecia: np.ndarray
+) -> np.ndarray:
+    """
+    Oblicza zawartość GC (w procentach) sekwencji spakowanych przez
+    spakuj_sekwencje; dla pustych sekwencji wynosi 0.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+
+    Returns:
+        np.ndarray: Zawartość GC każdej sekwencji.
+    """
+    import numpy as np
+
+    dlugosci = np.diff(przesuniecia)
+    ilosc_gc = zsumuj_odcinki(np.frombuffer(TABLICA_GC, dtype=np.uint8)[bufor], przesuniecia)
+    zawartosc_gc = np.zeros(len(dlugosci), dtype=np.float64)
+    niepuste = dlugosci > 0
+    zawartosc_gc[niepuste] = (ilosc_gc[niepuste] / dlugosci[niepuste]) * 100
+    return zawartosc_gc
+
+
+def oblicz_statystyki_bufora(
+    bufor: np.ndarray, przesuniecia: np.ndarray
+) -> dict[str, np.ndarray]:
+    """
+    Oblicza długość, zawartość GC, poprawność i typ sekwencji
+    spakowanych przez spakuj_sekwencje.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+
+    Returns:
+        dict[str, np.ndarray]: Tablice "Dlugosc", "Zawartosc_GC", "Poprawna"
+        i "Typ_Sekwencji", po jednym elemencie na sekwencję.
+    """
+    import numpy as np
+
+    zawartosc_gc = oblicz_zawartosc_gc_bufora(bufor, przesuniecia)
+    return {
+        "Dlugosc": np.diff(przesuniecia),
+        "Zawartosc_GC": zawartosc_gc,
+        "Poprawna": oblicz_poprawnosc_bufora(bufor, przesuniecia),
+        "Typ_Sekwencji": typy_z_zawartosci_gc(zawartosc_gc),
+    }
+
+
+def oblicz_statystyki_wsadowe(
+    lista_sekwencji: list[SekwencjaDNA]
+) -> dict[str, np.ndarray]:
+    """
+    Oblicza długość, zawartość GC, poprawność i typ dla całej partii
+    sekwencji naraz, korzystając z tablic przekodowań NumPy.
+
+    Wyniki są identyczne z metodami pobierz_dlugosc, oblicz_zawartosc_gc,
+    jest_poprawna i pobierz_typ_sekwencji klasy SekwencjaDNA.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przeanalizowania.
+
+    Returns:
+        dict[str, np.ndarray]: Tablice "Dlugosc", "Zawartosc_GC", "Poprawna"
+        i "Typ_Sekwencji", po jednym elemencie na sekwencję.
+    """
+    return oblicz_statystyki_bufora(*spakuj_sekwencje(lista_sekwencji))
+
+
+def przetworz_fragment_wspoldzielony(
+    nazwa_pamieci: str, przesuniecia: np.ndarray
+) -> dict[str, np.ndarray]:
+    """
+    Oblicza statystyki jednego fragmentu danych umieszczonych w pamięci
+    współdzielonej. Funkcja uruchamiana jest w procesie roboczym.
+
+    Args:
+        nazwa_pamieci (str): Nazwa bloku SharedMemory z buforem sekwencji.
+        przesuniecia (np.ndarray): Przesunięcia sekwencji fragmentu
+                                   względem początku całego bufora.
+
+    Returns:
+        dict[str, np.ndarray]: Statystyki jak w oblicz_statystyki_bufora.
+    """
+    from multiprocessing import shared_memory
+    import numpy as np
+
+    pamiec = shared_memory.SharedMemory(name=nazwa_pamieci)
+    try:
+        bufor = np.ndarray((int(przesuniecia[-1]),), dtype=np.uint8, buffer=pamiec.buf)
+        statystyki = oblicz_statystyki_bufora(bufor[przesuniecia[0]:],
+                                              przesuniecia - przesuniecia[0])
+        del bufor
+    finally:
+        pamiec.close()
+    return statystyki
+
+
+def pula_procesow(procesy: int) -> contextlib.AbstractContextManager:
+    """
+    Tworzy pulę procesów na cały przebieg, przekazywaną do kolejnych
+    partii, aby każda z nich nie płaciła za uruchomienie procesów.
+
+    Args:
+        procesy (int): Liczba procesów roboczych.
+
+    Returns:
+        contextlib.AbstractContextManager: ProcessPoolExecutor albo, dla
+        jednego procesu, kontekst zwracający None.
+    """
+    if procesy <= 1:
+        return contextlib.nullcontext()
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=procesy)
+
+
+def oblicz_statystyki_rownolegle(
+    lista_sekwencji: list[SekwencjaDNA], procesy: int,
+    pula: ProcessPoolExecutor | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Oblicza statystyki jak oblicz_statystyki_wsadowe, dzieląc partię na
+    fragmenty przetwarzane w puli procesów.
+
+    Sekwencje są pakowane bezpośrednio do pamięci współdzielonej, a nie
+    serializowane dla procesów roboczych. Wyniki są łączone w kolejności
+    wejściowej.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przeanalizowania.
+        procesy (int): Liczba procesów roboczych.
+        pula (ProcessPoolExecutor | None): Pula z pula_procesow, wspólna
+                                           dla kolejnych partii; domyślnie
+                                           tworzona na czas wywołania.
+
+    Returns:
+        dict[str, np.ndarray]: Statystyki jak w oblicz_statystyki_wsadowe.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    import numpy as np
+
+    pamiec = None
+
+    def przydziel_bufor(rozmiar: int) -> memoryview:
+        nonlocal pamiec
+        pamiec = shared_memory.SharedMemory(create=True, size=rozmiar)
+        return pamiec.buf
+
+    bufor, przesuniecia = spakuj_sekwencje(lista_sekwencji, przydziel_bufor)
+    granice = np.linspace(0, len(lista_sekwencji),
+                          procesy * FRAGMENTY_NA_PROCES + 1).astype(np.intp)
+    fragmenty = [przesuniecia[poczatek:koniec + 1]
+                 for poczatek, koniec in zip(granice[:-1], granice[1:])
+                 if koniec > poczatek]
+
+    try:
+        if not fragmenty:
+            return oblicz_statystyki_bufora(bufor, przesuniecia)
+        with contextlib.ExitStack() as stos:
+            if pula is None:
+                pula = stos.enter_context(ProcessPoolExecutor(max_workers=procesy))
+            wyniki = list(pula.map(przetworz_fragment_wspoldzielony,
+                                   [pamiec.name] * len(fragmenty), fragmenty))
+    finally:
+        del bufor
+        pamiec.close()
+        pamiec.unlink()
+
+    return {klucz: np.concatenate([wynik[klucz] for wynik in wyniki])
+            for klucz in wyniki[0]}
+
+
+def zmierz_statystyki_rownolegle(
+    liczba_sekwencji: int = 1_000_000, liczby_procesow: Iterable[int] = (1, 2, 4, 8),
+    rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW, ziarno: int = 0
+):
+    """
+    Mierzy przyspieszenie oblicz_statystyki dla kolejnych liczb procesów
+    na partiach jak w oczysc_partie, z jedną pulą na cały przebieg oraz,
+    dla porównania, z nową pulą dla każdej partii.
+
+    Args:
+        liczba_sekwencji (int): Liczba losowych sekwencji.
+        liczby_procesow (Iterable[int]): Sprawdzane liczby procesów.
+        rozmiar_partii (int): Liczba sekwencji w partii.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(ziarno)
+    dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                  liczba_sekwencji)
+    dane, przesuniecia = generuj_sekwencje_wektorowo(
+        generator, dlugosci, generator.random(liczba_sekwencji) < 0.05)
+    lista_sekwencji = [
+        SekwencjaDNA(f"Sekwencja_{i + 1}",
+                     dane[przesuniecia[i]:przesuniecia[i + 1]].decode('ascii'))
+        for i in range(liczba_sekwencji)]
+    partie = [lista_sekwencji[poczatek:poczatek + rozmiar_partii]
+              for poczatek in range(0, liczba_sekwencji, rozmiar_partii)]
+
+    print(f"\n--- Statystyki wieloprocesowe: {liczba_sekwencji} sekwencji, "
+          f"{len(partie)} partii ---")
+    czas_jednego = None
+    for procesy in liczby_procesow:
+        start = time.perf_counter()
+        with pula_procesow(procesy) as pula:
+            for partia in partie:
+                oblicz_statystyki(partia, procesy, pula=pula)
+        czas = time.perf_counter() - start
+        czas_jednego = czas_jednego or czas
+        opis = f"  {procesy} proc.: {czas:.3f} s (przyspieszenie x{czas_jednego / czas:.2f})"
+        if procesy > 1:
+            start = time.perf_counter()
+            for partia in partie:
+                oblicz_statystyki(partia, procesy)
+            opis += f", pula na partię: {time.perf_counter() - start:.3f} s"
+        print(opis)
+
+
+class PamiecPodrecznaStatystyk:
+    """
+    Trwała pamięć podręczna statystyk sekwencji w bazie SQLite,
+    adresowana skrótem treści sekwencji.
+
+    Przechowuje długość, zawartość GC i poprawność (typ wynika z GC).
+    Liczba wpisów jest ograniczona; po przekroczeniu limitu usuwane są
+    wpisy najdawniej używane (LRU), wybierane przez indeks na czasie
+    użycia. Liczba wpisów trzymana jest w pamięci, więc sprawdzenie
+    limitu nie wymaga zapytania. Czas użycia odświeżany jest co
+    DOKLADNOSC_LRU odczytów, dzięki czemu trafienia zwykle nie wymagają
+    zapisu do bazy.
+
+    Pamięć podręczna przyspiesza tylko ponowne przetwarzanie plików,
+    których większość treści już w niej jest; przy pierwszym przebiegu
+    zapis do bazy kosztuje więcej niż obliczenie statystyk, dlatego
+    włącza się ją jawnie opcją --pamiec-podreczna.
+
+    Atrybuty:
+        sciezka (str): Ścieżka pliku bazy danych.
+        maks_wpisow (int): Maksymalna liczba przechowywanych wpisów.
+        trafienia (int): Liczba statystyk odczytanych z pamięci podręcznej.
+        chybienia (int): Liczba statystyk, których w niej nie było.
+    """
+
+    def __init__(self, sciezka: str, maks_wpisow: int = MAKS_WPISOW_PAMIECI_PODRECZNEJ):
+        """
+        Otwiera (lub tworzy) bazę pamięci podręcznej.
+
+        Args:
+            sciezka (str): Ścieżka pliku bazy danych.
+            maks_wpisow (int): Maksymalna liczba przechowywanych wpisów.
+        """
+        import sqlite3
+
+        self.sciezka = sciezka
+        self.maks_wpisow = maks_wpisow
+        self.trafienia = 0
+        self.chybienia = 0
+        self._polaczenie = sqlite3.connect(sciezka)
+        self._polaczenie.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS statystyki (
+                skrot BLOB PRIMARY KEY,
+                dlugosc INTEGER NOT NULL,
+                zawartosc_gc REAL NOT NULL,
+                poprawna INTEGER NOT NULL,
+                ostatnie_uzycie INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS statystyki_ostatnie_uzycie
+                ON statystyki (ostatnie_uzycie);
+        """)
+        self._licznik_uzyc = self._polaczenie.execute(
+            "SELECT COALESCE(MAX(ostatnie_uzycie), 0) FROM statystyki").fetchone()[0]
+        self._liczba_wpisow = self._polaczenie.execute(
+            "SELECT COUNT(*) FROM statystyki").fetchone()[0]
+        self.przytnij()
+
+    def __enter__(self) -> "PamiecPodrecznaStatystyk":
+        return self
+
+    def __exit__(self, *args):
+        self.zamknij()
+
+    def pobierz(self, skroty: list[bytes]) -> dict[bytes, tuple[int, float, bool]]:
+        """
+        Odczytuje zapamiętane statystyki i oznacza je jako użyte.
+
+        Args:
+            skroty (list[bytes]): Skróty treści sekwencji.
+
+        Returns:
+            dict[bytes, tuple[int, float, bool]]: Statystyki (długość,
+            zawartość GC, poprawność) dla skrótów obecnych w pamięci.
+        """
+        self._licznik_uzyc += 1
+        znalezione = {}
+        do_oznaczenia = []
+        unikalne = list(dict.fromkeys(skroty))
+        for poczatek in range(0, len(unikalne), LIMIT_PARAMETROW_SQLITE):
+            fragment = unikalne[poczatek:poczatek + LIMIT_PARAMETROW_SQLITE]
+            znaczniki = ",".join("?" * len(fragment))
+            for skrot, dlugosc, zawartosc_gc, poprawna, ostatnie_uzycie in \
+                    self._polaczenie.execute(
+                        "SELECT skrot, dlugosc, zawartosc_gc, poprawna, ostatnie_uzycie "
+                        f"FROM statystyki WHERE skrot IN ({znaczniki})", fragment):
+                znalezione[skrot] = (dlugosc, zawartosc_gc, bool(poprawna))
+                if self._licznik_uzyc - ostatnie_uzycie >= DOKLADNOSC_LRU:
+                    do_oznaczenia.append((self._licznik_uzyc, skrot))
+        if do_oznaczenia:
+            self._polaczenie.executemany(
+                "UPDATE statystyki SET ostatnie_uzycie = ? WHERE skrot = ?", do_oznaczenia)
+            self._polaczenie.commit()
+
+        trafione = sum(skrot in znalezione for skrot in skroty)
+        self.trafienia += trafione
+        self.chybienia += len(skroty) - trafione
+        return znalezione
+
+    def zapisz(self, statystyki: dict[bytes, tuple[int, float, bool]]):
+        """
+        Zapamiętuje statystyki i usuwa najdawniej używane wpisy, jeśli
+        przekroczono limit.
+
+        Statystyki zależą wyłącznie od treści, więc wpisy już obecne
+        w bazie nie są nadpisywane.
+
+        Args:
+            statystyki (dict[bytes, tuple[int, float, bool]]): Statystyki
+                (długość, zawartość GC, poprawność) według skrótu treści.
+        """
+        kursor = self._polaczenie.executemany(
+            "INSERT OR IGNORE INTO statystyki VALUES (?, ?, ?, ?, ?)",
+            [(skrot, dlugosc, zawartosc_gc, int(poprawna), self._licznik_uzyc)
+             for skrot, (dlugosc, zawartosc_gc, poprawna) in statystyki.items()])
+        self._liczba_wpisow += max(kursor.rowcount, 0)
+        self._polaczenie.commit()
+        self.przytnij()
+
+    def przytnij(self):
+        """
+        Usuwa najdawniej używane wpisy ponad limit maks_wpisow; poniżej
+        limitu nie wykonuje żadnego zapytania.
+        """
+        nadmiar = self._liczba_wpisow - self.maks_wpisow
+        if nadmiar > 0:
+            kursor = self._polaczenie.execute(
+                "DELETE FROM statystyki WHERE skrot IN (SELECT skrot FROM statystyki "
+                "ORDER BY ostatnie_uzycie LIMIT ?)", (nadmiar,))
+            self._liczba_wpisow -= kursor.rowcount
+            self._polaczenie.commit()
+
+    def __len__(self) -> int:
+        return self._liczba_wpisow
+
+    def zamknij(self):
+        """
+        Zamyka połączenie z bazą danych.
+        """
+        self._polaczenie.close()
+
+
+def oblicz_statystyki(
+    lista_sekwencji: list[SekwencjaDNA], procesy: int = 1,
+    pamiec_podreczna: PamiecPodrecznaStatystyk | None = None,
+    pula: ProcessPoolExecutor | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Oblicza statystyki partii sekwencji, wybierając ścieżkę szeregową,
+    wieloprocesową i/lub korzystającą z pamięci podręcznej.
+
+    Przy podanej pamięci podręcznej obliczane są wyłącznie statystyki
+    sekwencji, których treści jeszcze w niej nie ma. Pamięć podręczna
+    przechowuje statystyki zależne tylko od treści; poprawność odczytów
+    FASTQ, w których N jest dozwolone (zob.
+    SekwencjaDNAZJakoscia.jest_poprawna), poprawiana jest na końcu.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przeanalizowania.
+        procesy (int): Liczba procesów roboczych.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna.
+        pula (ProcessPoolExecutor | None): Pula z pula_procesow.
+
+    Returns:
+        dict[str, np.ndarray]: Statystyki jak w oblicz_statystyki_wsadowe.
+    """
+    import numpy as np
+
+    with METRYKI.mierz("walidacja"):
+        def oblicz(sekwencje: list[SekwencjaDNA]) -> dict[str, np.ndarray]:
+            if procesy > 1:
+                return oblicz_statystyki_rownolegle(sekwencje, procesy, pula)
+            return oblicz_statystyki_wsadowe(sekwencje)
+
+        if pamiec_podreczna is None:
+            statystyki = oblicz(lista_sekwencji)
+        else:
+            skroty = [skrot_sekwencji(obiekt_sekwencji.sekwencja)
+                      for obiekt_sekwencji in lista_sekwencji]
+            znalezione = pamiec_podreczna.pobierz(skroty)
+            brakujace = [i for i, skrot in enumerate(skroty) if skrot not in znalezione]
+            if brakujace:
+                nowe = oblicz([lista_sekwencji[i] for i in brakujace])
+                znalezione.update(zip(
+                    (skroty[i] for i in brakujace),
+                    zip(nowe["Dlugosc"].tolist(), nowe["Zawartosc_GC"].tolist(),
+                        nowe["Poprawna"].tolist())))
+                pamiec_podreczna.zapisz({skroty[i]: znalezione[skroty[i]]
+                                         for i in brakujace})
+
+            dlugosci, zawartosc_gc, poprawne = zip(*map(znalezione.__getitem__, skroty)) \
+                if skroty else ((), (), ())
+            zawartosc_gc = np.array(zawartosc_gc, dtype=np.float64)
+            statystyki = {
+                "Dlugosc": np.array(dlugosci, dtype=np.int64),
+                "Zawartosc_GC": zawartosc_gc,
+                "Poprawna": np.array(poprawne, dtype=bool),
+                "Typ_Sekwencji": typy_z_zawartosci_gc(zawartosc_gc),
+            }
+
+        pozycje_odczytow = [pozycja for pozycja, obiekt_sekwencji in enumerate(lista_sekwencji)
+                            if isinstance(obiekt_sekwencji, SekwencjaDNAZJakoscia)]
+        if pozycje_odczytow:
+            bufor, przesuniecia = spakuj_sekwencje(
+                [lista_sekwencji[pozycja] for pozycja in pozycje_odczytow])
+            niepoprawne = zsumuj_odcinki(np.frombuffer(TABLICA_NIEPOPRAWNYCH_ODCZYTOW,
+                                                       dtype=np.uint8)[bufor], przesuniecia)
+            statystyki["Poprawna"][pozycje_odczytow] = niepoprawne == 0
+        return statystyki
+
+
+def zmierz_wydajnosc_wsadowa(liczba_sekwencji: int = 1_000_000, ziarno: int = 0):
+    """
+    Porównuje czas obliczeń wsadowych z metodami pojedynczych obiektów
+    i sprawdza, czy oba podejścia dają te same wyniki.
+
+    Args:
+        liczba_sekwencji (int): Liczba losowych sekwencji w teście.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(ziarno)
+    dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                  liczba_sekwencji)
+    alfabet = np.frombuffer(b"ACGTACGTACGTN", dtype=np.uint8)
+    znaki = alfabet[generator.integers(0, len(alfabet), int(dlugosci.sum()))]
+    tekst = znaki.tobytes().decode('ascii')
+    granice = np.concatenate(([0], np.cumsum(dlugosci))).tolist()
+    lista_sekwencji = [SekwencjaDNA(f"Sekwencja_{i + 1}", tekst[granice[i]:granice[i + 1]])
+                       for i in range(liczba_sekwencji)]
+
+    start = time.perf_counter()
+    dlugosci_obiektow = [s.pobierz_dlugosc() for s in lista_sekwencji]
+    gc_obiektow = [s.oblicz_zawartosc_gc() for s in lista_sekwencji]
+    poprawnosc_obiektow = [s.jest_poprawna() for s in lista_sekwencji]
+    typy_obiektow = [s.pobierz_typ_sekwencji() for s in lista_sekwencji]
+    czas_obiektow = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statystyki = oblicz_statystyki_wsadowe(lista_sekwencji)
+    czas_wsadowy = time.perf_counter() - start
+
+    zgodne = (statystyki["Dlugosc"].tolist() == dlugosci_obiektow
+              and statystyki["Zawartosc_GC"].tolist() == gc_obiektow
+              and statystyki["Poprawna"].tolist() == poprawnosc_obiektow
+              and statystyki["Typ_Sekwencji"].tolist() == typy_obiektow)
+
+    print(f"\n--- Wydajność obliczeń dla {liczba_sekwencji} sekwencji ---")
+    print(f"  Metody obiektów: {czas_obiektow:.3f} s")
+    print(f"  Silnik wsadowy:  {czas_wsadowy:.3f} s "
+          f"(przyspieszenie x{czas_obiektow / czas_wsadowy:.1f})")
+    print(f"  Wyniki zgodne: {'Tak' if zgodne else 'Nie'}")
+
+
+class ParametryJakosci(NamedTuple):
+    """
+    Ustawienia filtrowania odczytów FASTQ według jakości Phred
+    (zob. filtruj_wedlug_jakosci i maskuj_niska_jakosc).
+
+    Atrybuty:
+        min_srednia (float | None): Minimalna średnia jakość odczytu po
+                                    przycięciu; None wyłącza ten filtr.
+        prog_przycinania (float | None): Minimalna średnia jakość w oknie
+                                         przesuwnym; None wyłącza
+                                         przycinanie.
+        dlugosc_okna (int): Liczba zasad w oknie przycinania.
+        prog_maskowania (int | None): Zasady o niższej jakości są
+                                      zastępowane przez N; None wyłącza
+                                      maskowanie.
+        min_dlugosc (int): Minimalna długość odczytu po przycięciu.
+    """
+    min_srednia: float | None = None
+    prog_przycinania: float | None = None
+    dlugosc_okna: int = DLUGOSC_OKNA_JAKOSCI
+    prog_maskowania: int | None = None
+    min_dlugosc: int = 1
+
+
+def spakuj_jakosci(
+    lista_odczytow: list[SekwencjaDNAZJakoscia]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pakuje jakości odczytów do jednego ciągłego bufora wartości Phred,
+    zgodnego pozycja w pozycję z buforem spakuj_sekwencje.
+
+    Args:
+        lista_odczytow (list[SekwencjaDNAZJakoscia]): Odczyty do spakowania.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Bufor uint8 z jakościami Phred
+        oraz tablica przesunięć o długości n + 1.
+    """
+    import numpy as np
+
+    teksty = [odczyt.jakosc for odczyt in lista_odczytow]
+    przesuniecia = np.zeros(len(teksty) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, teksty), dtype=np.int64, count=len(teksty)),
+              out=przesuniecia[1:])
+    jakosci = np.frombuffer("".join(teksty).encode('ascii', errors='replace'),
+                            dtype=np.uint8) - np.uint8(PRZESUNIECIE_PHRED)
+    return jakosci, przesuniecia
+
+
+def oblicz_srednia_jakosc_bufora(
+    jakosci: np.ndarray, przesuniecia: np.ndarray, dlugosci: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Oblicza średnią jakość Phred odczytów spakowanych przez spakuj_jakosci;
+    dla pustych odczytów wynosi 0.
+
+    Args:
+        jakosci (np.ndarray): Bufor uint8 z jakościami Phred.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        dlugosci (np.ndarray | None): Jeśli podano, średnia liczona jest
+                                      tylko z pierwszych dlugosci[i] zasad
+                                      odczytu (np. po przycięciu).
+
+    Returns:
+        np.ndarray: Średnia jakość każdego odczytu.
+    """
+    import numpy as np
+
+    if dlugosci is None:
+        dlugosci = np.diff(przesuniecia)
+        sumy = zsumuj_odcinki(jakosci, przesuniecia)
+    else:
+        sumy_narastajace = np.zeros(len(jakosci) + 1, dtype=np.int64)
+        np.cumsum(jakosci, out=sumy_narastajace[1:])
+        sumy = (sumy_narastajace[przesuniecia[:-1] + dlugosci]
+                - sumy_narastajace[przesuniecia[:-1]])
+    srednie = np.zeros(len(dlugosci), dtype=np.float64)
+    niepuste = dlugosci > 0
+    srednie[niepuste] = sumy[niepuste] / dlugosci[niepuste]
+    return srednie
+
+
+def przytnij_oknem_bufora(
+    jakosci: np.ndarray, przesuniecia: np.ndarray, dlugosc_okna: int, prog: float
+) -> np.ndarray:
+    """
+    Wyznacza długości odczytów po przycięciu oknem przesuwnym, jak
+    SekwencjaDNAZJakoscia.dlugosc_po_przycieciu, dla całej partii.
+
+    Sumy wszystkich okien liczone są naraz z sum narastających bufora.
+    Okna wystające poza koniec odczytu są pomijane, a pierwsze słabe okno
+    każdego odczytu wyszukiwane jest binarnie wśród pozycji słabych okien.
+
+    Args:
+        jakosci (np.ndarray): Bufor uint8 z jakościami Phred.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        dlugosc_okna (int): Liczba zasad w oknie.
+        prog (float): Minimalna średnia jakość Phred w oknie.
+
+    Returns:
+        np.ndarray: Liczba zasad każdego odczytu, które pozostają.
+    """
+    import math
+    import numpy as np
+
+    # Suma okna jest całkowita, więc suma < prog * okno wtedy i tylko
+    # wtedy, gdy suma < ceil(prog * okno). Sumy narastające w uint32 mogą
+    # się przepełnić, ale różnice mod 2^32 pozostają dokładne, bo suma
+    # jednego okna jest dużo mniejsza niż 2^32.
+    prog_sumy = np.uint32(max(math.ceil(prog * dlugosc_okna), 0))
+    sumy_narastajace = np.zeros(len(jakosci) + 1, dtype=np.uint32)
+    np.cumsum(jakosci, dtype=np.uint32, out=sumy_narastajace[1:])
+    liczba_okien = max(len(jakosci) - dlugosc_okna + 1, 0)
+    slabe = np.zeros(len(jakosci), dtype=bool)
+    slabe[:liczba_okien] = (sumy_narastajace[dlugosc_okna:]
+                            - sumy_narastajace[:liczba_okien]) < prog_sumy
+    for odstep in range(1, dlugosc_okna):
+        pozycje = przesuniecia[1:] - odstep
+        slabe[pozycje[pozycje >= przesuniecia[:-1]]] = False
+
+    pozycje_slabych = np.append(np.flatnonzero(slabe), len(jakosci))
+    pierwsze_slabe = pozycje_slabych[np.searchsorted(pozycje_slabych, przesuniecia[:-1])]
+    return np.minimum(pierwsze_slabe, przesuniecia[1:]) - przesuniecia[:-1]
+
+
+def filtruj_wedlug_jakosci(
+    lista_sekwencji: list[SekwencjaDNA], parametry: ParametryJakosci
+) -> tuple[list[SekwencjaDNA], list[int]]:
+    """
+    Przycina odczyty oknem przesuwnym, odrzuca te, które są po przycięciu
+    za krótkie lub mają zbyt niską średnią jakość, i maskuje przez N
+    zasady niskiej jakości w pozostałych.
+
+    Obliczenia wykonywane są naraz dla całej listy na spakowanych
+    jakościach. Zmienione odczyty są nowymi obiektami, więc wejście nie
+    jest modyfikowane. Wpisy bez jakości (z plików FASTA) przechodzą
+    bez zmian.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przefiltrowania.
+        parametry (ParametryJakosci): Ustawienia filtrów.
+
+    Returns:
+        tuple[list[SekwencjaDNA], list[int]]: Sekwencje, które pozostają,
+        oraz ich pozycje w lista_sekwencji.
+    """
+    import numpy as np
+
+    pozycje_odczytow = [pozycja for pozycja, obiekt_sekwencji in enumerate(lista_sekwencji)
+                        if isinstance(obiekt_sekwencji, SekwencjaDNAZJakoscia)]
+    odczyty = [lista_sekwencji[pozycja] for pozycja in pozycje_odczytow]
+    jakosci, przesuniecia = spakuj_jakosci(odczyty)
+    dlugosci = np.diff(przesuniecia)
+    nowe_dlugosci = dlugosci
+    if parametry.prog_przycinania is not None:
+        nowe_dlugosci = przytnij_oknem_bufora(jakosci, przesuniecia, parametry.dlugosc_okna,
+                                              parametry.prog_przycinania)
+    zachowane = nowe_dlugosci >= parametry.min_dlugosc
+    if parametry.min_srednia is not None:
+        srednie = oblicz_srednia_jakosc_bufora(
+            jakosci, przesuniecia,
+            None if parametry.prog_przycinania is None else nowe_dlugosci)
+        zachowane &= srednie >= parametry.min_srednia
+
+    wynik = list(lista_sekwencji)
+    pozostaje = [True] * len(lista_sekwencji)
+    for numer, (pozycja, zachowany, dlugosc, nowa_dlugosc) in enumerate(zip(
+            pozycje_odczytow, zachowane.tolist(), dlugosci.tolist(), nowe_dlugosci.tolist())):
+        if not zachowany:
+            pozostaje[pozycja] = False
+        elif nowa_dlugosc < dlugosc:
+            odczyt = odczyty[numer]
+            wynik[pozycja] = SekwencjaDNAZJakoscia(
+                odczyt.nazwa, odczyt.sekwencja[:nowa_dlugosc], odczyt.jakosc[:nowa_dlugosc])
+    pozycje = [pozycja for pozycja, zachowany in enumerate(pozostaje) if zachowany]
+    wynik = [wynik[pozycja] for pozycja in pozycje]
+    if parametry.prog_maskowania is not None:
+        METRYKI.zwieksz("zamaskowane_zasady",
+                        maskuj_niska_jakosc(wynik, parametry.prog_maskowania))
+    return wynik, pozycje
+
+
+def maskuj_niska_jakosc(
+    lista_sekwencji: list[SekwencjaDNA], prog: int
+) -> int:
+    """
+    Zastępuje przez N zasady o jakości niższej niż prog, jak
+    SekwencjaDNAZJakoscia.maskuj_niska_jakosc, dla całej listy naraz.
+
+    Odczyty z zamaskowanymi zasadami są zastępowane w liście nowymi
+    obiektami; pozostałe elementy i wpisy bez jakości nie są zmieniane.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Lista modyfikowana w miejscu.
+        prog (int): Minimalna jakość Phred zasady.
+
+    Returns:
+        int: Liczba zamaskowanych zasad.
+    """
+    import numpy as np
+
+    pozycje_odczytow = [pozycja for pozycja, obiekt_sekwencji in enumerate(lista_sekwencji)
+                        if isinstance(obiekt_sekwencji, SekwencjaDNAZJakoscia)]
+    odczyty = [lista_sekwencji[pozycja] for pozycja in pozycje_odczytow]
+    bufor, przesuniecia = spakuj_sekwencje(odczyty)
+    jakosci, _ = spakuj_jakosci(odczyty)
+    niskie = jakosci < prog
+    liczby_zamaskowanych = zsumuj_odcinki(niskie, przesuniecia)
+    if not liczby_zamaskowanych.any():
+        return 0
+
+    zamaskowane = np.where(niskie, np.uint8(ord("N")), bufor).tobytes().decode('ascii')
+    granice = przesuniecia.tolist()
+    for numer in np.flatnonzero(liczby_zamaskowanych).tolist():
+        odczyt = odczyty[numer]
+        lista_sekwencji[pozycje_odczytow[numer]] = SekwencjaDNAZJakoscia(
+            odczyt.nazwa, zamaskowane[granice[numer]:granice[numer + 1]], odczyt.jakosc)
+    return int(liczby_zamaskowanych.sum())
+
+
+def utworz_plik_fastq_wektorowo(
+    nazwa_pliku: str, liczba_odczytow: int, dlugosc_odczytu: int = DLUGOSC_ODCZYTU_TESTOWEGO,
+    ziarno: int = 0
+):
+    """
+    Tworzy plik FASTQ z losowymi odczytami o stałej długości.
+
+    Jakość spada wzdłuż odczytu, jak w typowych danych z sekwenatora,
+    a co dziesiąty odczyt (średnio) jest w całości słabszej jakości.
+
+    Args:
+        nazwa_pliku (str): Ścieżka tworzonego pliku.
+        liczba_odczytow (int): Liczba odczytów.
+        dlugosc_odczytu (int): Liczba zasad w odczycie.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(ziarno)
+    with open(nazwa_pliku, 'wb') as f:
+        for poczatek in range(0, liczba_odczytow, ROZMIAR_BLOKU_GENERATORA):
+            liczba = min(ROZMIAR_BLOKU_GENERATORA, liczba_odczytow - poczatek)
+            dane, przesuniecia = generuj_sekwencje_wektorowo(
+                generator, np.full(liczba, dlugosc_odczytu),
+                zaszumione=generator.random(liczba) < 0.01)
+            spadek = np.linspace(0, 15, dlugosc_odczytu)
+            oczekiwane = (38 - spadek - 15 * (generator.random((liczba, 1)) < 0.1))
+            jakosci = np.clip(np.rint(generator.normal(oczekiwane, 4)), 2, 41)
+            jakosci = (jakosci.astype(np.uint8) + PRZESUNIECIE_PHRED).tobytes()
+            granice = przesuniecia.tolist()
+            f.write(b"".join(
+                b"@Odczyt_%d\n%s\n+\n%s\n" % (poczatek + i + 1,
+                                             dane[granice[i]:granice[i + 1]],
+                                             jakosci[granice[i]:granice[i + 1]])
+                for i in range(liczba)))
+
+
+def zmierz_filtrowanie_jakosci(
+    liczba_odczytow: int = 200_000, dlugosc_odczytu: int = DLUGOSC_ODCZYTU_TESTOWEGO,
+    ziarno: int = 0
+):
+    """
+    Mierzy przepustowość (odczyty na sekundę) wczytywania pliku FASTQ
+    oraz filtrów jakości: metod pojedynczych obiektów i obliczeń na
+    spakowanych jakościach. Sprawdza, czy oba podejścia dają te same
+    odczyty.
+
+    Args:
+        liczba_odczytow (int): Liczba odczytów w teście.
+        dlugosc_odczytu (int): Liczba zasad w odczycie.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import tempfile
+
+    parametry = ParametryJakosci(min_srednia=25.0, prog_przycinania=20.0, prog_maskowania=10,
+                                 min_dlugosc=dlugosc_odczytu // 3)
+    with tempfile.TemporaryDirectory() as katalog:
+        nazwa_pliku = os.path.join(katalog, "odczyty.fastq")
+        utworz_plik_fastq_wektorowo(nazwa_pliku, liczba_odczytow, dlugosc_odczytu, ziarno)
+        start = time.perf_counter()
+        odczyty = list(iteruj_plik_fastq(nazwa_pliku))
+        czas_wczytywania = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wynik_obiektow = []
+    for odczyt in odczyty:
+        dlugosc = odczyt.dlugosc_po_przycieciu(parametry.dlugosc_okna,
+                                               parametry.prog_przycinania)
+        przyciety = SekwencjaDNAZJakoscia(odczyt.nazwa, odczyt.sekwencja[:dlugosc],
+                                          odczyt.jakosc[:dlugosc])
+        if (dlugosc >= parametry.min_dlugosc
+                and przyciety.oblicz_srednia_jakosc() >= parametry.min_srednia):
+            wynik_obiektow.append((przyciety.nazwa,
+                                   przyciety.maskuj_niska_jakosc(parametry.prog_maskowania)))
+    czas_obiektow = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wynik_wsadowy, _ = filtruj_wedlug_jakosci(odczyty, parametry)
+    czas_wsadowy = time.perf_counter() - start
+
+    zgodne = wynik_obiektow == [(odczyt.nazwa, odczyt.sekwencja) for odczyt in wynik_wsadowy]
+    print(f"\n--- Filtrowanie jakości {liczba_odczytow} odczytów "
+          f"({dlugosc_odczytu} nt) ---")
+    print(f"  Wczytywanie FASTQ:     {liczba_odczytow / czas_wczytywania:,.0f} odczytów/s")
+    print(f"  Metody obiektów:       {liczba_odczytow / czas_obiektow:,.0f} odczytów/s")
+    print(f"  Obliczenia wsadowe:    {liczba_odczytow / czas_wsadowy:,.0f} odczytów/s "
+          f"(przyspieszenie x{czas_obiektow / czas_wsadowy:.1f})")
+    print(f"  Pozostało odczytów: {len(wynik_wsadowy)} z {liczba_odczytow}")
+    print(f"  Wyniki zgodne: {'Tak' if zgodne else 'Nie'}")
+
+
+def odwrotny_komplement(sekwencja: str) -> str:
+    """
+    Zwraca odwrotny komplement sekwencji DNA. Znaki spoza ACGT
+    pozostają bez zmian.
+
+    Args:
+        sekwencja (str): Sekwencja DNA.
+
+    Returns:
+        str: Odwrotny komplement sekwencji.
+    """
+    return sekwencja.translate(TABLICA_KOMPLEMENTARNOSCI)[::-1]
+
+
+def skrot_sekwencji(sekwencja: str, z_odwrotnym_komplementem: bool = False) -> bytes:
+    """
+    Oblicza 128-bitowy skrót treści sekwencji.
+
+    Args:
+        sekwencja (str): Sekwencja DNA.
+        z_odwrotnym_komplementem (bool): Jeśli True, sekwencja i jej odwrotny
+                                         komplement mają ten sam skrót.
+
+    Returns:
+        bytes: Skrót BLAKE2b o długości DLUGOSC_SKROTU bajtów.
+    """
+    if z_odwrotnym_komplementem:
+        sekwencja = min(sekwencja, odwrotny_komplement(sekwencja))
+    return hashlib.blake2b(sekwencja.encode(), digest_size=DLUGOSC_SKROTU).digest()
+
+
+def deduplikuj_w_pamieci(
+    rekordy: Iterable[tuple[str, str]], z_odwrotnym_komplementem: bool = False
+) -> dict[int, str]:
+    """
+    Wyszukuje dokładne duplikaty, pamiętając jedynie skróty treści.
+
+    Args:
+        rekordy (Iterable[tuple[str, str]]): Pary (nazwa, sekwencja).
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+
+    Returns:
+        dict[int, str]: Pozycja każdego duplikatu (w kolejności rekordów)
+        wraz z nazwą pierwszego wpisu o tej samej treści, który zostaje.
+    """
+    zachowane_skroty = {}
+    duplikaty = {}
+    for pozycja, (nazwa, sekwencja) in enumerate(rekordy):
+        skrot = skrot_sekwencji(sekwencja, z_odwrotnym_komplementem)
+        if skrot in zachowane_skroty:
+            duplikaty[pozycja] = zachowane_skroty[skrot]
+        else:
+            zachowane_skroty[skrot] = nazwa
+    return duplikaty
+
+
+def deduplikuj_na_dysku(
+    rekordy: Iterable[tuple[str, str]], katalog_partycji: str | None = None,
+    z_odwrotnym_komplementem: bool = False,
+    liczba_partycji: int = LICZBA_PARTYCJI_DEDUPLIKACJI
+) -> Iterator[tuple[int, str]]:
+    """
+    Wyszukuje dokładne duplikaty dla danych większych niż pamięć.
+
+    Skróty rekordów są najpierw rozpisywane do plików partycji według
+    prefiksu skrótu, a następnie każda partycja jest czytana strumieniowo
+    i deduplikowana osobno, więc w pamięci trzymane są naraz tylko skróty
+    zachowanych wpisów jednej partycji. Duplikaty każdej partycji trafiają
+    do pliku, a pliki są scalane po pozycji. Wszystkie rekordy są
+    wczytywane przy pobraniu pierwszego wyniku.
+
+    Args:
+        rekordy (Iterable[tuple[str, str]]): Pary (nazwa, sekwencja).
+        katalog_partycji (str | None): Katalog, w którym tworzony jest
+                                       tymczasowy katalog partycji.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        liczba_partycji (int): Liczba plików partycji.
+
+    Yields:
+        tuple[int, str]: Pozycja duplikatu i nazwa pierwszego wpisu o tej
+        samej treści, rosnąco według pozycji (jak w deduplikuj_w_pamieci).
+    """
+    import tempfile
+
+    naglowek = struct.Struct(f"<Q{DLUGOSC_SKROTU}sI")
+    wynik = struct.Struct("<QI")
+
+    def czytaj_duplikaty(sciezka: str) -> Iterator[tuple[int, str]]:
+        with open(sciezka, 'rb', buffering=ROZMIAR_BLOKU_ODCZYTU) as f:
+            while surowy_wynik := f.read(wynik.size):
+                pozycja, dlugosc_nazwy = wynik.unpack(surowy_wynik)
+                yield pozycja, f.read(dlugosc_nazwy).decode()
+
+    with tempfile.TemporaryDirectory(prefix="deduplikacja_", dir=katalog_partycji) as katalog:
+        sciezki = [os.path.join(katalog, f"partycja_{i:04d}.bin")
+                   for i in range(liczba_partycji)]
+        with contextlib.ExitStack() as stos:
+            zapisy = [stos.enter_context(open(sciezka, 'wb')).write for sciezka in sciezki]
+            for pozycja, (nazwa, sekwencja) in enumerate(rekordy):
+                skrot = skrot_sekwencji(sekwencja, z_odwrotnym_komplementem)
+                nazwa_bajty = nazwa.encode()
+                zapisy[int.from_bytes(skrot[:4], 'little') % liczba_partycji](
+                    naglowek.pack(pozycja, skrot, len(nazwa_bajty)) + nazwa_bajty)
+
+        sciezki_duplikatow = []
+        for sciezka in sciezki:
+            sciezki_duplikatow.append(sciezka + ".duplikaty")
+            zachowane_skroty = {}
+            with open(sciezka, 'rb', buffering=ROZMIAR_BLOKU_ODCZYTU) as f, \
+                    open(sciezki_duplikatow[-1], 'wb') as duplikaty:
+                while surowy_naglowek := f.read(naglowek.size):
+                    pozycja, skrot, dlugosc_nazwy = naglowek.unpack(surowy_naglowek)
+                    nazwa = f.read(dlugosc_nazwy)
+                    if skrot in zachowane_skroty:
+                        zachowana_nazwa = zachowane_skroty[skrot]
+                        duplikaty.write(wynik.pack(pozycja, len(zachowana_nazwa))
+                                        + zachowana_nazwa)
+                    else:
+                        zachowane_skroty[skrot] = nazwa
+            os.remove(sciezka)
+        del zachowane_skroty
+        yield from heapq.merge(*map(czytaj_duplikaty, sciezki_duplikatow))
+
+
+def haszuj_kmery(
+    bufor: np.ndarray, przesuniecia: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Oblicza 64-bitowe skróty wszystkich k-merów spakowanych sekwencji.
+
+    Okna przechodzące przez granicę dwóch sekwencji są pomijane.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        k (int): Długość k-meru.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Skróty k-merów (uint64) oraz numer
+        sekwencji, do której należy każdy k-mer (rosnąco).
+    """
+    import numpy as np
+
+    liczba_okien = len(bufor) - k + 1
+    if liczba_okien <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.intp)
+
+    wartosci = bufor.astype(np.uint64)
+    skroty = np.zeros(liczba_okien, dtype=np.uint64)
+    for j in range(k):
+        skroty = skroty * np.uint64(PODSTAWA_SKROTU_KMEROW) + wartosci[j:j + liczba_okien]
+    skroty ^= skroty >> np.uint64(31)
+    skroty *= np.uint64(MIESZANIE_SKROTU_KMEROW)
+    skroty ^= skroty >> np.uint64(29)
+
+    poczatki = np.arange(liczba_okien)
+    wlasciciele = np.searchsorted(przesuniecia, poczatki, side='right') - 1
+    w_jednej_sekwencji = poczatki + k <= przesuniecia[wlasciciele + 1]
+    return skroty[w_jednej_sekwencji], wlasciciele[w_jednej_sekwencji]
+
+
+def oblicz_sygnatury_minhash(
+    lista_sekwencji: list[SekwencjaDNA], k: int = DLUGOSC_KMERU_MINHASH,
+    liczba_permutacji: int = LICZBA_PERMUTACJI_MINHASH, ziarno: int = 0
+) -> np.ndarray:
+    """
+    Oblicza sygnatury MinHash zbiorów k-merów sekwencji.
+
+    Odsetek zgodnych pozycji w dwóch sygnaturach jest estymatorem
+    współczynnika Jaccarda zbiorów k-merów obu sekwencji.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do opisania.
+        k (int): Długość k-meru.
+        liczba_permutacji (int): Liczba funkcji skrótu (długość sygnatury).
+        ziarno (int): Ziarno wyznaczające funkcje skrótu.
+
+    Returns:
+        np.ndarray: Macierz uint64 o wymiarach (liczba sekwencji,
+        liczba_permutacji). Sekwencje krótsze niż k mają same wartości
+        maksymalne.
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(ziarno)
+    mnozniki = generator.integers(0, 2**64, liczba_permutacji, dtype=np.uint64) | np.uint64(1)
+    przesuniecia_skrotow = generator.integers(0, 2**64, liczba_permutacji, dtype=np.uint64)
+
+    sygnatury = np.full((len(lista_sekwencji), liczba_permutacji),
+                        np.iinfo(np.uint64).max, dtype=np.uint64)
+    for poczatek in range(0, len(lista_sekwencji), ROZMIAR_PARTII_MINHASH):
+        partia = lista_sekwencji[poczatek:poczatek + ROZMIAR_PARTII_MINHASH]
+        skroty, wlasciciele = haszuj_kmery(*spakuj_sekwencje(partia), k)
+        if not len(skroty):
+            continue
+        granice = np.flatnonzero(np.diff(wlasciciele)) + 1
+        granice = np.concatenate(([0], granice))
+        wiersze = poczatek + wlasciciele[granice]
+        for i in range(liczba_permutacji):
+            wartosci = mnozniki[i] * skroty + przesuniecia_skrotow[i]
+            wartosci ^= wartosci >> np.uint64(32)
+            sygnatury[wiersze, i] = np.minimum.reduceat(wartosci, granice)
+    return sygnatury
+
+
+def dobierz_pasma(liczba_permutacji: int, prog: float) -> tuple[int, int]:
+    """
+    Dobiera podział sygnatury na pasma LSH dla zadanego progu Jaccarda.
+
+    Wybierany jest podział, dla którego próg (1/pasma)^(1/wiersze) leży
+    najbliżej zadanego, ale nie powyżej niego (preferowana czułość).
+
+    Args:
+        liczba_permutacji (int): Długość sygnatury.
+        prog (float): Docelowy próg podobieństwa Jaccarda.
+
+    Returns:
+        tuple[int, int]: Liczba pasm i liczba wierszy w paśmie.
+    """
+    podzialy = [(liczba_permutacji // wiersze, wiersze)
+                for wiersze in range(1, liczba_permutacji + 1)
+                if liczba_permutacji % wiersze == 0]
+    return min(podzialy, key=lambda p: (
+        (1 / p[0]) ** (1 / p[1]) > prog, abs((1 / p[0]) ** (1 / p[1]) - prog)))
+
+
+def znajdz_bliskie_duplikaty(
+    lista_sekwencji: list[SekwencjaDNA], prog: float = PROG_BLISKICH_DUPLIKATOW,
+    k: int = DLUGOSC_KMERU_MINHASH,
+    liczba_permutacji: int = LICZBA_PERMUTACJI_MINHASH, ziarno: int = 0
+) -> list[tuple[int, int, float]]:
+    """
+    Wyszukuje pary sekwencji o podobnym składzie k-merów (MinHash + LSH).
+
+    Kandydaci wyznaczani są przez pasma LSH w czasie zbliżonym do
+    liniowego, a następnie filtrowani oszacowanym współczynnikiem Jaccarda.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do porównania.
+        prog (float): Minimalny oszacowany współczynnik Jaccarda.
+        k (int): Długość k-meru.
+        liczba_permutacji (int): Długość sygnatury MinHash.
+        ziarno (int): Ziarno funkcji skrótu.
+
+    Returns:
+        list[tuple[int, int, float]]: Posortowane pary (i, j, podobieństwo)
+        pozycji w lista_sekwencji, z i < j.
+    """
+    import numpy as np
+
+    sygnatury = oblicz_sygnatury_minhash(lista_sekwencji, k, liczba_permutacji, ziarno)
+    pasma, wiersze = dobierz_pasma(liczba_permutacji, prog)
+    aktywne = np.flatnonzero(sygnatury[:, 0] != np.iinfo(np.uint64).max)
+
+    kandydaci = set()
+    for pasmo in range(pasma):
+        kolumny = sygnatury[aktywne, pasmo * wiersze:(pasmo + 1) * wiersze]
+        klucze = np.zeros(len(aktywne), dtype=np.uint64)
+        for kolumna in kolumny.T:
+            klucze = klucze * np.uint64(PODSTAWA_SKROTU_KMEROW) + kolumna
+        kolejnosc = np.argsort(klucze, kind='stable')
+        posortowane = klucze[kolejnosc]
+        granice = np.flatnonzero(np.diff(posortowane)) + 1
+        for kubelek in np.split(kolejnosc, granice):
+            if len(kubelek) > 1:
+                czlonkowie = sorted(aktywne[kubelek].tolist())
+                for a, pierwszy in enumerate(czlonkowie):
+                    for drugi in czlonkowie[a + 1:]:
+                        kandydaci.add((pierwszy, drugi))
+
+    pary = []
+    for pierwszy, drugi in sorted(kandydaci):
+        podobienstwo = float(np.mean(sygnatury[pierwszy] == sygnatury[drugi]))
+        if podobienstwo >= prog:
+            pary.append((pierwszy, drugi, podobienstwo))
+    return pary
+
+
+def zmierz_wykrywanie_bliskich_duplikatow(
+    liczba_bazowych: int = 1000, kopii_na_bazowa: int = 2,
+    liczba_podstawien: int = 3, prog: float = PROG_BLISKICH_DUPLIKATOW,
+    ziarno: int = 0
+):
+    """
+    Porównuje MinHash + LSH z dokładnym porównaniem wszystkich par
+    pod względem czułości i przepustowości.
+
+    Dane testowe to losowe sekwencje bazowe oraz ich kopie z kilkoma
+    losowymi podstawieniami nukleotydów.
+
+    Args:
+        liczba_bazowych (int): Liczba losowych sekwencji bazowych.
+        kopii_na_bazowa (int): Liczba zmutowanych kopii każdej bazowej.
+        liczba_podstawien (int): Liczba podstawień w każdej kopii.
+        prog (float): Próg współczynnika Jaccarda.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    generator = random.Random(ziarno)
+    lista_sekwencji = []
+    for i in range(liczba_bazowych):
+        dlugosc = generator.randint(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI)
+        bazowa = "".join(generator.choices("ACGT", k=dlugosc))
+        lista_sekwencji.append(SekwencjaDNA(f"Baza_{i + 1}", bazowa))
+        for kopia in range(kopii_na_bazowa):
+            znaki = list(bazowa)
+            for pozycja in generator.sample(range(dlugosc), liczba_podstawien):
+                znaki[pozycja] = generator.choice("ACGT".replace(znaki[pozycja], ""))
+            lista_sekwencji.append(SekwencjaDNA(f"Baza_{i + 1}_kopia_{kopia + 1}",
+                                                "".join(znaki)))
+
+    start = time.perf_counter()
+    zbiory = [{s.sekwencja[i:i + DLUGOSC_KMERU_MINHASH]
+               for i in range(len(s.sekwencja) - DLUGOSC_KMERU_MINHASH + 1)}
+              for s in lista_sekwencji]
+    prawdziwe_pary = set()
+    for i in range(len(zbiory)):
+        for j in range(i + 1, len(zbiory)):
+            if len(zbiory[i] & zbiory[j]) / len(zbiory[i] | zbiory[j]) >= prog:
+                prawdziwe_pary.add((i, j))
+    czas_dokladny = time.perf_counter() - start
+
+    start = time.perf_counter()
+    znalezione_pary = {(i, j) for i, j, _ in znajdz_bliskie_duplikaty(lista_sekwencji, prog)}
+    czas_lsh = time.perf_counter() - start
+
+    trafione = len(prawdziwe_pary & znalezione_pary)
+    print(f"\n--- Bliskie duplikaty: {len(lista_sekwencji)} sekwencji, "
+          f"próg Jaccarda {prog} ---")
+    print(f"  Wszystkie pary: {czas_dokladny:.2f} s "
+          f"({len(lista_sekwencji) / czas_dokladny:.0f} sekwencji/s), "
+          f"par powyżej progu: {len(prawdziwe_pary)}")
+    print(f"  MinHash + LSH:  {czas_lsh:.2f} s "
+          f"({len(lista_sekwencji) / czas_lsh:.0f} sekwencji/s), "
+          f"znalezionych par: {len(znalezione_pary)}")
+    print(f"  Czułość: {trafione / max(len(prawdziwe_pary), 1):.3f}, "
+          f"precyzja: {trafione / max(len(znalezione_pary), 1):.3f}")
+
+
+def koduj_kmery(
+    bufor: np.ndarray, przesuniecia: np.ndarray, k: int, kanoniczne: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Koduje wszystkie k-mery spakowanych sekwencji jako liczby 2-bitowe
+    (A=0, C=1, G=2, T=3, pierwszy nukleotyd w najstarszych bitach).
+
+    Kody okien liczone są przesuwnie dla całego bufora naraz. Pomijane są
+    okna przechodzące przez granicę dwóch sekwencji oraz okna zawierające
+    znak, który jest_poprawna uznaje za niepoprawny.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        k (int): Długość k-meru (1-MAKS_DLUGOSC_KMERU).
+        kanoniczne (bool): Zastąp każdy k-mer mniejszym z pary k-mer
+                           i jego odwrotny komplement.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Kody k-merów (uint64) oraz numer
+        sekwencji, do której należy każdy k-mer (rosnąco).
+    """
+    import numpy as np
+
+    if not 1 <= k <= MAKS_DLUGOSC_KMERU:
+        raise ValueError(f"Długość k-meru musi mieścić się w zakresie "
+                         f"1-{MAKS_DLUGOSC_KMERU}.")
+    liczba_okien = len(bufor) - k + 1
+    if liczba_okien <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.intp)
+
+    nukleotydy = np.frombuffer(TABLICA_KODOW_2BIT, dtype=np.uint8).astype(np.uint64)[bufor]
+    kody = np.zeros(liczba_okien, dtype=np.uint64)
+    for j in range(k):
+        kody <<= np.uint64(2)
+        kody |= nukleotydy[j:j + liczba_okien]
+    if kanoniczne:
+        komplementy = np.zeros(liczba_okien, dtype=np.uint64)
+        for j in reversed(range(k)):
+            komplementy <<= np.uint64(2)
+            komplementy |= np.uint64(3) - nukleotydy[j:j + liczba_okien]
+        np.minimum(kody, komplementy, out=kody)
+
+    niepoprawne = np.zeros(len(bufor) + 1, dtype=np.int64)
+    np.cumsum(np.frombuffer(TABLICA_NIEPOPRAWNYCH, dtype=np.uint8)[bufor], out=niepoprawne[1:])
+    poczatki = np.arange(liczba_okien)
+    wlasciciele = np.searchsorted(przesuniecia, poczatki, side='right') - 1
+    zachowane = ((poczatki + k <= przesuniecia[wlasciciele + 1])
+                 & (niepoprawne[k:] == niepoprawne[:liczba_okien]))
+    return kody[zachowane], wlasciciele[zachowane]
+
+
+def dekoduj_kmery(kody: np.ndarray, k: int) -> list[str]:
+    """
+    Zamienia kody z koduj_kmery z powrotem na napisy.
+
+    Args:
+        kody (np.ndarray): Kody k-merów.
+        k (int): Długość k-meru.
+
+    Returns:
+        list[str]: K-mery w kolejności kodów.
+    """
+    import numpy as np
+
+    przesuniecia_bitow = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    nukleotydy = (np.asarray(kody, dtype=np.uint64)[:, None] >> przesuniecia_bitow) & np.uint64(3)
+    znaki = np.frombuffer(ALFABET_2BIT, dtype=np.uint8)[nukleotydy.astype(np.intp)]
+    return znaki.view(f"S{k}").ravel().astype(str).tolist()
+
+
+def widma_sekwencji(
+    kody: np.ndarray, wlasciciele: np.ndarray, liczby: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zlicza k-mery osobno w każdej sekwencji.
+
+    Args:
+        kody (np.ndarray): Kody k-merów z koduj_kmery.
+        wlasciciele (np.ndarray): Numery sekwencji z koduj_kmery.
+        liczby (np.ndarray | None): Liczby wystąpień par (sekwencja, kod),
+                                    gdy sumowane są widma częściowe;
+                                    domyślnie każda para występuje raz.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Numer sekwencji, kod
+        k-meru i liczba wystąpień, posortowane po sekwencji i kodzie.
+    """
+    import numpy as np
+
+    kolejnosc = np.lexsort((kody, wlasciciele))
+    kody, wlasciciele = kody[kolejnosc], wlasciciele[kolejnosc]
+    if not len(kody):
+        return wlasciciele, kody, np.empty(0, dtype=np.int64)
+    nowe = np.ones(len(kody), dtype=bool)
+    nowe[1:] = (kody[1:] != kody[:-1]) | (wlasciciele[1:] != wlasciciele[:-1])
+    poczatki = np.flatnonzero(nowe)
+    if liczby is None:
+        liczby = np.diff(np.append(poczatki, len(kody)))
+    else:
+        liczby = np.add.reduceat(liczby[kolejnosc], poczatki)
+    return wlasciciele[poczatki], kody[poczatki], liczby
+
+
+class LicznikKmerow:
+    """
+    Globalne widmo k-merów zbierane partiami.
+
+    Dla k do MAKS_K_TABLICY_KMEROW liczniki są tablicą NumPy indeksowaną
+    kodem k-meru (4^k elementów). Dla większych k tablica byłaby zbyt
+    duża, więc liczniki trzymane są w słowniku, do którego trafiają już
+    zsumowane kody każdej partii.
+
+    Atrybuty:
+        k (int): Długość k-meru.
+        kanoniczne (bool): Czy zliczane są k-mery kanoniczne.
+        liczniki (np.ndarray | dict[int, int]): Liczby wystąpień kodów.
+        liczba_kmerow (int): Liczba wszystkich zliczonych okien.
+    """
+
+    def __init__(self, k: int, kanoniczne: bool = False):
+        import numpy as np
+
+        self.k = k
+        self.kanoniczne = kanoniczne
+        self.liczniki = (np.zeros(4 ** k, dtype=np.int64) if k <= MAKS_K_TABLICY_KMEROW
+                         else {})
+        self.liczba_kmerow = 0
+
+    def dodaj_kody(self, kody: np.ndarray):
+        """
+        Dolicza kody k-merów partii.
+
+        Args:
+            kody (np.ndarray): Kody z koduj_kmery.
+        """
+        import numpy as np
+
+        if not isinstance(self.liczniki, np.ndarray):
+            self.dodaj_liczby(*np.unique(kody, return_counts=True))
+            return
+        self.liczba_kmerow += len(kody)
+        self.liczniki += np.bincount(kody.astype(np.intp), minlength=len(self.liczniki))
+
+    def dodaj_liczby(self, kody: np.ndarray, liczby: np.ndarray):
+        """
+        Dolicza widmo podane jako pary (kod, liczba wystąpień), np. wynik
+        kody_i_liczby z procesu roboczego.
+
+        Args:
+            kody (np.ndarray): Różne kody k-merów.
+            liczby (np.ndarray): Liczby wystąpień kodów.
+        """
+        import numpy as np
+
+        self.liczba_kmerow += int(liczby.sum())
+        if isinstance(self.liczniki, np.ndarray):
+            self.liczniki[kody.astype(np.intp)] += liczby
+            return
+        for kod, liczba in zip(kody.tolist(), liczby.tolist()):
+            self.liczniki[kod] = self.liczniki.get(kod, 0) + liczba
+
+    def polacz(self, inny: "LicznikKmerow"):
+        """
+        Dolicza widmo innego licznika (np. z procesu roboczego).
+
+        Args:
+            inny (LicznikKmerow): Licznik z tym samym k i trybem.
+        """
+        import numpy as np
+
+        self.liczba_kmerow += inny.liczba_kmerow
+        if isinstance(self.liczniki, np.ndarray):
+            self.liczniki += inny.liczniki
+            return
+        for kod, liczba in inny.liczniki.items():
+            self.liczniki[kod] = self.liczniki.get(kod, 0) + liczba
+
+    def kody_i_liczby(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Kody obecnych k-merów (rosnąco)
+            i ich liczby wystąpień.
+        """
+        import numpy as np
+
+        if isinstance(self.liczniki, np.ndarray):
+            kody = np.flatnonzero(self.liczniki)
+            return kody.astype(np.uint64), self.liczniki[kody]
+        kody = np.fromiter(self.liczniki, dtype=np.uint64, count=len(self.liczniki))
+        kody.sort()
+        return kody, np.array([self.liczniki[kod] for kod in kody.tolist()], dtype=np.int64)
+
+    def najczestsze(self, liczba: int) -> list[tuple[str, int]]:
+        """
+        Args:
+            liczba (int): Liczba zwracanych k-merów.
+
+        Returns:
+            list[tuple[str, int]]: Najczęstsze k-mery z liczbą wystąpień,
+            malejąco (przy równej liczbie rosnąco według k-meru).
+        """
+        import numpy as np
+
+        kody, liczby = self.kody_i_liczby()
+        wybrane = np.lexsort((kody, -liczby))[:liczba]
+        return list(zip(dekoduj_kmery(kody[wybrane], self.k), liczby[wybrane].tolist()))
+
+    def do_slownika(self) -> dict[str, int]:
+        """
+        Returns:
+            dict[str, int]: Widmo jako słownik k-mer -> liczba wystąpień.
+        """
+        kody, liczby = self.kody_i_liczby()
+        return dict(zip(dekoduj_kmery(kody, self.k), liczby.tolist()))
+
+
+def policz_kmery_bufora(
+    bufor: np.ndarray, przesuniecia: np.ndarray, k: int, kanoniczne: bool = False,
+    na_sekwencje: bool = False, zasady_odcinka: int = ZASADY_PARTII_KMEROW
+) -> tuple[LicznikKmerow, tuple[np.ndarray, np.ndarray, np.ndarray] | None]:
+    """
+    Liczy globalne (i opcjonalnie osobne dla sekwencji) widmo k-merów
+    spakowanych sekwencji.
+
+    koduj_kmery potrzebuje kilkudziesięciu bajtów tablic tymczasowych na
+    nukleotyd, więc bufor jest kodowany odcinkami po zasady_odcinka okien
+    (z zakładką k - 1 nukleotydów), również wewnątrz jednej długiej
+    sekwencji.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        k (int): Długość k-meru.
+        kanoniczne (bool): Zliczaj k-mery kanoniczne.
+        na_sekwencje (bool): Czy zwrócić także widma sekwencji.
+        zasady_odcinka (int): Liczba okien kodowanych jednorazowo.
+
+    Returns:
+        tuple[LicznikKmerow, tuple | None]: Widmo globalne oraz wynik
+        widma_sekwencji (None, jeśli na_sekwencje jest fałszywe).
+    """
+    import numpy as np
+
+    licznik = LicznikKmerow(k, kanoniczne)
+    widma = []
+    for poczatek in range(0, len(bufor) - k + 1, zasady_odcinka):
+        koniec = min(poczatek + zasady_odcinka + k - 1, len(bufor))
+        pierwsza = int(np.searchsorted(przesuniecia, poczatek, side='right')) - 1
+        ostatnia = int(np.searchsorted(przesuniecia, koniec, side='left'))
+        przesuniecia_odcinka = np.clip(przesuniecia[pierwsza:ostatnia + 1],
+                                       poczatek, koniec) - poczatek
+        kody, wlasciciele = koduj_kmery(bufor[poczatek:koniec], przesuniecia_odcinka,
+                                        k, kanoniczne)
+        licznik.dodaj_kody(kody)
+        if na_sekwencje:
+            wlasciciele, kody, liczby = widma_sekwencji(kody, wlasciciele)
+            widma.append((wlasciciele + pierwsza, kody, liczby))
+    if not na_sekwencje:
+        return licznik, None
+    if len(widma) == 1:
+        return licznik, widma[0]
+    if not widma:
+        return licznik, widma_sekwencji(np.empty(0, dtype=np.uint64),
+                                        np.empty(0, dtype=np.intp))
+    return licznik, widma_sekwencji(*(np.concatenate(kolumna) for kolumna in
+                                      zip(*((kody, wlasciciele, liczby)
+                                            for wlasciciele, kody, liczby in widma))))
+
+
+def policz_kmery_fragmentu_wspoldzielonego(
+    nazwa_pamieci: str, przesuniecia: np.ndarray, k: int, kanoniczne: bool,
+    na_sekwencje: bool
+) -> tuple[tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray, np.ndarray] | None]:
+    """
+    Liczy k-mery jednego fragmentu danych w pamięci współdzielonej.
+    Funkcja uruchamiana jest w procesie roboczym.
+
+    Args:
+        nazwa_pamieci (str): Nazwa bloku SharedMemory z buforem sekwencji.
+        przesuniecia (np.ndarray): Przesunięcia sekwencji fragmentu
+                                   względem początku całego bufora.
+        k (int): Długość k-meru.
+        kanoniczne (bool): Zliczaj k-mery kanoniczne.
+        na_sekwencje (bool): Czy zwrócić także widma sekwencji.
+
+    Returns:
+        tuple: Widmo fragmentu jako pary (kody, liczby) z kody_i_liczby,
+        aby nie przesyłać gęstej tablicy 4^k liczników, oraz widma
+        sekwencji jak w policz_kmery_bufora (numery sekwencji liczone od
+        początku fragmentu).
+    """
+    from multiprocessing import shared_memory
+    import numpy as np
+
+    pamiec = shared_memory.SharedMemory(name=nazwa_pamieci)
+    try:
+        bufor = np.ndarray((int(przesuniecia[-1]),), dtype=np.uint8, buffer=pamiec.buf)
+        licznik, widma = policz_kmery_bufora(
+            bufor[przesuniecia[0]:], przesuniecia - przesuniecia[0], k, kanoniczne,
+            na_sekwencje)
+        del bufor
+    finally:
+        pamiec.close()
+    return licznik.kody_i_liczby(), widma
+
+
+def policz_kmery(
+    lista_sekwencji: list[SekwencjaDNA], k: int, kanoniczne: bool = False,
+    procesy: int = 1, na_sekwencje: bool = False, pula: ProcessPoolExecutor | None = None
+) -> tuple[LicznikKmerow, tuple[np.ndarray, np.ndarray, np.ndarray] | None]:
+    """
+    Liczy widmo k-merów partii sekwencji, opcjonalnie w puli procesów.
+
+    Podobnie jak w oblicz_statystyki_rownolegle sekwencje trafiają do
+    procesów roboczych przez pamięć współdzieloną. Fragmenty mają zbliżoną
+    liczbę nukleotydów, a ich widma wracają jako rzadkie pary (kod, liczba)
+    i są dodawane do jednego licznika w miarę napływania.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przeanalizowania.
+        k (int): Długość k-meru.
+        kanoniczne (bool): Zliczaj k-mery kanoniczne.
+        procesy (int): Liczba procesów roboczych.
+        na_sekwencje (bool): Czy zwrócić także widma sekwencji.
+        pula (ProcessPoolExecutor | None): Pula z pula_procesow; domyślnie
+                                           tworzona na czas wywołania.
+
+    Returns:
+        tuple[LicznikKmerow, tuple | None]: Widmo globalne oraz numery
+        sekwencji (pozycje w lista_sekwencji), kody i liczby k-merów
+        każdej sekwencji (None, jeśli na_sekwencje jest fałszywe).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    import numpy as np
+
+    if procesy <= 1 or len(lista_sekwencji) < 2:
+        return policz_kmery_bufora(*spakuj_sekwencje(lista_sekwencji), k, kanoniczne,
+                                   na_sekwencje)
+
+    pamiec = None
+
+    def przydziel_bufor(rozmiar: int) -> memoryview:
+        nonlocal pamiec
+        pamiec = shared_memory.SharedMemory(create=True, size=rozmiar)
+        return pamiec.buf
+
+    bufor, przesuniecia = spakuj_sekwencje(lista_sekwencji, przydziel_bufor)
+    granice = np.searchsorted(
+        przesuniecia, np.linspace(0, len(bufor), procesy * FRAGMENTY_NA_PROCES + 1))
+    granice[0], granice[-1] = 0, len(lista_sekwencji)
+    granice = [(poczatek, koniec) for poczatek, koniec in zip(granice[:-1], granice[1:])
+               if koniec > poczatek]
+    licznik = LicznikKmerow(k, kanoniczne)
+    widma = []
+    try:
+        with contextlib.ExitStack() as stos:
+            if pula is None:
+                pula = stos.enter_context(ProcessPoolExecutor(max_workers=procesy))
+            for (poczatek, _), (kody_i_liczby, widma_fragmentu) in zip(granice, pula.map(
+                    policz_kmery_fragmentu_wspoldzielonego, itertools.repeat(pamiec.name),
+                    [przesuniecia[poczatek:koniec + 1] for poczatek, koniec in granice],
+                    itertools.repeat(k), itertools.repeat(kanoniczne),
+                    itertools.repeat(na_sekwencje))):
+                licznik.dodaj_liczby(*kody_i_liczby)
+                if na_sekwencje:
+                    wlasciciele, kody, liczby = widma_fragmentu
+                    widma.append((wlasciciele + poczatek, kody, liczby))
+    finally:
+        del bufor
+        pamiec.close()
+        pamiec.unlink()
+
+    if not na_sekwencje:
+        return licznik, None
+    return licznik, tuple(np.concatenate(kolumna) for kolumna in zip(*widma))
+
+
+def iteruj_partie_zasad(
+    sekwencje: Iterable, zasady_w_partii: int, dlugosc: Callable[..., int] | None = None
+) -> Iterator[list]:
+    """
+    Dzieli strumień sekwencji na partie o łącznej długości około
+    zasady_w_partii nukleotydów (partia kończy się na sekwencji, która
+    przekroczyła limit), tak by pamięć partii nie zależała od długości
+    odczytów.
+
+    Args:
+        sekwencje (Iterable): Strumień sekwencji (domyślnie SekwencjaDNA).
+        zasady_w_partii (int): Docelowa liczba nukleotydów w partii.
+        dlugosc (Callable[..., int] | None): Zwraca liczbę nukleotydów
+                                             elementu strumienia.
+
+    Yields:
+        list: Kolejne niepuste partie.
+    """
+    partia = []
+    zasady = 0
+    for sekwencja in sekwencje:
+        partia.append(sekwencja)
+        zasady += len(sekwencja.sekwencja) if dlugosc is None else dlugosc(sekwencja)
+        if zasady >= zasady_w_partii:
+            yield partia
+            partia = []
+            zasady = 0
+    if partia:
+        yield partia
+
+
+def policz_kmery_pliku(
+    nazwa_pliku: str, k: int, kanoniczne: bool = False, procesy: int = 1,
+    zasady_w_partii: int = ZASADY_PARTII_KMEROW,
+    plik_widm_sekwencji: str | None = None
+) -> LicznikKmerow:
+    """
+    Liczy globalne widmo k-merów pliku FASTA partiami, opcjonalnie
+    zapisując widma poszczególnych sekwencji do pliku TSV
+    (nazwa, k-mer, liczba).
+
+    Args:
+        nazwa_pliku (str): Plik FASTA.
+        k (int): Długość k-meru.
+        kanoniczne (bool): Zliczaj k-mery kanoniczne.
+        procesy (int): Liczba procesów roboczych.
+        zasady_w_partii (int): Liczba nukleotydów w partii (iteruj_partie_zasad).
+        plik_widm_sekwencji (str | None): Ścieżka pliku na widma sekwencji.
+
+    Returns:
+        LicznikKmerow: Widmo globalne.
+    """
+    licznik = LicznikKmerow(k, kanoniczne)
+    with contextlib.ExitStack() as stos:
+        wyjscie = (stos.enter_context(open(plik_widm_sekwencji, 'w', encoding='utf-8'))
+                   if plik_widm_sekwencji else None)
+        pula = stos.enter_context(pula_procesow(procesy))
+        for partia in iteruj_partie_zasad(iteruj_plik_fasta(nazwa_pliku), zasady_w_partii):
+            licznik_partii, widma = policz_kmery(partia, k, kanoniczne, procesy,
+                                                 wyjscie is not None, pula)
+            licznik.polacz(licznik_partii)
+            if wyjscie is not None:
+                wlasciciele, kody, liczby = widma
+                wyjscie.writelines(
+                    f"{partia[wlasciciel].nazwa}\t{kmer}\t{liczba}\n"
+                    for wlasciciel, kmer, liczba in zip(
+                        wlasciciele.tolist(), dekoduj_kmery(kody, k), liczby.tolist()))
+    return licznik
+
+
+def policz_kmery_naiwnie(
+    lista_sekwencji: list[SekwencjaDNA], k: int, kanoniczne: bool = False
+) -> Counter:
+    """
+    Wzorcowe zliczanie k-merów przez wycinanie napisów do Counter,
+    używane do sprawdzania i porównywania wydajności policz_kmery.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Sekwencje do przeanalizowania.
+        k (int): Długość k-meru.
+        kanoniczne (bool): Zliczaj k-mery kanoniczne.
+
+    Returns:
+        Counter: Liczby wystąpień k-merów.
+    """
+    licznik = Counter()
+    for sekwencja_dna in lista_sekwencji:
+        sekwencja = sekwencja_dna.sekwencja
+        kmery = (sekwencja[i:i + k] for i in range(len(sekwencja) - k + 1))
+        kmery = (kmer for kmer in kmery if not WZORZEC_NIEPOPRAWNEGO_ZNAKU.search(kmer))
+        if kanoniczne:
+            kmery = (min(kmer, kmer.translate(TABLICA_KOMPLEMENTARNOSCI)[::-1])
+                     for kmer in kmery)
+        licznik.update(kmery)
+    return licznik
+
+
+def zmierz_liczenie_kmerow(
+    liczba_sekwencji: int = 100_000, dlugosci_kmerow: Iterable[int] = (5, 21),
+    procesy: int = 1, ziarno: int = 0
+):
+    """
+    Porównuje policz_kmery z naiwnym zliczaniem do Counter na losowych
+    sekwencjach (z częścią niepoprawnych znaków) i sprawdza zgodność
+    wyników.
+
+    Args:
+        liczba_sekwencji (int): Liczba losowych sekwencji.
+        dlugosci_kmerow (Iterable[int]): Sprawdzane wartości k.
+        procesy (int): Liczba procesów dla policz_kmery.
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(ziarno)
+    dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                  liczba_sekwencji)
+    zaszumione = generator.random(liczba_sekwencji) < 0.05
+    dane, przesuniecia = generuj_sekwencje_wektorowo(generator, dlugosci, zaszumione)
+    lista_sekwencji = [
+        SekwencjaDNA(f"Sekwencja_{i + 1}",
+                     dane[przesuniecia[i]:przesuniecia[i + 1]].decode('ascii'))
+        for i in range(liczba_sekwencji)]
+
+    print(f"\n--- Zliczanie k-merów: {liczba_sekwencji} sekwencji ---")
+    for k in dlugosci_kmerow:
+        for kanoniczne in (False, True):
+            start = time.perf_counter()
+            wzorcowe = policz_kmery_naiwnie(lista_sekwencji, k, kanoniczne)
+            czas_naiwny = time.perf_counter() - start
+
+            start = time.perf_counter()
+            licznik, _ = policz_kmery(lista_sekwencji, k, kanoniczne, procesy)
+            czas_numpy = time.perf_counter() - start
+
+            zgodne = licznik.do_slownika() == dict(wzorcowe)
+            tryb = "kanoniczne" if kanoniczne else "zwykłe"
+            print(f"  k={k} ({tryb}): Counter {czas_naiwny:.2f} s, "
+                  f"policz_kmery {czas_numpy:.2f} s "
+                  f"({czas_naiwny / czas_numpy:.1f}x), "
+                  f"różnych k-merów: {len(wzorcowe)}, zgodne: {'tak' if zgodne else 'NIE'}")
+
+
+def uklad_indeksu_motywow(
+    naglowek: tuple
+) -> tuple[int, dict[str, tuple[int, np.dtype, int]]]:
+    """
+    Wyznacza położenie tablic w pliku indeksu motywów.
+
+    Args:
+        naglowek (tuple): Pola NAGLOWEK_INDEKSU_MOTYWOW.
+
+    Returns:
+        tuple[int, dict]: Rozmiar całego pliku oraz, dla każdej tablicy,
+        przesunięcie w bajtach, typ elementu i liczba elementów.
+    """
+    import numpy as np
+
+    (_, k, bajty_pozycji, liczba_sekwencji, dlugosc_tekstu, liczba_pozycji,
+     liczba_pozycji_ogonow, dlugosc_nazw, _, _) = naglowek
+    typ_pozycji = np.dtype(np.uint32 if bajty_pozycji == 4 else np.uint64)
+    tablice = (
+        ("poczatki_sekwencji", np.dtype(np.int64), liczba_sekwencji + 1),
+        ("przesuniecia_nazw", np.dtype(np.int64), liczba_sekwencji + 1),
+        ("przesuniecia_kmerow", np.dtype(np.int64), 4 ** k + 1),
+        ("przesuniecia_ogonow", np.dtype(np.int64), (4 ** k - 4) // 3 + 1),
+        ("pozycje_kmerow", typ_pozycji, liczba_pozycji),
+        ("pozycje_ogonow", typ_pozycji, liczba_pozycji_ogonow),
+        ("tekst", np.dtype(np.uint8), dlugosc_tekstu),
+        ("nazwy", np.dtype(np.uint8), dlugosc_nazw),
+    )
+    uklad = {}
+    przesuniecie = NAGLOWEK_INDEKSU_MOTYWOW.size
+    for nazwa, typ, liczba in tablice:
+        przesuniecie += -przesuniecie % 8
+        uklad[nazwa] = (przesuniecie, typ, liczba)
+        przesuniecie += typ.itemsize * liczba
+    return przesuniecie, uklad
+
+
+def pierwsze_klucze_ogonow(k: int) -> np.ndarray:
+    """
+    Args:
+        k (int): Długość k-meru indeksu.
+
+    Returns:
+        np.ndarray: Dla r = 0..k-1 pierwszy klucz ogona długości r
+        (ogony długości r zajmują klucze od pierwszego do pierwszego + 4^r).
+    """
+    import numpy as np
+
+    return np.array([(4 ** r - 4) // 3 for r in range(k)], dtype=np.int64)
+
+
+def klucze_pozycji_indeksu(
+    bufor: np.ndarray, przesuniecia: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wyznacza klucze indeksu motywów dla każdej pozycji spakowanych
+    sekwencji.
+
+    Pozycja, od której zaczyna się pełny, poprawny k-mer, dostaje kod tego
+    k-meru. Pozycja, od której do niepoprawnego znaku lub końca sekwencji
+    zostaje r < k poprawnych znaków (ogon), dostaje klucz r-meru; dzięki
+    temu wzorce krótsze niż k znajdowane są także przy końcach sekwencji.
+
+    Args:
+        bufor (np.ndarray): Bufor uint8 ze złączonymi sekwencjami.
+        przesuniecia (np.ndarray): Tablica przesunięć o długości n + 1.
+        k (int): Długość k-meru indeksu.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Pozycje
+        i kody pełnych k-merów oraz pozycje i klucze ogonów (rosnąco
+        według pozycji).
+    """
+    import numpy as np
+
+    dlugosc = len(bufor)
+    nukleotydy = np.frombuffer(TABLICA_KODOW_2BIT, dtype=np.uint8).astype(np.uint64)[
+        np.concatenate([bufor, np.zeros(k - 1, dtype=np.uint8)])]
+    kody = np.zeros(dlugosc, dtype=np.uint64)
+    for j in range(k):
+        kody <<= np.uint64(2)
+        kody |= nukleotydy[j:j + dlugosc]
+
+    niepoprawne = np.append(
+        np.flatnonzero(np.frombuffer(TABLICA_NIEPOPRAWNYCH, dtype=np.uint8)[bufor]), dlugosc)
+    pozycje = np.arange(dlugosc)
+    pozostalo = np.minimum(niepoprawne[np.searchsorted(niepoprawne, pozycje)],
+                           przesuniecia[np.searchsorted(przesuniecia, pozycje, side='right')]
+                           ) - pozycje
+
+    pelne = np.flatnonzero(pozostalo >= k)
+    ogony = np.flatnonzero((pozostalo > 0) & (pozostalo < k))
+    dlugosci_ogonow = pozostalo[ogony]
+    klucze_ogonow = (pierwsze_klucze_ogonow(k)[dlugosci_ogonow]
+                     + (kody[ogony] >> (2 * (k - dlugosci_ogonow)).astype(np.uint64))
+                     .astype(np.int64))
+    return pelne, kody[pelne].astype(np.int64), ogony, klucze_ogonow
+
+
+def rozloz_do_kubelkow(
+    klucze: np.ndarray, pozycje: np.ndarray, kursory: np.ndarray, cel: np.ndarray
+):
+    """
+    Dopisuje pozycje partii do ich kubełków (sortowanie przez zliczanie).
+    Kolejność pozycji w obrębie kubełka jest zachowana.
+
+    Args:
+        klucze (np.ndarray): Klucz (numer kubełka) każdej pozycji.
+        pozycje (np.ndarray): Pozycje do zapisania.
+        kursory (np.ndarray): Następne wolne miejsce każdego kubełka;
+                              aktualizowane w miejscu.
+        cel (np.ndarray): Tablica wszystkich pozycji indeksu.
+    """
+    import numpy as np
+
+    kolejnosc = np.argsort(klucze, kind='stable')
+    posortowane = klucze[kolejnosc]
+    miejsca = (kursory[posortowane] + np.arange(len(posortowane))
+               - np.searchsorted(posortowane, posortowane))
+    cel[miejsca] = pozycje[kolejnosc]
+    kursory += np.bincount(klucze, minlength=len(kursory))
+
+
+def zbuduj_indeks_motywow(
+    nazwa_pliku_fasta: str, k: int = DLUGOSC_KMERU_INDEKSU,
+    rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW
+) -> str:
+    """
+    Buduje odwrócony indeks k-merów pliku FASTA i zapisuje go obok pliku
+    (rozszerzenie ROZSZERZENIE_INDEKSU_MOTYWOW) w postaci nadającej się
+    do mapowania pamięci.
+
+    Plik jest czytany dwukrotnie: pierwszy przebieg zlicza rozmiary
+    kubełków, drugi wpisuje pozycje bezpośrednio do zmapowanego pliku,
+    więc pamięć poza samym plikiem jest ograniczona do jednej partii
+    i tablic przesunięć kubełków.
+
+    Args:
+        nazwa_pliku_fasta (str): Plik FASTA.
+        k (int): Długość k-meru indeksu (1-MAKS_DLUGOSC_KMERU_INDEKSU).
+        rozmiar_partii (int): Liczba sekwencji w partii.
+
+    Returns:
+        str: Ścieżka zapisanego indeksu.
+    """
+    import numpy as np
+
+    if not 1 <= k <= MAKS_DLUGOSC_KMERU_INDEKSU:
+        raise ValueError(f"Długość k-meru indeksu musi mieścić się w zakresie "
+                         f"1-{MAKS_DLUGOSC_KMERU_INDEKSU}.")
+    liczby_kmerow = np.zeros(4 ** k, dtype=np.int64)
+    liczby_ogonow = np.zeros((4 ** k - 4) // 3, dtype=np.int64)
+    liczba_sekwencji = dlugosc_tekstu = dlugosc_nazw = 0
+
+    def partie() -> Iterator[tuple[list[SekwencjaDNA], np.ndarray, np.ndarray]]:
+        sekwencje = iteruj_plik_fasta(nazwa_pliku_fasta)
+        while partia := list(itertools.islice(sekwencje, rozmiar_partii)):
+            yield partia, *spakuj_sekwencje(partia)
+
+    for partia, bufor, przesuniecia in partie():
+        _, kody, _, klucze_ogonow = klucze_pozycji_indeksu(bufor, przesuniecia, k)
+        liczby_kmerow += np.bincount(kody, minlength=len(liczby_kmerow))
+        liczby_ogonow += np.bincount(klucze_ogonow, minlength=len(liczby_ogonow))
+        liczba_sekwencji += len(partia)
+        dlugosc_tekstu += len(bufor)
+        dlugosc_nazw += sum(len(s.nazwa.encode()) for s in partia)
+
+    stan_pliku = os.stat(nazwa_pliku_fasta)
+    naglowek = (MAGIA_INDEKSU_MOTYWOW, k, 4 if dlugosc_tekstu < 2 ** 32 else 8,
+                liczba_sekwencji, dlugosc_tekstu, int(liczby_kmerow.sum()),
+                int(liczby_ogonow.sum()), dlugosc_nazw,
+                stan_pliku.st_size, stan_pliku.st_mtime_ns)
+    rozmiar, uklad = uklad_indeksu_motywow(naglowek)
+
+    sciezka_indeksu = nazwa_pliku_fasta + ROZSZERZENIE_INDEKSU_MOTYWOW
+    tymczasowa_sciezka = sciezka_indeksu + ".tmp"
+    with open(tymczasowa_sciezka, 'w+b') as f:
+        f.truncate(rozmiar)
+        f.write(NAGLOWEK_INDEKSU_MOTYWOW.pack(*naglowek))
+        f.flush()
+        with mmap.mmap(f.fileno(), rozmiar) as mapa:
+            tablice = {nazwa: np.frombuffer(mapa, typ, liczba, przesuniecie)
+                       for nazwa, (przesuniecie, typ, liczba) in uklad.items()}
+            tablice["przesuniecia_kmerow"][1:] = np.cumsum(liczby_kmerow)
+            tablice["przesuniecia_ogonow"][1:] = np.cumsum(liczby_ogonow)
+            kursory_kmerow = tablice["przesuniecia_kmerow"][:-1].copy()
+            kursory_ogonow = tablice["przesuniecia_ogonow"][:-1].copy()
+
+            numer_sekwencji = poczatek_tekstu = poczatek_nazw = 0
+            for partia, bufor, przesuniecia in partie():
+                pozycje, kody, pozycje_ogonow, klucze_ogonow = klucze_pozycji_indeksu(
+                    bufor, przesuniecia, k)
+                rozloz_do_kubelkow(kody, pozycje + poczatek_tekstu, kursory_kmerow,
+                                   tablice["pozycje_kmerow"])
+                rozloz_do_kubelkow(klucze_ogonow, pozycje_ogonow + poczatek_tekstu,
+                                   kursory_ogonow, tablice["pozycje_ogonow"])
+
+                nazwy = [s.nazwa.encode() for s in partia]
+                koniec = numer_sekwencji + len(partia)
+                tablice["poczatki_sekwencji"][numer_sekwencji + 1:koniec + 1] = \
+                    poczatek_tekstu + przesuniecia[1:]
+                tablice["przesuniecia_nazw"][numer_sekwencji + 1:koniec + 1] = \
+                    poczatek_nazw + np.cumsum([len(nazwa) for nazwa in nazwy])
+                tablice["tekst"][poczatek_tekstu:poczatek_tekstu + len(bufor)] = bufor
+                dane_nazw = b"".join(nazwy)
+                tablice["nazwy"][poczatek_nazw:poczatek_nazw + len(dane_nazw)] = \
+                    np.frombuffer(dane_nazw, dtype=np.uint8)
+                numer_sekwencji = koniec
+                poczatek_tekstu += len(bufor)
+                poczatek_nazw += len(dane_nazw)
+            del tablice
+            mapa.flush()
+    os.replace(tymczasowa_sciezka, sciezka_indeksu)
+    return sciezka_indeksu
+
+
+class IndeksMotywow:
+    """
+    Odwrócony indeks k-merów pliku FASTA do wyszukiwania motywów,
+    w tym wzorców z kodami niejednoznaczności IUPAC.
+
+    Indeks jest mapowany z pliku obok pliku FASTA i budowany
+    automatycznie, gdy nie istnieje lub nie odpowiada aktualnemu plikowi.
+    Czas wyszukiwania zależy od długości wzorca i liczby trafień
+    (kandydatów z najrzadszego okna wzorca), a nie od rozmiaru kolekcji.
+
+    Atrybuty:
+        nazwa_pliku (str): Nazwa pliku FASTA.
+        k (int): Długość k-meru indeksu.
+    """
+
+    def __init__(self, nazwa_pliku: str, k: int = DLUGOSC_KMERU_INDEKSU):
+        """
+        Otwiera (lub buduje) indeks motywów pliku FASTA.
+
+        Args:
+            nazwa_pliku (str): Nazwa pliku FASTA.
+            k (int): Długość k-meru indeksu.
+        """
+        self.nazwa_pliku = nazwa_pliku
+        self.k = k
+        sciezka_indeksu = nazwa_pliku + ROZSZERZENIE_INDEKSU_MOTYWOW
+        if not self._otworz(sciezka_indeksu):
+            dziennik.info("Budowanie indeksu motywów '%s'...", sciezka_indeksu)
+            zbuduj_indeks_motywow(nazwa_pliku, k)
+            if not self._otworz(sciezka_indeksu):
+                raise OSError(f"Nie można otworzyć indeksu motywów '{sciezka_indeksu}'.")
+
+    def _otworz(self, sciezka_indeksu: str) -> bool:
+        """
+        Mapuje plik indeksu, o ile istnieje i odpowiada plikowi FASTA.
+
+        Returns:
+            bool: True, jeśli indeks został otwarty.
+        """
+        import numpy as np
+
+        if not os.path.exists(sciezka_indeksu):
+            return False
+        stan_pliku = os.stat(self.nazwa_pliku)
+        with open(sciezka_indeksu, 'rb') as f:
+            try:
+                naglowek = NAGLOWEK_INDEKSU_MOTYWOW.unpack(
+                    f.read(NAGLOWEK_INDEKSU_MOTYWOW.size))
+            except struct.error:
+                return False
+            if (naglowek[0] != MAGIA_INDEKSU_MOTYWOW or naglowek[1] != self.k
+                    or naglowek[8:] != (stan_pliku.st_size, stan_pliku.st_mtime_ns)):
+                return False
+            rozmiar, uklad = uklad_indeksu_motywow(naglowek)
+            if os.fstat(f.fileno()).st_size != rozmiar:
+                return False
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for nazwa, (przesuniecie, typ, liczba) in uklad.items():
+            setattr(self, f"_{nazwa}", np.frombuffer(self._mapa, typ, liczba, przesuniecie))
+        return True
+
+    def __len__(self) -> int:
+        return len(self._poczatki_sekwencji) - 1
+
+    def __enter__(self) -> "IndeksMotywow":
+        return self
+
+    def __exit__(self, *args):
+        self.zamknij()
+
+    def nazwa_sekwencji(self, numer: int) -> str:
+        """
+        Args:
+            numer (int): Numer sekwencji (kolejność w pliku, od 0).
+
+        Returns:
+            str: Nazwa sekwencji.
+        """
+        return self._nazwy[self._przesuniecia_nazw[numer]:
+                           self._przesuniecia_nazw[numer + 1]].tobytes().decode()
+
+    def znajdz(self, wzorzec: str) -> list[tuple[str, int]]:
+        """
+        Wyszukuje wszystkie wystąpienia wzorca (także nakładające się).
+
+        Args:
+            wzorzec (str): Wzorzec z liter ACGT lub kodów IUPAC (np. N, R, Y).
+
+        Returns:
+            list[tuple[str, int]]: Nazwa sekwencji i pozycja początku
+            wystąpienia (od 0), w kolejności z pliku.
+        """
+        import numpy as np
+
+        numery, pozycje = self.znajdz_pozycje(wzorzec)
+        nazwy = {numer: self.nazwa_sekwencji(numer) for numer in np.unique(numery).tolist()}
+        return [(nazwy[numer], pozycja)
+                for numer, pozycja in zip(numery.tolist(), pozycje.tolist())]
+
+    def znajdz_pozycje(self, wzorzec: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Wyszukuje wystąpienia wzorca, zwracając numery sekwencji zamiast
+        nazw.
+
+        Args:
+            wzorzec (str): Wzorzec z liter ACGT lub kodów IUPAC.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Numery sekwencji i pozycje
+            wystąpień w ich obrębie (rosnąco).
+        """
+        import numpy as np
+
+        maski = maski_wzorca_iupac(wzorzec)
+        if len(maski) < self.k:
+            trafienia = self._kandydaci_krotkiego_wzorca(maski)
+        else:
+            trafienia = self._kandydaci_dlugiego_wzorca(maski)
+        if trafienia is None:
+            loguj_z_limitem(logging.WARNING, "Wzorzec '%s' jest zbyt niejednoznaczny dla "
+                            "indeksu; przeszukuję całą kolekcję.", wzorzec)
+            trafienia = self._przeszukaj_tekst(maski)
+        # Każda pozycja tekstu należy do dokładnie jednego kubełka, więc
+        # kandydaci się nie powtarzają i wystarczy ich posortować.
+        trafienia = self._zweryfikuj(np.sort(trafienia), maski)
+        numery = np.searchsorted(self._poczatki_sekwencji, trafienia, side='right') - 1
+        return numery, trafienia - self._poczatki_sekwencji[numery]
+
+    def _kandydaci_krotkiego_wzorca(self, maski: np.ndarray) -> np.ndarray | None:
+        """
+        Zbiera pozycje wzorca krótszego niż k z zakresów kubełków pełnych
+        k-merów i ogonów, które zaczynają się od wzorca.
+        """
+        import numpy as np
+
+        dlugosc = len(maski)
+        kody = rozwin_maski_iupac(maski)
+        if kody is None:
+            return None
+        pierwsze_klucze = pierwsze_klucze_ogonow(self.k)
+        fragmenty = []
+        for kod in kody.tolist():
+            przesuniecie = 2 * (self.k - dlugosc)
+            fragmenty.append(self._pozycje_kmerow[
+                self._przesuniecia_kmerow[kod << przesuniecie]:
+                self._przesuniecia_kmerow[(kod + 1) << przesuniecie]])
+            for r in range(dlugosc, self.k):
+                przesuniecie = 2 * (r - dlugosc)
+                fragmenty.append(self._pozycje_ogonow[
+                    self._przesuniecia_ogonow[pierwsze_klucze[r] + (kod << przesuniecie)]:
+                    self._przesuniecia_ogonow[pierwsze_klucze[r] + ((kod + 1) << przesuniecie)]])
+        return np.concatenate(fragmenty).astype(np.int64)
+
+    def _kandydaci_dlugiego_wzorca(self, maski: np.ndarray) -> np.ndarray | None:
+        """
+        Wybiera okno wzorca o najmniejszej łącznej liczbie wystąpień
+        w indeksie i zwraca przesunięte pozycje jego k-merów.
+        """
+        import numpy as np
+
+        najlepsze = None
+        for j in range(len(maski) - self.k + 1):
+            kody = rozwin_maski_iupac(maski[j:j + self.k])
+            if kody is None:
+                continue
+            rozmiar = int((self._przesuniecia_kmerow[kody + 1]
+                           - self._przesuniecia_kmerow[kody]).sum())
+            if najlepsze is None or rozmiar < najlepsze[0]:
+                najlepsze = (rozmiar, j, kody)
+        if najlepsze is None:
+            return None
+        _, j, kody = najlepsze
+        fragmenty = [self._pozycje_kmerow[self._przesuniecia_kmerow[kod]:
+                                          self._przesuniecia_kmerow[kod + 1]]
+                     for kod in kody.tolist()]
+        return np.concatenate(fragmenty).astype(np.int64) - j
+
+    def _przeszukaj_tekst(self, maski: np.ndarray) -> np.ndarray:
+        """
+        Sprawdza wzorzec na każdej pozycji tekstu (dla wzorców zbyt
+        niejednoznacznych, by rozwinąć je w k-mery indeksu).
+        """
+        import numpy as np
+
+        liczba_okien = len(self._tekst) - len(maski) + 1
+        if liczba_okien <= 0:
+            return np.empty(0, dtype=np.int64)
+        bity_nukleotydow = np.frombuffer(TABLICA_BITOW_NUKLEOTYDOW, dtype=np.uint8)
+        zgodne = np.ones(liczba_okien, dtype=bool)
+        for j, maska in enumerate(maski.tolist()):
+            zgodne &= (bity_nukleotydow[self._tekst[j:j + liczba_okien]] & maska) > 0
+        return np.flatnonzero(zgodne)
+
+    def _zweryfikuj(self, kandydaci: np.ndarray, maski: np.ndarray) -> np.ndarray:
+        """
+        Zostawia kandydatów, od których cały wzorzec pasuje do tekstu
+        w obrębie jednej sekwencji.
+        """
+        import numpy as np
+
+        dlugosc = len(maski)
+        kandydaci = kandydaci[kandydaci >= 0]
+        numery = np.searchsorted(self._poczatki_sekwencji, kandydaci, side='right') - 1
+        kandydaci = kandydaci[kandydaci + dlugosc <= self._poczatki_sekwencji[numery + 1]]
+        bity_nukleotydow = np.frombuffer(TABLICA_BITOW_NUKLEOTYDOW, dtype=np.uint8)
+        zgodne = []
+        rozmiar_fragmentu = max(1, ROZMIAR_FRAGMENTU_WERYFIKACJI // dlugosc)
+        for poczatek in range(0, len(kandydaci), rozmiar_fragmentu):
+            fragment = kandydaci[poczatek:poczatek + rozmiar_fragmentu]
+            znaki = self._tekst[fragment[:, None] + np.arange(dlugosc)]
+            zgodne.append(fragment[(bity_nukleotydow[znaki] & maski).all(axis=1)])
+        return np.concatenate(zgodne) if zgodne else kandydaci
+
+    def zamknij(self):
+        """
+        Zwalnia mapowanie pliku indeksu.
+        """
+        import numpy as np
+
+        if getattr(self, "_mapa", None) is None:
+            return
+        for nazwa in list(vars(self)):
+            if isinstance(getattr(self, nazwa), np.ndarray):
+                delattr(self, nazwa)
+        self._mapa.close()
+        self._mapa = None
+
+
+def maski_wzorca_iupac(wzorzec: str) -> np.ndarray:
+    """
+    Zamienia wzorzec na maski bitowe dopuszczalnych nukleotydów
+    (A=1, C=2, G=4, T=8).
+
+    Args:
+        wzorzec (str): Wzorzec z liter ACGT lub kodów IUPAC.
+
+    Returns:
+        np.ndarray: Maska uint8 dla każdej pozycji wzorca.
+    """
+    import numpy as np
+
+    if not wzorzec:
+        raise ValueError("Wzorzec nie może być pusty.")
+    try:
+        return np.array([KODY_IUPAC[znak] for znak in wzorzec.upper()], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError(f"Niedozwolony znak wzorca: {e.args[0]!r}.") from None
+
+
+def rozwin_maski_iupac(maski: np.ndarray) -> np.ndarray | None:
+    """
+    Wylicza kody 2-bitowe wszystkich konkretnych sekwencji pasujących
+    do wzorca.
+
+    Args:
+        maski (np.ndarray): Maski z maski_wzorca_iupac.
+
+    Returns:
+        np.ndarray | None: Kody (int64) lub None, jeśli wzorzec ma więcej
+        niż MAKS_ROZWINIEC_WZORCA rozwinięć.
+    """
+    import numpy as np
+
+    kody = np.zeros(1, dtype=np.int64)
+    for maska in maski.tolist():
+        nukleotydy = [kod for kod in range(4) if maska >> kod & 1]
+        if len(kody) * len(nukleotydy) > MAKS_ROZWINIEC_WZORCA:
+            return None
+        kody = ((kody[:, None] << 2) | nukleotydy).ravel()
+    return kody
+
+
+def zmierz_wyszukiwanie_motywow(
+    liczba_sekwencji: int = 200_000, wzorce: Iterable[str] = ("GATTACA", "ACGTNNACGT",
+                                                               "TATAWAWR", "CACGTGCACGTGCA"),
+    ziarno: int = 0
+):
+    """
+    Porównuje wyszukiwanie motywów w IndeksMotywow z pętlą wyrażeń
+    regularnych po wszystkich sekwencjach i sprawdza zgodność trafień.
+
+    Args:
+        liczba_sekwencji (int): Liczba losowych sekwencji.
+        wzorce (Iterable[str]): Wyszukiwane wzorce (z kodami IUPAC).
+        ziarno (int): Ziarno generatora liczb losowych.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as katalog:
+        nazwa_pliku = os.path.join(katalog, "motywy.fa")
+        utworz_plik_fasta_wektorowo(nazwa_pliku, liczba_sekwencji, ziarno)
+        lista_sekwencji = list(iteruj_plik_fasta(nazwa_pliku))
+
+        start = time.perf_counter()
+        with IndeksMotywow(nazwa_pliku):
+            pass
+        czas_budowy = time.perf_counter() - start
+        print(f"\n--- Wyszukiwanie motywów: {liczba_sekwencji} sekwencji, "
+              f"budowa indeksu {czas_budowy:.2f} s ---")
+
+        with IndeksMotywow(nazwa_pliku) as indeks:
+            for wzorzec in wzorce:
+                wyrazenie = re.compile("(?=" + "".join(
+                    "[" + "".join(z for i, z in enumerate("ACGT") if KODY_IUPAC[znak] >> i & 1)
+                    + "]" for znak in wzorzec) + ")")
+                start = time.perf_counter()
+                wzorcowe = [(s.nazwa, t.start()) for s in lista_sekwencji
+                            for t in wyrazenie.finditer(s.sekwencja)]
+                czas_petli = time.perf_counter() - start
+
+                start = time.perf_counter()
+                trafienia = indeks.znajdz(wzorzec)
+                czas_indeksu = time.perf_counter() - start
+                print(f"  {wzorzec}: pętla {czas_petli * 1000:.1f} ms, "
+                      f"indeks {czas_indeksu * 1000:.2f} ms, trafień: {len(trafienia)}, "
+                      f"zgodne: {'tak' if trafienia == wzorcowe else 'NIE'}")
+
+
+def zbuduj_tabele_wynikow(
+    lista_sekwencji: list[SekwencjaDNA], statystyki: dict[str, np.ndarray],
+    zachowane_indeksy: list[int]
+) -> pd.DataFrame:
+    """
+    Buduje tabelę wyników kolumnami z gotowych tablic statystyk.
+
+    Kolumna Typ_Sekwencji ma typ kategoryczny, co zmniejsza zużycie
+    pamięci i pozwala zapisać ją jako kolumnę słownikową.
+
+    Args:
+        lista_sekwencji (list[SekwencjaDNA]): Wszystkie sekwencje partii.
+        statystyki (dict[str, np.ndarray]): Wynik oblicz_statystyki_wsadowe.
+        zachowane_indeksy (list[int]): Pozycje wpisów, które pozostają.
+
+    Returns:
+        pd.DataFrame: Tabela z kolumnami Nazwa, Sekwencja, Dlugosc,
+                      Zawartosc_GC i Typ_Sekwencji.
+    """
+    import numpy as np
+    import pandas as pd
+
+    with METRYKI.mierz("budowa_tabeli"):
+        zachowane = np.array(zachowane_indeksy, dtype=np.intp)
+        nazwy = np.empty(len(zachowane), dtype=object)
+        sekwencje = np.empty(len(zachowane), dtype=object)
+        for pozycja, indeks in enumerate(zachowane_indeksy):
+            obiekt_sekwencji = lista_sekwencji[indeks]
+            nazwy[pozycja] = obiekt_sekwencji.nazwa
+            sekwencje[pozycja] = obiekt_sekwencji.sekwencja
+
+        return pd.DataFrame({
+            "Nazwa": nazwy,
+            "Sekwencja": sekwencje,
+            "Dlugosc": statystyki["Dlugosc"][zachowane],
+            "Zawartosc_GC": statystyki["Zawartosc_GC"][zachowane],
+            "Typ_Sekwencji": pd.Categorical(statystyki["Typ_Sekwencji"][zachowane],
+                                            categories=list(TYPY_SEKWENCJI)),
+        })
+
+
+def podsumuj_czyszczenie(liczniki: dict[str, int]):
+    """
+    Wypisuje podsumowanie czyszczenia oraz liczbę komunikatów pominiętych
+    przez OGRANICZNIK_KOMUNIKATOW.
+
+    Args:
+        liczniki (dict[str, int]): Liczniki jak w oczysc_partie.
+    """
+    OGRANICZNIK_KOMUNIKATOW.podsumuj()
+    dziennik.info("  Usunięto duplikatów: %d", liczniki["Duplikaty"])
+    dziennik.info("  Usunięto wadliwych sekwencji: %d", liczniki["Niepoprawne"])
+    if "Niska_jakosc" in liczniki:
+        dziennik.info("  Usunięto odczytów niskiej jakości: %d", liczniki["Niska_jakosc"])
+    dziennik.info("  Pozostało sekwencji po oczyszczeniu: %d z %d początkowych.",
+                  liczniki["Zachowane"], liczniki["Wczytane"])
+
+
+def przetworz_sekwencje(
+    slownik_sekwencji: dict[str, SekwencjaDNA], procesy: int = 1,
+    z_odwrotnym_komplementem: bool = False, prog_bliskich_duplikatow: float | None = None,
+    pamiec_podreczna: PamiecPodrecznaStatystyk | None = None,
+    parametry_jakosci: ParametryJakosci | None = None
+) -> pd.DataFrame:
+    """
+    Przetwarza sekwencje DNA, usuwając wadliwe i zduplikowane wpisy,
+    a następnie konwertuje pozostałe dane do DataFrame.
+
+    Filtry jakości (dla odczytów FASTQ) działają przed walidacją, więc
+    statystyki i deduplikacja dotyczą przyciętych i zamaskowanych
+    odczytów. W odczytach N jest poprawną zasadą (zob.
+    SekwencjaDNAZJakoscia.jest_poprawna).
+
+    Args:
+        slownik_sekwencji (dict): Słownik sekwencji DNA do przetworzenia.
+        procesy (int): Liczba procesów obliczających statystyki. Dla
+                       wartości większych niż 1 dane są dzielone między
+                       procesy; wynik jest identyczny jak przy 1 procesie.
+        z_odwrotnym_komplementem (bool): Jeśli True, sekwencja będąca
+                                         odwrotnym komplementem wcześniejszej
+                                         również jest usuwana jako duplikat.
+        parametry_jakosci (ParametryJakosci | None): Jeśli podano,
+                                                     włącza filtry jakości.
+
+    Returns:
+        pd.DataFrame: DataFrame zawierający oczyszczone i przetworzone
+                      sekwencje. Pusty DataFrame, jeśli nie ma danych
+                      do przetworzenia. Atrybut attrs["Zwiniete_duplikaty"]
+                      zawiera słownik: nazwa zachowanego wpisu -> lista
+                      nazw usuniętych jako jego duplikaty, a
+                      attrs["Zwiniete_bliskie_duplikaty"] analogicznie
+                      dla bliskich duplikatów.
+    """
+    import pandas as pd
+
+    if not slownik_sekwencji:
+        dziennik.info("Brak sekwencji do przetworzenia.")
+        return pd.DataFrame()
+
+    dziennik.info("\n--- Przetwarzanie sekwencji ---")
+    lista_sekwencji = list(slownik_sekwencji.values())
+    poczatkowa_liczba = len(lista_sekwencji)
+    liczniki = {}
+    if parametry_jakosci is not None:
+        with METRYKI.mierz("jakosc"):
+            lista_sekwencji, pozycje = filtruj_wedlug_jakosci(lista_sekwencji,
+                                                              parametry_jakosci)
+        nazwy = list(slownik_sekwencji)
+        pozostale = set(pozycje)
+        for pozycja, nazwa in enumerate(nazwy):
+            if pozycja not in pozostale:
+                loguj_z_limitem(logging.INFO, "  Usuwam odczyt niskiej jakości: %s", nazwa)
+        slownik_sekwencji = dict(zip((nazwy[pozycja] for pozycja in pozycje),
+                                     lista_sekwencji))
+        liczniki["Niska_jakosc"] = poczatkowa_liczba - len(lista_sekwencji)
+        METRYKI.zwieksz("odczyty_niskiej_jakosci", liczniki["Niska_jakosc"])
+    statystyki = oblicz_statystyki(lista_sekwencji, procesy, pamiec_podreczna)
+    poprawne = statystyki["Poprawna"].tolist()
+    pozycje_poprawnych = [i for i, poprawna in enumerate(poprawne) if poprawna]
+    rekordy_poprawne = ((lista_sekwencji[i].nazwa, lista_sekwencji[i].sekwencja)
+                        for i in pozycje_poprawnych)
+    with METRYKI.mierz("deduplikacja"):
+        duplikaty = deduplikuj_w_pamieci(rekordy_poprawne, z_odwrotnym_komplementem)
+    duplikaty = {pozycje_poprawnych[pozycja]: zachowana_nazwa
+                 for pozycja, zachowana_nazwa in duplikaty.items()}
+
+    zachowane_indeksy = []
+    zwiniete_duplikaty = {}
+    usunietych_duplikatow = 0
+    usunietych_niepoprawnych = 0
+
+    for indeks, (nazwa, obiekt_sekwencji) in enumerate(slownik_sekwencji.items()):
+        if not poprawne[indeks]:
+            loguj_z_limitem(logging.INFO, "  Usuwam wadliwą sekwencję: %s (zawiera "
+                            "niepoprawne nukleotydy)", nazwa)
+            usunietych_niepoprawnych += 1
+            continue
+
+        if indeks in duplikaty:
+            loguj_z_limitem(logging.INFO, "  Usuwam duplikat: %s (treść sekwencji już "
+                            "istnieje w %s)", nazwa, duplikaty[indeks])
+            zwiniete_duplikaty.setdefault(duplikaty[indeks], []).append(nazwa)
+            usunietych_duplikatow += 1
+            continue
+
+        zachowane_indeksy.append(indeks)
+
+    zwiniete_bliskie_duplikaty = {}
+    if prog_bliskich_duplikatow is not None:
+        partnerzy = {}
+        with METRYKI.mierz("bliskie_duplikaty"):
+            pary = znajdz_bliskie_duplikaty(
+                [lista_sekwencji[i] for i in zachowane_indeksy], prog_bliskich_duplikatow)
+        for pierwszy, drugi, podobienstwo in pary:
+            partnerzy.setdefault(drugi, []).append((pierwszy, podobienstwo))
+
+        usuniete_pozycje = set()
+        for drugi in sorted(partnerzy):
+            for pierwszy, podobienstwo in partnerzy[drugi]:
+                if pierwszy in usuniete_pozycje:
+                    continue
+                nazwa = lista_sekwencji[zachowane_indeksy[drugi]].nazwa
+                zachowana_nazwa = lista_sekwencji[zachowane_indeksy[pierwszy]].nazwa
+                loguj_z_limitem(logging.INFO, "  Usuwam bliski duplikat: %s (podobna do "
+                                "%s, Jaccard ≈ %.2f)", nazwa, zachowana_nazwa, podobienstwo)
+                zwiniete_bliskie_duplikaty.setdefault(zachowana_nazwa, []).append(nazwa)
+                usuniete_pozycje.add(drugi)
+                break
+        zachowane_indeksy = [indeks for pozycja, indeks in enumerate(zachowane_indeksy)
+                             if pozycja not in usuniete_pozycje]
+        METRYKI.zwieksz("bliskie_duplikaty", len(usuniete_pozycje))
+        dziennik.info("  Usunięto bliskich duplikatów: %d", len(usuniete_pozycje))
+
+    METRYKI.zwieksz("wpisy_niepoprawne", usunietych_niepoprawnych)
+    METRYKI.zwieksz("duplikaty", usunietych_duplikatow)
+    METRYKI.zwieksz("wpisy_zachowane", len(zachowane_indeksy))
+    liczniki.update({"Wczytane": poczatkowa_liczba,
+                     "Duplikaty": usunietych_duplikatow,
+                     "Niepoprawne": usunietych_niepoprawnych,
+                     "Zachowane": len(zachowane_indeksy)})
+    podsumuj_czyszczenie(liczniki)
+    if pamiec_podreczna is not None:
+        dziennik.info("  Pamięć podręczna statystyk: %d trafień, %d chybień.",
+                      pamiec_podreczna.trafienia, pamiec_podreczna.chybienia)
+
+    tabela_danych = zbuduj_tabele_wynikow(lista_sekwencji, statystyki, zachowane_indeksy)
+    tabela_danych.attrs["Zwiniete_duplikaty"] = zwiniete_duplikaty
+    tabela_danych.attrs["Zwiniete_bliskie_duplikaty"] = zwiniete_bliskie_duplikaty
+    return tabela_danych
+
+
+def oczysc_pojedyncza_partie(
+    partia: list[SekwencjaDNA], z_odwrotnym_komplementem: bool, procesy: int,
+    liczniki: dict[str, int], pamiec_podreczna: PamiecPodrecznaStatystyk | None,
+    zachowane_skroty: set[bytes], statystyki: dict[str, np.ndarray] | None = None,
+    duplikaty_partii: set[int] | None = None, pula: ProcessPoolExecutor | None = None
+) -> tuple[dict[str, np.ndarray], list[int]]:
+    """
+    Oblicza statystyki partii i wybiera wpisy, które pozostają po
+    usunięciu wadliwych i zduplikowanych (zob. oczysc_partie).
+
+    Args:
+        partia (list[SekwencjaDNA]): Sekwencje partii.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów obliczających statystyki.
+        liczniki (dict[str, int]): Liczniki aktualizowane w miejscu.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna
+                                                            statystyk.
+        zachowane_skroty (set[bytes]): Skróty wpisów zachowanych wcześniej;
+                                       uzupełniany w miejscu.
+        statystyki (dict[str, np.ndarray] | None): Statystyki partii, jeśli
+                                                   zostały już obliczone.
+        duplikaty_partii (set[int] | None): Pozycje duplikatów w partii
+                                            wyznaczone przez
+                                            deduplikuj_na_dysku; wtedy
+                                            zachowane_skroty nie jest używany.
+        pula (ProcessPoolExecutor | None): Pula z pula_procesow.
+
+    Returns:
+        tuple[dict[str, np.ndarray], list[int]]: Statystyki partii oraz
+        pozycje wpisów, które pozostają.
+    """
+    liczniki["Wczytane"] += len(partia)
+    if statystyki is None:
+        statystyki = oblicz_statystyki(partia, procesy, pamiec_podreczna, pula)
+    zachowane_indeksy = []
+    niepoprawne = duplikaty = 0
+    with METRYKI.mierz("deduplikacja"):
+        for indeks, poprawna in enumerate(statystyki["Poprawna"].tolist()):
+            if not poprawna:
+                niepoprawne += 1
+                continue
+            if duplikaty_partii is not None:
+                if indeks in duplikaty_partii:
+                    duplikaty += 1
+                    continue
+            else:
+                skrot = skrot_sekwencji(partia[indeks].sekwencja, z_odwrotnym_komplementem)
+                if skrot in zachowane_skroty:
+                    duplikaty += 1
+                    continue
+                zachowane_skroty.add(skrot)
+            zachowane_indeksy.append(indeks)
+    liczniki["Niepoprawne"] += niepoprawne
+    liczniki["Duplikaty"] += duplikaty
+    liczniki["Zachowane"] += len(zachowane_indeksy)
+    METRYKI.zwieksz("wpisy_niepoprawne", niepoprawne)
+    METRYKI.zwieksz("duplikaty", duplikaty)
+    METRYKI.zwieksz("wpisy_zachowane", len(zachowane_indeksy))
+    return statystyki, zachowane_indeksy
+
+
+def oczysc_partie(
+    sekwencje: Iterable[SekwencjaDNA], rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW,
+    z_odwrotnym_komplementem: bool = False, procesy: int = 1,
+    liczniki: dict[str, int] | None = None,
+    pamiec_podreczna: PamiecPodrecznaStatystyk | None = None,
+    zachowane_skroty: set[bytes] | None = None,
+    parametry_jakosci: ParametryJakosci | None = None,
+    katalog_partycji: str | None = None
+) -> Iterator[tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]]:
+    """
+    Usuwa wadliwe i zduplikowane wpisy ze strumienia sekwencji,
+    przetwarzając go kolejnymi partiami.
+
+    Duplikaty wykrywane są globalnie, po skrótach treści, a nie tylko
+    w obrębie jednej partii. W pamięci trzymana jest jedna partia
+    sekwencji. Zamiast komunikatu o każdym usuniętym wpisie na końcu
+    wypisywane jest podsumowanie.
+
+    Zbiór skrótów zachowanych wpisów rośnie z liczbą różnych sekwencji.
+    Gdy podano katalog_partycji, skróty trafiają do deduplikuj_na_dysku,
+    a partie ze statystykami są odkładane do pliku tymczasowego
+    w tym samym katalogu i zwracane dopiero po przeczytaniu całego
+    strumienia. Pamięć nie zależy wtedy od rozmiaru danych, kosztem
+    zapisu danych na dysk i opóźnienia pierwszej partii.
+
+    Args:
+        sekwencje (Iterable[SekwencjaDNA]): Strumień sekwencji, np. z
+                                            iteruj_plik_fasta.
+        rozmiar_partii (int): Liczba sekwencji wejściowych w partii.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów obliczających statystyki partii.
+        liczniki (dict[str, int] | None): Jeśli podano, uzupełniany jest
+                                          kluczami "Wczytane", "Duplikaty",
+                                          "Niepoprawne" i "Zachowane".
+                                          Istniejące wartości są
+                                          kontynuowane.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna
+                                                            statystyk.
+        zachowane_skroty (set[bytes] | None): Skróty wpisów zachowanych
+                                              wcześniej; zbiór jest
+                                              uzupełniany w miejscu.
+        parametry_jakosci (ParametryJakosci | None): Jeśli podano, włącza
+                                                     filtry jakości jak
+                                                     w przetworz_sekwencje;
+                                                     odrzucone odczyty
+                                                     zlicza klucz
+                                                     "Niska_jakosc".
+        katalog_partycji (str | None): Jeśli podano, katalog na tymczasowe
+                                       partycje deduplikacji na dysku
+                                       (zachowane_skroty nie jest wtedy
+                                       używany).
+
+    Yields:
+        tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]: Partia
+        sekwencji (po przycięciu), jej statystyki oraz pozycje wpisów,
+        które pozostają.
+    """
+    if liczniki is None:
+        liczniki = {}
+    for klucz in ("Wczytane", "Duplikaty", "Niepoprawne", "Zachowane"):
+        liczniki.setdefault(klucz, 0)
+    if parametry_jakosci is not None:
+        liczniki.setdefault("Niska_jakosc", 0)
+    if zachowane_skroty is None:
+        zachowane_skroty = set()
+
+    def partie() -> Iterator[list[SekwencjaDNA]]:
+        iterator = iter(sekwencje)
+        while partia := list(itertools.islice(iterator, rozmiar_partii)):
+            if parametry_jakosci is not None:
+                with METRYKI.mierz("jakosc"):
+                    przefiltrowana, _ = filtruj_wedlug_jakosci(partia, parametry_jakosci)
+                odrzucone = len(partia) - len(przefiltrowana)
+                liczniki["Wczytane"] += odrzucone
+                liczniki["Niska_jakosc"] += odrzucone
+                METRYKI.zwieksz("odczyty_niskiej_jakosci", odrzucone)
+                partia = przefiltrowana
+            yield partia
+
+    with pula_procesow(procesy) as pula:
+        if katalog_partycji is None:
+            for partia in partie():
+                statystyki, zachowane_indeksy = oczysc_pojedyncza_partie(
+                    partia, z_odwrotnym_komplementem, procesy, liczniki, pamiec_podreczna,
+                    zachowane_skroty, pula=pula)
+                yield partia, statystyki, zachowane_indeksy
+        else:
+            yield from _oczysc_partie_z_partycjami(
+                partie(), katalog_partycji, z_odwrotnym_komplementem, procesy, liczniki,
+                pamiec_podreczna, pula)
+
+    podsumuj_czyszczenie(liczniki)
+
+
+def _oczysc_partie_z_partycjami(
+    partie: Iterable[list[SekwencjaDNA]], katalog_partycji: str,
+    z_odwrotnym_komplementem: bool, procesy: int, liczniki: dict[str, int],
+    pamiec_podreczna: PamiecPodrecznaStatystyk | None, pula: ProcessPoolExecutor | None
+) -> Iterator[tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]]:
+    """
+    Tryb oczysc_partie z deduplikacją na dysku: odkłada partie ze
+    statystykami do pliku, a po wyznaczeniu duplikatów przez
+    deduplikuj_na_dysku czyta je kolejno i wybiera wpisy, które pozostają.
+
+    Args:
+        partie (Iterable[list[SekwencjaDNA]]): Partie po filtrach jakości.
+        katalog_partycji (str): Katalog na pliki tymczasowe.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów obliczających statystyki partii.
+        liczniki (dict[str, int]): Liczniki aktualizowane w miejscu.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna
+                                                            statystyk.
+        pula (ProcessPoolExecutor | None): Pula z pula_procesow.
+
+    Yields:
+        tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]: Jak
+        w oczysc_partie.
+    """
+    import pickle
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="partie_", dir=katalog_partycji) as katalog:
+        sciezka_partii = os.path.join(katalog, "partie.pickle")
+        with open(sciezka_partii, 'wb') as f:
+            def rekordy() -> Iterator[tuple[str, str]]:
+                for partia in partie:
+                    statystyki = oblicz_statystyki(partia, procesy, pamiec_podreczna, pula)
+                    pickle.dump((partia, statystyki), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield from ((sekwencja.nazwa, sekwencja.sekwencja) for sekwencja in partia)
+
+            duplikaty = deduplikuj_na_dysku(rekordy(), katalog_partycji,
+                                            z_odwrotnym_komplementem)
+            nastepny = next(duplikaty, None)
+
+        poczatek = 0
+        with open(sciezka_partii, 'rb') as f:
+            while True:
+                try:
+                    partia, statystyki = pickle.load(f)
+                except EOFError:
+                    break
+                koniec = poczatek + len(partia)
+                duplikaty_partii = set()
+                while nastepny is not None and nastepny[0] < koniec:
+                    duplikaty_partii.add(nastepny[0] - poczatek)
+                    nastepny = next(duplikaty, None)
+                statystyki, zachowane_indeksy = oczysc_pojedyncza_partie(
+                    partia, z_odwrotnym_komplementem, procesy, liczniki, pamiec_podreczna,
+                    set(), statystyki, duplikaty_partii)
+                yield partia, statystyki, zachowane_indeksy
+                poczatek = koniec
+
+
+def przetworz_sekwencje_partiami(
+    sekwencje: Iterable[SekwencjaDNA], rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW,
+    z_odwrotnym_komplementem: bool = False, procesy: int = 1,
+    liczniki: dict[str, int] | None = None,
+    pamiec_podreczna: PamiecPodrecznaStatystyk | None = None,
+    parametry_jakosci: ParametryJakosci | None = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Strumieniowa wersja przetworz_sekwencje, zwracająca oczyszczone dane
+    kolejnymi partiami (zob. oczysc_partie).
+
+    Args:
+        sekwencje (Iterable[SekwencjaDNA]): Strumień sekwencji.
+        rozmiar_partii (int): Liczba sekwencji wejściowych w partii.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów obliczających statystyki partii.
+        liczniki (dict[str, int] | None): Liczniki jak w oczysc_partie.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna
+                                                            statystyk.
+        parametry_jakosci (ParametryJakosci | None): Filtry jakości jak
+                                                     w oczysc_partie.
+
+    Yields:
+        pd.DataFrame: Tabela oczyszczonych wpisów partii (może być pusta).
+    """
+    for partia, statystyki, zachowane_indeksy in oczysc_partie(
+            sekwencje, rozmiar_partii, z_odwrotnym_komplementem, procesy, liczniki,
+            pamiec_podreczna, parametry_jakosci=parametry_jakosci):
+        yield zbuduj_tabele_wynikow(partia, statystyki, zachowane_indeksy)
+
+
+class PrzetwarzaniePrzyrostowe:
+    """
+    Przyrostowe czyszczenie pliku FASTA, do którego wpisy są wyłącznie
+    dopisywane (np. przez dodaj_sekwencje_uzytkownika).
+
+    Punkt kontrolny (plik JSON) zapamiętuje przesunięcie końca ostatniej
+    przetworzonej linii, numer i-węzła pliku, skróty BLAKE2b kolejnych
+    fragmentów przetworzonego prefiksu (po ROZMIAR_FRAGMENTU_PREFIKSU
+    bajtów) oraz liczniki. Skróty zachowanych wpisów, czyli stan
+    deduplikacji, są dopisywane do pliku obok punktu kontrolnego.
+    Kolejne uruchomienie sprawdza skróty prefiksu i przetwarza tylko nowy
+    ogon pliku; przy zapisie przeliczany jest tylko ostatni, niepełny
+    fragment i nowe fragmenty. W trybie szybkiego wznowienia sprawdzane
+    są tylko pierwszy i ostatni fragment, więc zmiana w środku prefiksu
+    bez zmiany jego długości nie zostanie wykryta.
+
+    Pełna przebudowa jest wykonywana, gdy plik zastąpiono innym (inny
+    i-węzeł), sprawdzane fragmenty prefiksu się zmieniły, ogon nie
+    zaczyna się od nagłówka (dopisano dalszy ciąg ostatniego wpisu) lub
+    zmienił się tryb deduplikacji.
+
+    Atrybuty:
+        nazwa_pliku (str): Nazwa pliku FASTA.
+        sciezka_punktu (str): Ścieżka pliku punktu kontrolnego.
+        przebudowa (bool): True, jeśli plik jest przetwarzany od początku.
+        przesuniecie (int): Liczba bajtów przetworzonych wcześniej.
+        liczniki (dict[str, int | float]): Liczniki narastające od początku
+                                           pliku, zapisywane w punkcie
+                                           kontrolnym.
+    """
+
+    def __init__(
+        self, nazwa_pliku: str, sciezka_punktu: str,
+        z_odwrotnym_komplementem: bool = False, przebuduj: bool = False,
+        szybkie_wznowienie: bool = False
+    ):
+        """
+        Wczytuje punkt kontrolny i sprawdza, czy odpowiada plikowi.
+
+        Args:
+            nazwa_pliku (str): Nazwa pliku FASTA.
+            sciezka_punktu (str): Ścieżka pliku punktu kontrolnego.
+            z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                             jak duplikat.
+            przebuduj (bool): Wymuś przetworzenie pliku od początku.
+            szybkie_wznowienie (bool): Sprawdzaj tylko pierwszy i ostatni
+                                       fragment prefiksu zamiast całego.
+        """
+        if wykryj_kompresje(nazwa_pliku) != "brak":
+            raise OSError(f"Tryb przyrostowy wymaga nieskompresowanego pliku FASTA "
+                          f"('{nazwa_pliku}' jest skompresowany).")
+        if wykryj_format_pliku(nazwa_pliku) == "fastq":
+            raise OSError(f"Tryb przyrostowy wymaga pliku FASTA ('{nazwa_pliku}' "
+                          f"jest plikiem FASTQ).")
+        self.nazwa_pliku = nazwa_pliku
+        self.sciezka_punktu = sciezka_punktu
+        self.z_odwrotnym_komplementem = z_odwrotnym_komplementem
+        self._sciezka_skrotow = sciezka_punktu + ROZSZERZENIE_SKROTOW_PUNKTU_KONTROLNEGO
+        self.szybkie_wznowienie = szybkie_wznowienie
+        self.przesuniecie = 0
+        self.numer_linii = 0
+        self.skroty_fragmentow = []
+        self.liczniki = {}
+        self.zachowane_skroty = set()
+
+        punkt = None
+        if not przebuduj:
+            try:
+                with open(sciezka_punktu) as f:
+                    punkt = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                dziennik.warning("Nie udało się odczytać punktu kontrolnego '%s': %s",
+                                 sciezka_punktu, e)
+
+        self.przebudowa = punkt is None or not self._wznow(punkt)
+        if self.przebudowa:
+            self.zachowane_skroty = set()
+            self.skroty_fragmentow = []
+            if os.path.exists(sciezka_punktu):
+                os.remove(sciezka_punktu)
+            dziennik.info("Punkt kontrolny: przetwarzam plik '%s' od początku.", nazwa_pliku)
+        else:
+            dziennik.info("Punkt kontrolny: pomijam %d bajtów przetworzonych wcześniej "
+                          "(%d wpisów).", self.przesuniecie, self.liczniki["Wczytane"])
+
+    def _wznow(self, punkt: dict) -> bool:
+        """
+        Sprawdza punkt kontrolny względem pliku i odtwarza z niego stan.
+
+        Args:
+            punkt (dict): Zawartość pliku punktu kontrolnego.
+
+        Returns:
+            bool: True, jeśli można kontynuować od zapisanego przesunięcia.
+        """
+        if punkt.get("z_odwrotnym_komplementem") != self.z_odwrotnym_komplementem:
+            dziennik.info("Punkt kontrolny: zmieniono tryb deduplikacji, wykonuję pełną "
+                          "przebudowę.")
+            return False
+        przesuniecie = punkt["przesuniecie"]
+        stan_pliku = os.stat(self.nazwa_pliku)
+        if punkt.get("i_wezel") != [stan_pliku.st_dev, stan_pliku.st_ino]:
+            dziennik.info("Punkt kontrolny: plik został zastąpiony innym, wykonuję pełną "
+                          "przebudowę.")
+            return False
+        if stan_pliku.st_size < przesuniecie:
+            dziennik.info("Punkt kontrolny: plik jest krótszy niż przetworzony prefiks, "
+                          "wykonuję pełną przebudowę.")
+            return False
+
+        skroty_fragmentow = punkt.get("skroty_fragmentow") or []
+        liczba_fragmentow = -(-przesuniecie // ROZMIAR_FRAGMENTU_PREFIKSU)
+        if len(skroty_fragmentow) != liczba_fragmentow:
+            dziennik.info("Punkt kontrolny: brak skrótów prefiksu, wykonuję pełną "
+                          "przebudowę.")
+            return False
+        numery = range(liczba_fragmentow)
+        if self.szybkie_wznowienie and liczba_fragmentow > 2:
+            numery = (0, liczba_fragmentow - 1)
+        with open(self.nazwa_pliku, 'rb') as f:
+            zgodny = all(self._skrot_fragmentu(f, numer, przesuniecie)
+                         == skroty_fragmentow[numer] for numer in numery)
+            f.seek(przesuniecie)
+            poczatek_ogona = f.read(ROZMIAR_BLOKU_ODCZYTU).lstrip()
+        if not zgodny:
+            dziennik.info("Punkt kontrolny: przetworzony prefiks pliku zmienił się, "
+                          "wykonuję pełną przebudowę.")
+            return False
+        if poczatek_ogona and not poczatek_ogona.startswith(b">"):
+            dziennik.info("Punkt kontrolny: dopisano dalszy ciąg ostatniego wpisu, "
+                          "wykonuję pełną przebudowę.")
+            return False
+
+        liczba_skrotow = punkt["liczba_skrotow"]
+        try:
+            with open(self._sciezka_skrotow, 'r+b') as f:
+                # Skróty dopisane po ostatnim zapisie punktu (np. przerwany
+                # zapis) nie należą do stanu i są odrzucane.
+                f.truncate(liczba_skrotow * DLUGOSC_SKROTU)
+                dane = f.read()
+        except FileNotFoundError:
+            dane = b""
+        if len(dane) != liczba_skrotow * DLUGOSC_SKROTU:
+            dziennik.info("Punkt kontrolny: brak zapisanego stanu deduplikacji, "
+                          "wykonuję pełną przebudowę.")
+            return False
+
+        self.zachowane_skroty = {dane[i:i + DLUGOSC_SKROTU]
+                                 for i in range(0, len(dane), DLUGOSC_SKROTU)}
+        self.skroty_fragmentow = skroty_fragmentow
+        self.przesuniecie = przesuniecie
+        self.numer_linii = punkt["numer_linii"]
+        self.liczniki = punkt["liczniki"]
+        return True
+
+    @staticmethod
+    def _skrot_fragmentu(plik: BinaryIO, numer: int, przesuniecie: int) -> str:
+        """
+        Liczy skrót fragmentu prefiksu pliku o podanym numerze.
+
+        Args:
+            plik (BinaryIO): Plik otwarty w trybie binarnym.
+            numer (int): Numer fragmentu (po ROZMIAR_FRAGMENTU_PREFIKSU
+                         bajtów).
+            przesuniecie (int): Długość prefiksu; ostatni fragment może
+                                być krótszy.
+
+        Returns:
+            str: Skrót szesnastkowy fragmentu.
+        """
+        skrot = hashlib.blake2b(digest_size=DLUGOSC_SKROTU)
+        poczatek = numer * ROZMIAR_FRAGMENTU_PREFIKSU
+        koniec = min(poczatek + ROZMIAR_FRAGMENTU_PREFIKSU, przesuniecie)
+        plik.seek(poczatek)
+        for pozycja in range(poczatek, koniec, ROZMIAR_BLOKU_ODCZYTU):
+            skrot.update(plik.read(min(ROZMIAR_BLOKU_ODCZYTU, koniec - pozycja)))
+        return skrot.hexdigest()
+
+    def _koniec_pelnych_linii(self) -> int:
+        """
+        Zwraca przesunięcie za ostatnim znakiem nowej linii w pliku.
+        Niedokończona ostatnia linia zostaje na następne uruchomienie.
+
+        Returns:
+            int: Przesunięcie końca przetwarzanego fragmentu pliku.
+        """
+        koniec = os.path.getsize(self.nazwa_pliku)
+        with open(self.nazwa_pliku, 'rb') as f:
+            while koniec > self.przesuniecie:
+                poczatek = max(koniec - ROZMIAR_BLOKU_ODCZYTU, self.przesuniecie)
+                f.seek(poczatek)
+                nowa_linia = f.read(koniec - poczatek).rfind(b"\n")
+                if nowa_linia != -1:
+                    return poczatek + nowa_linia + 1
+                koniec = poczatek
+        return self.przesuniecie
+
+    def oczysc_partie(
+        self, rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW, procesy: int = 1,
+        pamiec_podreczna: PamiecPodrecznaStatystyk | None = None
+    ) -> Iterator[tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]]:
+        """
+        Czyści nowy ogon pliku (zob. oczysc_partie), kontynuując
+        deduplikację i liczniki z punktu kontrolnego. Po przetworzeniu
+        ostatniej partii zapisuje nowy punkt kontrolny.
+
+        Args:
+            rozmiar_partii (int): Liczba sekwencji wejściowych w partii.
+            procesy (int): Liczba procesów obliczających statystyki partii.
+            pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć
+                                                                podręczna
+                                                                statystyk.
+
+        Yields:
+            tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]: Jak
+            w oczysc_partie, tylko dla nowych wpisów.
+        """
+        koniec = self._koniec_pelnych_linii()
+        sekwencje = iter(())
+        if koniec > self.przesuniecie:
+            dziennik.info("Punkt kontrolny: przetwarzam %d nowych bajtów od bajtu %d.",
+                          koniec - self.przesuniecie, self.przesuniecie)
+            sekwencje = iteruj_plik_fasta(self.nazwa_pliku, poczatek=self.przesuniecie,
+                                          koniec=koniec, numer_linii=self.numer_linii)
+
+        nowe_skroty = []
+        for partia, statystyki, zachowane_indeksy in oczysc_partie(
+                sekwencje, rozmiar_partii, self.z_odwrotnym_komplementem, procesy,
+                self.liczniki, pamiec_podreczna, self.zachowane_skroty):
+            nowe_skroty.extend(skrot_sekwencji(partia[i].sekwencja,
+                                               self.z_odwrotnym_komplementem)
+                               for i in zachowane_indeksy)
+            yield partia, statystyki, zachowane_indeksy
+        self._zapisz(koniec, nowe_skroty)
+
+    def _zapisz(self, koniec: int, nowe_skroty: list[bytes]):
+        """
+        Zapisuje punkt kontrolny po przetworzeniu pliku do przesunięcia koniec.
+
+        Args:
+            koniec (int): Przesunięcie końca przetworzonego fragmentu.
+            nowe_skroty (list[bytes]): Skróty wpisów zachowanych w tym
+                                       uruchomieniu.
+        """
+        with open(self.nazwa_pliku, 'rb') as f:
+            f.seek(self.przesuniecie)
+            for poczatek in range(self.przesuniecie, koniec, ROZMIAR_BLOKU_ODCZYTU):
+                blok = f.read(min(ROZMIAR_BLOKU_ODCZYTU, koniec - poczatek))
+                self.numer_linii += blok.count(b"\n")
+            # Ostatni fragment poprzedniego prefiksu mógł być niepełny.
+            pierwszy_zmieniony = self.przesuniecie // ROZMIAR_FRAGMENTU_PREFIKSU
+            self.skroty_fragmentow[pierwszy_zmieniony:] = [
+                self._skrot_fragmentu(f, numer, koniec) for numer in range(
+                    pierwszy_zmieniony, -(-koniec // ROZMIAR_FRAGMENTU_PREFIKSU))]
+            stan_pliku = os.fstat(f.fileno())
+        with open(self._sciezka_skrotow, 'wb' if self.przebudowa else 'ab') as f:
+            f.write(b"".join(nowe_skroty))
+        self.przesuniecie = koniec
+        self.przebudowa = False
+
+        # Zapis przez plik tymczasowy: przerwany zapis nie psuje punktu.
+        tymczasowa_sciezka = self.sciezka_punktu + ".tmp"
+        with open(tymczasowa_sciezka, 'w') as f:
+            json.dump({
+                "przesuniecie": self.przesuniecie,
+                "numer_linii": self.numer_linii,
+                "i_wezel": [stan_pliku.st_dev, stan_pliku.st_ino],
+                "skroty_fragmentow": self.skroty_fragmentow,
+                "z_odwrotnym_komplementem": self.z_odwrotnym_komplementem,
+                "liczba_skrotow": len(self.zachowane_skroty),
+                "liczniki": self.liczniki,
+            }, f, indent=2)
+        os.replace(tymczasowa_sciezka, self.sciezka_punktu)
+
+
+def zapisz_tabele_kolumnowo(
+    tabele: Iterable[pd.DataFrame], sciezka: str, format_wyjscia: str = "parquet"
+) -> int | None:
+    """
+    Zapisuje kolejne tabele wyników do pliku Parquet lub Arrow IPC,
+    po jednej grupie wierszy na tabelę, bez gromadzenia ich w pamięci.
+
+    Kolumna Typ_Sekwencji zapisywana jest jako kolumna słownikowa.
+    Plik Arrow IPC można później odczytać przez mapowanie pamięci.
+
+    Args:
+        tabele (Iterable[pd.DataFrame]): Tabele, np. z
+                                         przetworz_sekwencje_partiami.
+        sciezka (str): Ścieżka pliku wynikowego.
+        format_wyjscia (str): "parquet" lub "arrow".
+
+    Returns:
+        int | None: Liczba zapisanych wierszy lub None, jeśli zapis się nie
+        powiódł (np. brak biblioteki pyarrow).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        dziennik.error("Zapis kolumnowy wymaga biblioteki pyarrow.")
+        return None
+
+    schemat = pa.schema([
+        ("Nazwa", pa.string()),
+        ("Sekwencja", pa.string()),
+        ("Dlugosc", pa.int64()),
+        ("Zawartosc_GC", pa.float64()),
+        ("Typ_Sekwencji", pa.dictionary(pa.int8(), pa.string())),
+    ])
+    if format_wyjscia not in ("parquet", "arrow"):
+        dziennik.error("Nieznany format wyjściowy '%s'.", format_wyjscia)
+        return None
+
+    # Zapis przez plik tymczasowy: przerwane przetwarzanie nie zostawia
+    # niekompletnego pliku pod docelową nazwą.
+    tymczasowa_sciezka = sciezka + ".tmp"
+    liczba_wierszy = 0
+    try:
+        if format_wyjscia == "parquet":
+            zapisujacy = pq.ParquetWriter(tymczasowa_sciezka, schemat)
+        else:
+            zapisujacy = pa.ipc.new_file(tymczasowa_sciezka, schemat)
+        with zapisujacy:
+            for tabela_danych in tabele:
+                if tabela_danych.empty:
+                    continue
+                zapisujacy.write_table(pa.Table.from_pandas(
+                    tabela_danych, schema=schemat, preserve_index=False))
+                liczba_wierszy += len(tabela_danych)
+        os.replace(tymczasowa_sciezka, sciezka)
+    except BaseException:
+        if os.path.exists(tymczasowa_sciezka):
+            os.remove(tymczasowa_sciezka)
+        raise
+    return liczba_wierszy
+
+
+async def wczytuj_zrodlo(
+    sciezka: str, kolejka: asyncio.Queue, wykonawca: ThreadPoolExecutor,
+    rozmiar_partii: int, raport_zrodla: dict[str, float]
+):
+    """
+    Parsuje jeden plik FASTA w puli wątków i wstawia jego partie do
+    ograniczonej kolejki. Gdy kolejka jest pełna, parsowanie czeka
+    (przeciwciśnienie).
+
+    Args:
+        sciezka (str): Ścieżka pliku FASTA.
+        kolejka (asyncio.Queue): Kolejka par (ścieżka, partia).
+        wykonawca (ThreadPoolExecutor): Pula wątków parsujących.
+        rozmiar_partii (int): Liczba sekwencji w partii.
+        raport_zrodla (dict[str, float]): Uzupełniany kluczami "Wpisy",
+                                          "Bajty" i "Czas" (sekundy).
+    """
+    import asyncio
+
+    petla = asyncio.get_running_loop()
+    poczatek = time.perf_counter()
+    iterator = iteruj_plik_fasta(sciezka)
+    try:
+        raport_zrodla["Bajty"] = os.path.getsize(sciezka)
+        while partia := await petla.run_in_executor(
+                wykonawca, lambda: list(itertools.islice(iterator, rozmiar_partii))):
+            raport_zrodla["Wpisy"] += len(partia)
+            await kolejka.put((sciezka, partia))
+    except (OSError, UnicodeDecodeError) as e:
+        dziennik.error("Nie udało się wczytać pliku '%s': %s", sciezka, e)
+        raport_zrodla["Bledy"] = 1
+    raport_zrodla["Czas"] = time.perf_counter() - poczatek
+
+
+async def obserwuj_katalogi(
+    katalogi: list[str], dodaj_zrodlo: Callable[[str], None], czas_obserwacji: float,
+    wzorzec: str = WZORZEC_PLIKOW_FASTA, odstep: float = ODSTEP_OBSERWACJI_KATALOGU
+):
+    """
+    Przekazuje pliki FASTA z katalogów do wczytania, również te, które
+    pojawią się w trakcie obserwacji.
+
+    Pliki obecne przy pierwszym przeglądzie są wczytywane od razu. Nowe
+    pliki są wczytywane, gdy ich rozmiar nie zmienił się między dwoma
+    przeglądami, aby nie czytać pliku w trakcie zapisu.
+
+    Args:
+        katalogi (list[str]): Obserwowane katalogi.
+        dodaj_zrodlo (Callable[[str], None]): Uruchamia wczytywanie pliku.
+        czas_obserwacji (float): Czas obserwacji w sekundach; 0 oznacza
+                                 jednorazowy przegląd.
+        wzorzec (str): Wzorzec nazw plików (fnmatch).
+        odstep (float): Odstęp między przeglądami w sekundach.
+    """
+    import asyncio
+
+    koniec = time.monotonic() + czas_obserwacji
+    poprzednie_rozmiary = None
+    wczytane = set()
+    while True:
+        rozmiary = {}
+        for katalog in katalogi:
+            for wpis in os.scandir(katalog):
+                if (wpis.is_file() and fnmatch.fnmatch(wpis.name, wzorzec)
+                        and not wpis.name.endswith(ROZSZERZENIA_PLIKOW_POMOCNICZYCH)):
+                    rozmiary[wpis.path] = wpis.stat().st_size
+        for sciezka, rozmiar in sorted(rozmiary.items()):
+            if sciezka in wczytane:
+                continue
+            if poprzednie_rozmiary is None or poprzednie_rozmiary.get(sciezka) == rozmiar:
+                wczytane.add(sciezka)
+                dodaj_zrodlo(sciezka)
+        poprzednie_rozmiary = rozmiary
+        pozostalo = koniec - time.monotonic()
+        if pozostalo <= 0:
+            return
+        await asyncio.sleep(min(odstep, pozostalo))
+
+
+async def wczytuj_pliki_wspolbieznie(
+    sciezki: Iterable[str] = (), katalogi: Iterable[str] = (),
+    czas_obserwacji: float = 0.0, odstep_obserwacji: float = ODSTEP_OBSERWACJI_KATALOGU,
+    rozmiar_partii: int = ROZMIAR_PARTII_WCZYTYWANIA,
+    rozmiar_kolejki: int = ROZMIAR_KOLEJKI_WCZYTYWANIA,
+    watki: int = LICZBA_WATKOW_WCZYTYWANIA, z_odwrotnym_komplementem: bool = False,
+    procesy: int = 1, pamiec_podreczna: PamiecPodrecznaStatystyk | None = None
+) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """
+    Współbieżnie wczytuje wiele plików FASTA i czyści je we wspólnym
+    etapie, odpowiadającym przetworz_sekwencje.
+
+    Każde źródło jest parsowane w puli wątków i wstawia partie do jednej
+    ograniczonej kolejki. Pojedynczy konsument, działający we własnym
+    wątku, usuwa wadliwe wpisy oraz duplikaty globalnie, między wszystkimi
+    źródłami. Przy duplikatach z różnych plików zostaje wpis, który dotarł
+    do kolejki pierwszy. Czas źródła obejmuje oczekiwanie na miejsce
+    w kolejce, więc przepustowość źródła to przepustowość całego potoku.
+
+    Args:
+        sciezki (Iterable[str]): Pliki FASTA do wczytania.
+        katalogi (Iterable[str]): Katalogi, z których wczytywane są pliki
+                                  pasujące do WZORZEC_PLIKOW_FASTA.
+        czas_obserwacji (float): Jak długo (w sekundach) czekać na nowe
+                                 pliki w katalogach.
+        odstep_obserwacji (float): Odstęp między przeglądami katalogów.
+        rozmiar_partii (int): Liczba sekwencji w partii.
+        rozmiar_kolejki (int): Maksymalna liczba partii w kolejce.
+        watki (int): Liczba wątków parsujących.
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów obliczających statystyki.
+        pamiec_podreczna (PamiecPodrecznaStatystyk | None): Pamięć podręczna
+                                                            statystyk.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, dict]]: Tabela oczyszczonych wpisów
+        oraz raport: "Zrodla" (dla każdego pliku liczba wpisów, bajtów
+        i czas), "Kolejka" (maksymalna i średnia głębokość) oraz
+        "Liczniki" (jak w oczysc_partie).
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    import pandas as pd
+
+    petla = asyncio.get_running_loop()
+    kolejka = asyncio.Queue(maxsize=rozmiar_kolejki)
+    raport = {"Zrodla": {}, "Kolejka": {"Maksymalna_glebokosc": 0, "Srednia_glebokosc": 0.0},
+              "Liczniki": dict.fromkeys(("Wczytane", "Duplikaty", "Niepoprawne", "Zachowane"),
+                                        0)}
+    zadania_zrodel = []
+    zachowane_skroty = set()
+    tabele = []
+
+    def oczysc_i_zbuduj_tabele(partia: list[SekwencjaDNA]):
+        statystyki, zachowane_indeksy = oczysc_pojedyncza_partie(
+            partia, z_odwrotnym_komplementem, procesy, raport["Liczniki"],
+            pamiec_podreczna, zachowane_skroty, pula=pula)
+        tabele.append(zbuduj_tabele_wynikow(partia, statystyki, zachowane_indeksy))
+
+    with ThreadPoolExecutor(max_workers=watki) as wykonawca, \
+            ThreadPoolExecutor(max_workers=1) as wykonawca_czyszczenia, \
+            pula_procesow(procesy) as pula:
+        def dodaj_zrodlo(sciezka: str):
+            if sciezka in raport["Zrodla"]:
+                return
+            raport["Zrodla"][sciezka] = {"Wpisy": 0, "Bajty": 0, "Czas": 0.0}
+            zadania_zrodel.append(asyncio.create_task(wczytuj_zrodlo(
+                sciezka, kolejka, wykonawca, rozmiar_partii, raport["Zrodla"][sciezka])))
+
+        async def czysc():
+            pobrane_partie = 0
+            suma_glebokosci = 0
+            while (element := await kolejka.get()) is not None:
+                glebokosc = kolejka.qsize() + 1
+                pobrane_partie += 1
+                suma_glebokosci += glebokosc
+                raport["Kolejka"]["Maksymalna_glebokosc"] = max(
+                    glebokosc, raport["Kolejka"]["Maksymalna_glebokosc"])
+                raport["Kolejka"]["Srednia_glebokosc"] = suma_glebokosci / pobrane_partie
+                await petla.run_in_executor(wykonawca_czyszczenia,
+                                            oczysc_i_zbuduj_tabele, element[1])
+
+        async def produkuj():
+            for sciezka in sciezki:
+                dodaj_zrodlo(sciezka)
+            await obserwuj_katalogi(list(katalogi), dodaj_zrodlo, czas_obserwacji,
+                                    odstep=odstep_obserwacji)
+            await asyncio.gather(*zadania_zrodel)
+            await kolejka.put(None)
+
+        # Błąd konsumenta przerywa źródła czekające na miejsce w kolejce,
+        # a błąd źródła przerywa konsumenta, zamiast zawiesić potok.
+        konsument = asyncio.create_task(czysc())
+        producent = asyncio.create_task(produkuj())
+        try:
+            await asyncio.gather(konsument, producent)
+        finally:
+            zadania = (konsument, producent, *zadania_zrodel)
+            for zadanie in zadania:
+                zadanie.cancel()
+            await asyncio.gather(*zadania, return_exceptions=True)
+
+    podsumuj_czyszczenie(raport["Liczniki"])
+    tabela_danych = pd.concat(tabele, ignore_index=True) if tabele else pd.DataFrame()
+    return tabela_danych, raport
+
+
+def wypisz_raport_wczytywania(raport: dict[str, dict]):
+    """
+    Wypisuje przepustowość każdego źródła i głębokość kolejki.
+
+    Args:
+        raport (dict[str, dict]): Raport z wczytuj_pliki_wspolbieznie.
+    """
+    print("\n--- Wczytywanie współbieżne ---")
+    for sciezka, raport_zrodla in raport["Zrodla"].items():
+        czas = max(raport_zrodla["Czas"], 1e-9)
+        print(f"  {sciezka}: {raport_zrodla['Wpisy']} wpisów w {czas:.3f} s "
+              f"({raport_zrodla['Wpisy'] / czas:,.0f} wpisów/s, "
+              f"{raport_zrodla['Bajty'] / czas / 1e6:.1f} MB/s)"
+              + (" – BŁĄD ODCZYTU" if raport_zrodla.get("Bledy") else ""))
+    print(f"  Głębokość kolejki: maks. {raport['Kolejka']['Maksymalna_glebokosc']}, "
+          f"średnio {raport['Kolejka']['Srednia_glebokosc']:.2f}")
+
+
+def zmierz_wczytywanie_wspolbiezne(
+    liczba_plikow: int = 8, sekwencje_na_plik: int = 100_000, watki: int = 4,
+    ziarno: int = 0
+):
+    """
+    Porównuje wczytywanie współbieżne z kolejnym, strumieniowym
+    przetwarzaniem tych samych plików (przetworz_sekwencje_partiami)
+    na plikach utworzonych w katalogu tymczasowym.
+
+    Args:
+        liczba_plikow (int): Liczba plików FASTA.
+        sekwencje_na_plik (int): Liczba sekwencji w każdym pliku.
+        watki (int): Liczba wątków parsujących.
+        ziarno (int): Ziarno generatora danych.
+    """
+    import asyncio
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezki = [os.path.join(katalog, f"zrodlo_{i}.fa") for i in range(liczba_plikow)]
+        for i, sciezka in enumerate(sciezki):
+            utworz_plik_fasta_wektorowo(sciezka, sekwencje_na_plik, ziarno + i)
+
+        poczatek = time.perf_counter()
+        for _ in przetworz_sekwencje_partiami(
+                itertools.chain.from_iterable(iteruj_plik_fasta(sciezka) for sciezka in sciezki),
+                ROZMIAR_PARTII_WCZYTYWANIA):
+            pass
+        czas_kolejny = time.perf_counter() - poczatek
+
+        poczatek = time.perf_counter()
+        tabela_danych, raport = asyncio.run(wczytuj_pliki_wspolbieznie(
+            katalogi=[katalog], watki=watki))
+        czas_wspolbiezny = time.perf_counter() - poczatek
+
+    wypisz_raport_wczytywania(raport)
+    print(f"  Kolejno:      {czas_kolejny:.3f} s")
+    print(f"  Współbieżnie: {czas_wspolbiezny:.3f} s ({watki} wątków, "
+          f"{len(tabela_danych)} zachowanych wpisów)")
+
+
+def rozwin_zrodla(zrodla: Iterable[str], wzorzec: str = WZORZEC_PLIKOW_FASTA) -> list[str]:
+    """
+    Zamienia listę plików, katalogów i wzorców glob na listę plików FASTA.
+
+    Z katalogów brane są pliki pasujące do wzorca (bez plików
+    pomocniczych, np. indeksów). Pliki z jednego katalogu lub wzorca są
+    sortowane według nazwy, kolejność źródeł jest zachowana, a powtórzone
+    pliki są pomijane.
+
+    Args:
+        zrodla (Iterable[str]): Pliki, katalogi lub wzorce glob ("**"
+                                obejmuje podkatalogi).
+        wzorzec (str): Wzorzec nazw plików w katalogach (fnmatch).
+
+    Returns:
+        list[str]: Ścieżki plików. Ścieżki, które nie są katalogiem ani
+        wzorcem, są zwracane bez sprawdzania, czy istnieją.
+    """
+    import glob
+
+    sciezki = []
+    for zrodlo in zrodla:
+        if os.path.isdir(zrodlo):
+            pasujace = sorted(wpis.path for wpis in os.scandir(zrodlo)
+                              if wpis.is_file() and fnmatch.fnmatch(wpis.name, wzorzec))
+        elif any(znak in zrodlo for znak in "*?["):
+            pasujace = sorted(sciezka for sciezka in glob.glob(zrodlo, recursive=True)
+                              if os.path.isfile(sciezka))
+            if not pasujace:
+                dziennik.warning("Wzorzec '%s' nie pasuje do żadnego pliku.", zrodlo)
+        else:
+            sciezki.append(zrodlo)
+            continue
+        sciezki.extend(sciezka for sciezka in pasujace
+                       if not sciezka.endswith(ROZSZERZENIA_PLIKOW_POMOCNICZYCH))
+    return list(dict.fromkeys(sciezki))
+
+
+def rozpisz_do_partycji(
+    sciezki: list[str], katalog_partycji: str, liczba_partycji: int,
+    z_odwrotnym_komplementem: bool = False
+) -> tuple[list[str], int]:
+    """
+    Rozpisuje wpisy plików FASTA do plików partycji według skrótu treści.
+
+    Każdy wpis zapisywany jest razem ze swoim numerem porządkowym
+    (pozycją w złączeniu plików wejściowych), numerem pliku i numerem
+    linii nagłówka. Wpisy o tej samej treści trafiają do tej samej
+    partycji, a w obrębie partycji zachowują kolejność wejściową.
+
+    Args:
+        sciezki (list[str]): Pliki FASTA, w kolejności złączenia.
+        katalog_partycji (str): Katalog na pliki partycji.
+        liczba_partycji (int): Liczba plików partycji.
+        z_odwrotnym_komplementem (bool): Sekwencja i jej odwrotny
+                                         komplement trafiają do tej samej
+                                         partycji.
+
+    Returns:
+        tuple[list[str], int]: Ścieżki plików partycji i liczba wpisów.
+    """
+    sciezki_partycji = [os.path.join(katalog_partycji, f"partycja_{i:04d}.bin")
+                        for i in range(liczba_partycji)]
+    naglowek = NAGLOWEK_WPISU_PARTYCJI
+    porzadek = 0
+    with contextlib.ExitStack() as stos:
+        zapisy = [stos.enter_context(open(sciezka, 'wb')).write
+                  for sciezka in sciezki_partycji]
+        for numer_pliku, sciezka in enumerate(sciezki):
+            for linia, obiekt_sekwencji in iteruj_wpisy_fasta(sciezka):
+                skrot = skrot_sekwencji(obiekt_sekwencji.sekwencja, z_odwrotnym_komplementem)
+                nazwa = obiekt_sekwencji.nazwa.encode()
+                sekwencja = obiekt_sekwencji.sekwencja.encode('ascii', errors='replace')
+                zapisy[int.from_bytes(skrot[:4], 'little') % liczba_partycji](
+                    naglowek.pack(porzadek, numer_pliku, linia, skrot, len(nazwa),
+                                  len(sekwencja)) + nazwa + sekwencja)
+                porzadek += 1
+    return sciezki_partycji, porzadek
+
+
+def iteruj_wpisy_partycji(sciezka_partycji: str) -> Iterator[tuple]:
+    """
+    Strumieniowo odczytuje plik partycji utworzony przez rozpisz_do_partycji.
+
+    Args:
+        sciezka_partycji (str): Plik partycji.
+
+    Yields:
+        tuple: Numer porządkowy, numer pliku, linia, skrót, nazwa i treść
+        sekwencji (bajty).
+    """
+    naglowek = NAGLOWEK_WPISU_PARTYCJI
+    with open(sciezka_partycji, 'rb', buffering=ROZMIAR_BLOKU_ODCZYTU) as f:
+        while surowy_naglowek := f.read(naglowek.size):
+            *pola, dlugosc_nazwy, dlugosc = naglowek.unpack(surowy_naglowek)
+            yield *pola, f.read(dlugosc_nazwy), f.read(dlugosc)
+
+
+def podziel_partycje(
+    sciezka_partycji: str, liczba_czesci: int, glebokosc: int
+) -> list[str]:
+    """
+    Dzieli zbyt dużą partycję na mniejsze według kolejnych czterech
+    bajtów skrótu (rozpisz_do_partycji używa bajtów 0-3, poziom glebokosc
+    bajtów 4 * glebokosc do 4 * glebokosc + 3). Plik partycji jest usuwany.
+
+    Args:
+        sciezka_partycji (str): Plik partycji.
+        liczba_czesci (int): Liczba partycji potomnych.
+        glebokosc (int): Poziom podziału (od 1).
+
+    Returns:
+        list[str]: Ścieżki partycji potomnych.
+    """
+    sciezki_czesci = [f"{sciezka_partycji}.{i}" for i in range(liczba_czesci)]
+    naglowek = NAGLOWEK_WPISU_PARTYCJI
+    with contextlib.ExitStack() as stos:
+        zapisy = [stos.enter_context(open(sciezka, 'wb')).write for sciezka in sciezki_czesci]
+        for porzadek, plik, linia, skrot, nazwa, sekwencja in \
+                iteruj_wpisy_partycji(sciezka_partycji):
+            zapisy[int.from_bytes(skrot[4 * glebokosc:4 * glebokosc + 4], 'little')
+                   % liczba_czesci](naglowek.pack(porzadek, plik, linia, skrot, len(nazwa),
+                                                  len(sekwencja)) + nazwa + sekwencja)
+    os.remove(sciezka_partycji)
+    return sciezki_czesci
+
+
+def oczysc_partycje(
+    sciezka_partycji: str, sciezka_wyniku: str, glebokosc: int = 0
+) -> dict[str, int]:
+    """
+    Usuwa wadliwe i zduplikowane wpisy jednej partycji utworzonej przez
+    rozpisz_do_partycji. Funkcja uruchamiana jest w procesie roboczym.
+
+    Z wpisów o tej samej treści zostaje ten o najmniejszym numerze
+    porządkowym, tak jak przy czyszczeniu jednego strumienia. Plik wyniku
+    zawiera każdy wpis partycji, w kolejności wejściowej, z jego statusem
+    (indeks w STATUSY_WPISOW), statystykami oraz plikiem i linią wpisu
+    zachowanego zamiast duplikatu; treść zapisywana jest tylko dla wpisów
+    zachowanych. Plik partycji jest usuwany.
+
+    Partycja jest czytana strumieniowo, partiami po ZASADY_PARTII_PARTYCJI
+    nukleotydów, więc w pamięci zostają tylko skróty wpisów zachowanych.
+    Partycja większa niż dwa razy ROZMIAR_PARTYCJI (gdy limit
+    MAKS_LICZBA_PARTYCJI nie pozwolił na więcej plików) jest rekurencyjnie
+    dzielona przez podziel_partycje, a wyniki części są scalane po numerze
+    porządkowym.
+
+    Args:
+        sciezka_partycji (str): Plik partycji.
+        sciezka_wyniku (str): Plik wyniku.
+        glebokosc (int): Poziom podziału partycji (0 dla partycji
+                         z rozpisz_do_partycji).
+
+    Returns:
+        dict[str, int]: Liczniki jak w oczysc_partie.
+    """
+    import numpy as np
+
+    liczniki = dict.fromkeys(("Wczytane", "Duplikaty", "Niepoprawne", "Zachowane"), 0)
+    rozmiar = os.path.getsize(sciezka_partycji)
+    if rozmiar > 2 * ROZMIAR_PARTYCJI and 4 * (glebokosc + 2) <= DLUGOSC_SKROTU:
+        liczba_czesci = min(-(-rozmiar // ROZMIAR_PARTYCJI), MAKS_LICZBA_PARTYCJI)
+        dziennik.info("Partycja '%s' ma %d B. Dzielę ją na %d części.",
+                      sciezka_partycji, rozmiar, liczba_czesci)
+        sciezki_wynikow = []
+        for sciezka_czesci in podziel_partycje(sciezka_partycji, liczba_czesci,
+                                               glebokosc + 1):
+            sciezki_wynikow.append(sciezka_czesci + ".wynik")
+            for klucz, liczba in oczysc_partycje(sciezka_czesci, sciezki_wynikow[-1],
+                                                 glebokosc + 1).items():
+                liczniki[klucz] += liczba
+        with open(sciezka_wyniku, 'wb') as f:
+            f.writelines(rekord for _, rekord in heapq.merge(
+                *map(iteruj_surowe_wyniki_partycji, sciezki_wynikow)))
+        for sciezka in sciezki_wynikow:
+            os.remove(sciezka)
+        return liczniki
+
+    numery_typow = {typ: numer for numer, typ in enumerate(TYPY_SEKWENCJI)}
+    zachowane = {}
+    wynik = NAGLOWEK_WYNIKU_PARTYCJI
+    with open(sciezka_wyniku, 'wb') as f:
+        for partia in iteruj_partie_zasad(iteruj_wpisy_partycji(sciezka_partycji),
+                                          ZASADY_PARTII_PARTYCJI, lambda wpis: len(wpis[5])):
+            bufor = np.frombuffer(b"".join(wpis[5] for wpis in partia), dtype=np.uint8)
+            przesuniecia = np.zeros(len(partia) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter((len(wpis[5]) for wpis in partia), dtype=np.int64,
+                                  count=len(partia)), out=przesuniecia[1:])
+            statystyki = oblicz_statystyki_bufora(bufor, przesuniecia)
+            del bufor
+            liczniki["Wczytane"] += len(partia)
+            for (porzadek, plik, linia, skrot, nazwa, sekwencja), poprawna, dlugosc, gc, typ \
+                    in zip(partia, statystyki["Poprawna"].tolist(),
+                           statystyki["Dlugosc"].tolist(),
+                           statystyki["Zawartosc_GC"].tolist(),
+                           statystyki["Typ_Sekwencji"].tolist()):
+                tresc = b""
+                zrodlo = (plik, linia)
+                if not poprawna:
+                    status = 2
+                    liczniki["Niepoprawne"] += 1
+                elif skrot in zachowane:
+                    status = 1
+                    zrodlo = zachowane[skrot]
+                    liczniki["Duplikaty"] += 1
+                else:
+                    status = 0
+                    zachowane[skrot] = zrodlo
+                    tresc = sekwencja
+                    liczniki["Zachowane"] += 1
+                f.write(wynik.pack(porzadek, plik, linia, status, numery_typow[typ], gc,
+                                   *zrodlo, len(nazwa), dlugosc) + nazwa + tresc)
+    os.remove(sciezka_partycji)
+    return liczniki
+
+
+def iteruj_surowe_wyniki_partycji(sciezka_wyniku: str) -> Iterator[tuple[int, bytes]]:
+    """
+    Strumieniowo odczytuje niezdekodowane wpisy pliku wyniku
+    (do scalania wyników części podzielonej partycji).
+
+    Args:
+        sciezka_wyniku (str): Plik wyniku.
+
+    Yields:
+        tuple[int, bytes]: Numer porządkowy i cały zapis wpisu.
+    """
+    wynik = NAGLOWEK_WYNIKU_PARTYCJI
+    with open(sciezka_wyniku, 'rb', buffering=ROZMIAR_BLOKU_ODCZYTU) as f:
+        while surowy_naglowek := f.read(wynik.size):
+            pola = wynik.unpack(surowy_naglowek)
+            yield pola[0], surowy_naglowek + f.read(pola[-2] + (pola[-1] if pola[3] == 0
+                                                                else 0))
+
+
+def iteruj_wyniki_partycji(sciezka_wyniku: str) -> Iterator[tuple]:
+    """
+    Strumieniowo odczytuje plik wyniku utworzony przez oczysc_partycje.
+
+    Args:
+        sciezka_wyniku (str): Plik wyniku.
+
+    Yields:
+        tuple: Numer porządkowy, numer pliku, linia, status, numer typu,
+        zawartość GC, numer pliku i linia wpisu zachowanego, nazwa,
+        długość oraz treść sekwencji (pusta dla wpisów usuniętych).
+    """
+    wynik = NAGLOWEK_WYNIKU_PARTYCJI
+    with open(sciezka_wyniku, 'rb') as f:
+        while surowy_naglowek := f.read(wynik.size):
+            *pola, dlugosc_nazwy, dlugosc = wynik.unpack(surowy_naglowek)
+            nazwa = f.read(dlugosc_nazwy).decode()
+            tresc = f.read(dlugosc).decode('ascii') if pola[3] == 0 else ""
+            yield *pola, nazwa, dlugosc, tresc
+
+
+def oczysc_pliki_poza_pamiecia(
+    sciezki: list[str], sciezka_wyjscia: str, sciezka_tabeli: str,
+    z_odwrotnym_komplementem: bool = False, procesy: int = 1,
+    katalog_partycji: str | None = None, liczba_partycji: int | None = None,
+    kompresja: str = "brak"
+) -> dict[str, int]:
+    """
+    Czyści wiele plików FASTA razem, usuwając duplikaty globalnie, przy
+    zużyciu pamięci niezależnym od łącznego rozmiaru danych.
+
+    Wpisy wszystkich plików są rozpisywane do partycji na dysku według
+    skrótu treści (rozpisz_do_partycji). Każda partycja jest walidowana
+    i deduplikowana osobno w puli procesów (oczysc_partycje), a wyniki
+    partycji, uporządkowane po numerze porządkowym, są scalane do jednego
+    pliku FASTA i tabeli CSV. Partycje są czytane strumieniowo (w pamięci
+    zostają partia wpisów i skróty wpisów zachowanych), zbyt duże są
+    dzielone rekurencyjnie, a scalanie jest strumieniowe.
+
+    Wynikowy plik FASTA jest taki sam jak po oczyszczeniu złączenia plików
+    wejściowych poleceniem oczysc. Tabela zawiera wiersz dla każdego wpisu
+    wejściowego: plik i linię nagłówka, status, statystyki oraz, dla
+    duplikatów, plik i linię wpisu, który zachowano.
+
+    Args:
+        sciezki (list[str]): Pliki FASTA (zob. rozwin_zrodla).
+        sciezka_wyjscia (str): Ścieżka oczyszczonego pliku FASTA.
+        sciezka_tabeli (str): Ścieżka tabeli wpisów (CSV, kolumny
+                              KOLUMNY_TABELI_WPISOW).
+        z_odwrotnym_komplementem (bool): Traktuj odwrotny komplement
+                                         jak duplikat.
+        procesy (int): Liczba procesów czyszczących partycje.
+        katalog_partycji (str | None): Katalog, w którym tworzony jest
+                                       tymczasowy katalog partycji.
+                                       Domyślnie katalog pliku wynikowego
+                                       (nie /tmp, które bywa w pamięci).
+        liczba_partycji (int | None): Liczba partycji. Domyślnie tyle, by
+                                      partycja miała około ROZMIAR_PARTYCJI
+                                      bajtów, ale co najmniej
+                                      FRAGMENTY_NA_PROCES na proces.
+        kompresja (str): Kompresja pliku wynikowego (FORMATY_KOMPRESJI).
+
+    Returns:
+        dict[str, int]: Liczniki jak w oczysc_partie.
+    """
+    import csv
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    if liczba_partycji is None:
+        szacowany_rozmiar = sum(
+            os.path.getsize(sciezka)
+            * (1 if wykryj_kompresje(sciezka) == "brak" else SZACOWANY_STOPIEN_KOMPRESJI)
+            for sciezka in sciezki)
+        liczba_partycji = min(max(-(-szacowany_rozmiar // ROZMIAR_PARTYCJI),
+                                  procesy * FRAGMENTY_NA_PROCES), MAKS_LICZBA_PARTYCJI)
+    if katalog_partycji is None:
+        katalog_partycji = os.path.dirname(os.path.abspath(sciezka_wyjscia))
+
+    with tempfile.TemporaryDirectory(prefix="partycje_", dir=katalog_partycji) as katalog:
+        with METRYKI.mierz("partycjonowanie"):
+            sciezki_partycji, liczba_wpisow = rozpisz_do_partycji(
+                sciezki, katalog, liczba_partycji, z_odwrotnym_komplementem)
+        dziennik.info("Rozpisano %d wpisów z %d plików do %d partycji.",
+                      liczba_wpisow, len(sciezki), liczba_partycji)
+
+        sciezki_wynikow = [os.path.join(katalog, f"wynik_{i:04d}.bin")
+                           for i in range(liczba_partycji)]
+        with METRYKI.mierz("czyszczenie_partycji"):
+            if procesy > 1:
+                with ProcessPoolExecutor(max_workers=procesy) as pula:
+                    wyniki = list(pula.map(oczysc_partycje, sciezki_partycji,
+                                           sciezki_wynikow))
+            else:
+                wyniki = list(map(oczysc_partycje, sciezki_partycji, sciezki_wynikow))
+        liczniki = {klucz: sum(wynik[klucz] for wynik in wyniki) for klucz in wyniki[0]}
+
+        with METRYKI.mierz("scalanie"), \
+                otworz_plik_wyjsciowy(sciezka_wyjscia, kompresja) as plik_fasta, \
+                open(sciezka_tabeli, 'w', newline='', encoding='utf-8') as plik_tabeli:
+            tabela = csv.writer(plik_tabeli)
+            tabela.writerow(KOLUMNY_TABELI_WPISOW)
+            for (_, plik, linia, status, typ, gc, plik_zrodla, linia_zrodla, nazwa, dlugosc,
+                 tresc) in heapq.merge(*map(iteruj_wyniki_partycji, sciezki_wynikow)):
+                if status == 0:
+                    plik_fasta.write(f">{nazwa}\n{tresc}\n")
+                tabela.writerow((sciezki[plik], linia, nazwa, STATUSY_WPISOW[status],
+                                 dlugosc, gc, TYPY_SEKWENCJI[typ],
+                                 f"{sciezki[plik_zrodla]}:{linia_zrodla}"
+                                 if status == 1 else ""))
+
+    METRYKI.zwieksz("wpisy_niepoprawne", liczniki["Niepoprawne"])
+    METRYKI.zwieksz("duplikaty", liczniki["Duplikaty"])
+    METRYKI.zwieksz("wpisy_zachowane", liczniki["Zachowane"])
+    podsumuj_czyszczenie(liczniki)
+    return liczniki
+
+
+def zmierz_oczyszczanie_plikow(
+    sciezki: list[str], katalog: str, liczba_partycji: int, procesy: int = 1
+) -> dict[str, float | None]:
+    """
+    Czyści pliki przez oczysc_pliki_poza_pamiecia, mierząc czas
+    i szczytowy RSS procesu. Wywoływana w świeżym procesie przez
+    zmierz_czyszczenie_poza_pamiecia.
+
+    Args:
+        sciezki (list[str]): Pliki FASTA.
+        katalog (str): Katalog na wyniki i partycje.
+        liczba_partycji (int): Liczba partycji.
+        procesy (int): Liczba procesów czyszczących partycje.
+
+    Returns:
+        dict[str, float | None]: "Czas" w sekundach, liczba wpisów
+        "Wczytane" oraz "Szczytowy_RSS_MiB".
+    """
+    poczatek = time.perf_counter()
+    liczniki = oczysc_pliki_poza_pamiecia(
+        sciezki, os.path.join(katalog, "wynik.fa"), os.path.join(katalog, "wpisy.csv"),
+        procesy=procesy, liczba_partycji=liczba_partycji)
+    return {"Czas": time.perf_counter() - poczatek, "Wczytane": liczniki["Wczytane"],
+            "Szczytowy_RSS_MiB": szczytowy_rss_mib()}
+
+
+def zmierz_czyszczenie_poza_pamiecia(
+    rozmiary: Iterable[int] = (100_000, 1_000_000), liczba_plikow: int = 4,
+    rozmiar_partycji: int = 8 << 20, procesy: int = 1, ziarno: int = 0
+):
+    """
+    Mierzy przepustowość i szczytowy RSS oczysc_pliki_poza_pamiecia na
+    korpusach o rosnącej liczbie wpisów, podzielonych na kilka plików.
+
+    Liczba partycji rośnie z rozmiarem danych, więc szczytowy RSS nie
+    powinien rosnąć razem z nim. Każdy pomiar wykonywany jest w świeżo
+    uruchomionym procesie.
+
+    Args:
+        rozmiary (Iterable[int]): Łączne liczby wpisów korpusów.
+        liczba_plikow (int): Liczba plików korpusu.
+        rozmiar_partycji (int): Docelowy rozmiar partycji w bajtach.
+        procesy (int): Liczba procesów czyszczących partycje.
+        ziarno (int): Ziarno generatora korpusów.
+    """
+    import multiprocessing
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    kontekst = multiprocessing.get_context("spawn")
+    for liczba_sekwencji in rozmiary:
+        with tempfile.TemporaryDirectory() as katalog:
+            sciezki = [os.path.join(katalog, f"zrodlo_{i}.fa") for i in range(liczba_plikow)]
+            for i, sciezka in enumerate(sciezki):
+                utworz_korpus_testowy(sciezka, liczba_sekwencji // liczba_plikow, 0.01, 0.25,
+                                      ziarno + i)
+            rozmiar = sum(map(os.path.getsize, sciezki))
+            liczba_partycji = -(-rozmiar // rozmiar_partycji)
+            with ProcessPoolExecutor(max_workers=1, mp_context=kontekst) as pula:
+                pomiar = pula.submit(zmierz_oczyszczanie_plikow, sciezki, katalog,
+                                     liczba_partycji, procesy).result()
+        czas = max(pomiar["Czas"], 1e-9)
+        print(f"  {pomiar['Wczytane']} wpisów ({rozmiar / 1e6:.0f} MB, {liczba_partycji} "
+              f"partycji): {czas:.3f} s ({pomiar['Wczytane'] / czas:,.0f} wpisów/s), "
+              f"szczytowy RSS {pomiar['Szczytowy_RSS_MiB'] or 0:.0f} MiB")
+
+
+class HistogramySekwencji:
+    """
+    Histogramy długości i zawartości GC oraz dwuwymiarowa siatka gęstości
+    długość × GC, uzupełniane partiami w miarę napływu danych.
+
+    Pamięć jest stała: siatka ma ustaloną liczbę przedziałów, a gdy
+    pojawi się dłuższa sekwencja, sąsiednie przedziały długości są
+    łączone parami (szerokość przedziału się podwaja). Histogramy
+    brzegowe powstają z sumowania siatki.
+
+    Atrybuty:
+        siatka (np.ndarray): Liczby sekwencji w przedziałach [długość, GC].
+        szerokosc_przedzialu_dlugosci (int): Szerokość przedziału długości.
+        typy (dict[str, int]): Liczby sekwencji każdego typu.
+        liczba_sekwencji (int): Liczba wszystkich dodanych sekwencji.
+    """
+
+    def __init__(
+        self, liczba_przedzialow_dlugosci: int = LICZBA_PRZEDZIALOW_DLUGOSCI,
+        liczba_przedzialow_gc: int = LICZBA_PRZEDZIALOW_GC
+    ):
+        import numpy as np
+
+        if liczba_przedzialow_dlugosci % 2:
+            raise ValueError("Liczba przedziałów długości musi być parzysta.")
+        self.siatka = np.zeros((liczba_przedzialow_dlugosci, liczba_przedzialow_gc),
+                               dtype=np.int64)
+        self.szerokosc_przedzialu_dlugosci = 1
+        self.typy = {}
+        self.liczba_sekwencji = 0
+
+    def dodaj(self, dlugosci: np.ndarray, zawartosc_gc: np.ndarray):
+        """
+        Dolicza partię sekwencji do siatki gęstości.
+
+        Args:
+            dlugosci (np.ndarray): Długości sekwencji.
+            zawartosc_gc (np.ndarray): Zawartość GC w procentach (0-100).
+        """
+        import numpy as np
+
+        dlugosci = np.asarray(dlugosci, dtype=np.int64)
+        if not len(dlugosci):
+            return
+        liczba_przedzialow_dlugosci, liczba_przedzialow_gc = self.siatka.shape
+        najdluzsza = int(dlugosci.max())
+        while najdluzsza >= liczba_przedzialow_dlugosci * self.szerokosc_przedzialu_dlugosci:
+            self._polacz_przedzialy_dlugosci()
+
+        wiersze = dlugosci // self.szerokosc_przedzialu_dlugosci
+        kolumny = np.clip((np.asarray(zawartosc_gc) * (liczba_przedzialow_gc / 100))
+                          .astype(np.int64), 0, liczba_przedzialow_gc - 1)
+        self.siatka += np.bincount(wiersze * liczba_przedzialow_gc + kolumny,
+                                   minlength=self.siatka.size).reshape(self.siatka.shape)
+        self.liczba_sekwencji += len(dlugosci)
+
+    def dodaj_tabele(self, tabela_danych: pd.DataFrame):
+        """
+        Dolicza partię tabeli wyników (kolumny Dlugosc, Zawartosc_GC
+        i Typ_Sekwencji).
+
+        Args:
+            tabela_danych (pd.DataFrame): Partia przetworzonych danych.
+        """
+        self.dodaj(tabela_danych['Dlugosc'].to_numpy(),
+                   tabela_danych['Zawartosc_GC'].to_numpy())
+        for typ, liczba in tabela_danych['Typ_Sekwencji'].value_counts(sort=False).items():
+            if liczba:
+                self.typy[typ] = self.typy.get(typ, 0) + int(liczba)
+
+    def _polacz_przedzialy_dlugosci(self):
+        """
+        Podwaja szerokość przedziału długości, łącząc sąsiednie przedziały.
+        """
+        import numpy as np
+
+        polowa = self.siatka.shape[0] // 2
+        polaczone = self.siatka.reshape(polowa, 2, -1).sum(axis=1)
+        self.siatka = np.concatenate([polaczone, np.zeros_like(polaczone)])
+        self.szerokosc_przedzialu_dlugosci *= 2
+
+    def krawedzie_dlugosci(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Krawędzie przedziałów długości (o jeden dłuższe niż
+            liczba przedziałów).
+        """
+        import numpy as np
+
+        return np.arange(self.siatka.shape[0] + 1) * self.szerokosc_przedzialu_dlugosci
+
+    def krawedzie_gc(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Krawędzie przedziałów zawartości GC w procentach.
+        """
+        import numpy as np
+
+        return np.linspace(0, 100, self.siatka.shape[1] + 1)
+
+    def zakres_dlugosci(self) -> slice:
+        """
+        Returns:
+            slice: Zakres przedziałów długości od pierwszego do ostatniego
+            niepustego (pusty, jeśli nie dodano sekwencji).
+        """
+        import numpy as np
+
+        niepuste = np.flatnonzero(self.siatka.sum(axis=1))
+        if not len(niepuste):
+            return slice(0, 0)
+        return slice(int(niepuste[0]), int(niepuste[-1]) + 1)
+
+
+def wizualizuj_histogramy(
+    histogramy: HistogramySekwencji, katalog_wyjscia: str | None = None,
+    format_wykresow: str = "png"
+):
+    """
+    Rysuje histogramy długości i GC, mapę gęstości długość × GC oraz
+    liczby sekwencji według typu z gotowych histogramów. Czas i pamięć
+    rysowania nie zależą od liczby sekwencji.
+
+    Args:
+        histogramy (HistogramySekwencji): Zebrane histogramy.
+        katalog_wyjscia (str | None): Jeśli podano, wykresy są zapisywane
+                                      do plików w tym katalogu (bez okien,
+                                      backend Agg) zamiast być wyświetlane.
+        format_wykresow (str): Format zapisywanych plików, np. "png" lub "svg".
+    """
+    import numpy as np
+
+    if not histogramy.liczba_sekwencji:
+        print("Brak danych do wizualizacji.")
+        return
+
+    with METRYKI.mierz("wykresy"):
+        import matplotlib
+        if katalog_wyjscia is not None:
+            matplotlib.use("Agg")
+            os.makedirs(katalog_wyjscia, exist_ok=True)
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import LogNorm
+
+        def pokaz_lub_zapisz(nazwa_wykresu: str):
+            if katalog_wyjscia is None:
+                plt.show()
+                return
+            sciezka = os.path.join(katalog_wyjscia, f"{nazwa_wykresu}.{format_wykresow}")
+            plt.savefig(sciezka)
+            plt.close()
+            print(f"  Zapisano wykres '{sciezka}'.")
+
+        print("\n--- Tworzenie wizualizacji ---")
+
+        zakres = histogramy.zakres_dlugosci()
+        siatka = histogramy.siatka[zakres]
+        krawedzie_dlugosci = histogramy.krawedzie_dlugosci()[zakres.start:zakres.stop + 1]
+        krawedzie_gc = histogramy.krawedzie_gc()
+
+        plt.figure(figsize=(10, 6))
+        plt.stairs(siatka.sum(axis=1), krawedzie_dlugosci, fill=True, edgecolor='black')
+        plt.title('Rozkład długości sekwencji DNA')
+        plt.xlabel('Długość sekwencji (nukleotydy)')
+        plt.ylabel('Liczba sekwencji')
+        plt.grid(axis='y', alpha=0.75)
+        plt.tight_layout()
+        pokaz_lub_zapisz("dlugosci")
+
+        plt.figure(figsize=(10, 6))
+        plt.stairs(siatka.sum(axis=0), krawedzie_gc, fill=True,
+                   edgecolor='black', color='lightgreen')
+        plt.title('Rozkład zawartości GC w sekwencjach DNA')
+        plt.xlabel('Zawartość GC (%)')
+        plt.ylabel('Liczba sekwencji')
+        plt.grid(axis='y', alpha=0.75)
+        plt.tight_layout()
+        pokaz_lub_zapisz("zawartosc_gc")
+
+        plt.figure(figsize=(10, 6))
+        plt.pcolormesh(krawedzie_dlugosci, krawedzie_gc, np.ma.masked_equal(siatka.T, 0),
+                       norm=LogNorm(), cmap='viridis')
+        plt.colorbar(label='Liczba sekwencji')
+        plt.title('Gęstość: długość sekwencji vs. zawartość GC')
+        plt.xlabel('Długość sekwencji (nukleotydy)')
+        plt.ylabel('Zawartość GC (%)')
+        plt.tight_layout()
+        pokaz_lub_zapisz("dlugosc_vs_gc")
+
+        typy = sorted(histogramy.typy.items(), key=lambda para: -para[1])
+        plt.figure(figsize=(8, 5))
+        plt.bar([typ for typ, _ in typy], [liczba for _, liczba in typy],
+                color=['purple', 'orange', 'cyan'])
+        plt.title('Liczba sekwencji według typu')
+        plt.xlabel('Typ sekwencji')
+        plt.ylabel('Liczba sekwencji')
+        plt.xticks(rotation=45)
+        plt.grid(axis='y', alpha=0.75)
+        plt.tight_layout()
+        pokaz_lub_zapisz("typy_sekwencji")
+
+
+def wizualizuj_dane(
+    tabela_danych: pd.DataFrame, katalog_wyjscia: str | None = None,
+    format_wykresow: str = "png"
+):
+    """
+    Generuje i wyświetla różne wizualizacje danych z DataFrame.
+
+    Args:
+        tabela_danych (pd.DataFrame): DataFrame zawierający przetworzone dane
+                                      sekwencji DNA.
+        katalog_wyjscia (str | None): Jeśli podano, wykresy są zapisywane
+                                      do plików w tym katalogu (bez okien)
+                                      zamiast być wyświetlane.
+        format_wykresow (str): Format zapisywanych plików, np. "png" lub "svg".
+    """
+    histogramy = HistogramySekwencji()
+    if not tabela_danych.empty:
+        histogramy.dodaj_tabele(tabela_danych)
+    wizualizuj_histogramy(histogramy, katalog_wyjscia, format_wykresow)
+
 
+def utworz_korpus_testowy(
+    nazwa_pliku: str, liczba_sekwencji: int, udzial_niepoprawnych: float,
+    udzial_duplikatow: float, ziarno: int = 0
+):
+    """
+    Tworzy powtarzalny plik FASTA do testów wydajności z zadanym udziałem
+    wadliwych i zduplikowanych wpisów.
 
-def wyswietl_info_o_sekwencji(obiekt_sekwencji: SekwencjaDNA):
+    Długości i alfabet są takie jak w utworz_plik_fasta. Wadliwy wpis ma
+    jeden niepoprawny znak w losowym miejscu. Duplikat kopiuje treść
+    losowego wpisu z tego samego bloku, więc rzeczywisty udział usuniętych
+    duplikatów może być nieco mniejszy od zadanego.
+
+    Args:
+        nazwa_pliku (str): Nazwa tworzonego pliku.
+        liczba_sekwencji (int): Liczba wpisów.
+        udzial_niepoprawnych (float): Prawdopodobieństwo wadliwego wpisu.
+        udzial_duplikatow (float): Prawdopodobieństwo duplikatu.
+        ziarno (int): Ziarno generatora liczb losowych.
     """
-    Wyświetla szczegółowe informacje o pojedynczej sekwencji DNA.
+    import numpy as np
+
+    with open(nazwa_pliku, 'wb') as f:
+        for numer_bloku, poczatek in enumerate(
+                range(0, liczba_sekwencji, ROZMIAR_BLOKU_GENERATORA)):
+            generator = np.random.default_rng([ziarno, numer_bloku])
+            liczba = min(ROZMIAR_BLOKU_GENERATORA, liczba_sekwencji - poczatek)
+            dlugosci = generator.integers(MIN_DLUGOSC_SEKWENCJI, MAX_DLUGOSC_SEKWENCJI + 1,
+                                          liczba)
+            dane, przesuniecia = generuj_sekwencje_wektorowo(generator, dlugosci)
+
+            niepoprawne = np.flatnonzero(generator.random(liczba) < udzial_niepoprawnych)
+            kody = np.frombuffer(dane, dtype=np.uint8).copy()
+            kody[przesuniecia[niepoprawne]
+                 + (generator.random(len(niepoprawne)) * dlugosci[niepoprawne]).astype(np.int64)] = \
+                np.frombuffer(ALFABET_GENERATORA, dtype=np.uint8)[
+                    generator.integers(4, len(ALFABET_GENERATORA), len(niepoprawne))]
+            dane = kody.tobytes()
+
+            sekwencje = [dane[przesuniecia[i]:przesuniecia[i + 1]] for i in range(liczba)]
+            duplikaty = np.flatnonzero(generator.random(liczba) < udzial_duplikatow)
+            for i, zrodlo in zip(duplikaty.tolist(),
+                                 generator.integers(0, liczba, len(duplikaty)).tolist()):
+                sekwencje[i] = sekwencje[zrodlo]
+            f.write(b"".join(b">Sekwencja_%d\n%s\n" % (poczatek + i + 1, sekwencja)
+                             for i, sekwencja in enumerate(sekwencje)))
+
+
+def szczytowy_rss_mib() -> float | None:
+    """
+    Zwraca szczytowe zużycie pamięci (RSS) bieżącego procesu.
+
+    Returns:
+        float | None: Szczytowy RSS w MiB lub None, jeśli system nie
+        udostępnia modułu resource.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss jest w kilobajtach na Linuksie, a w bajtach na macOS.
+    jednostka = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * jednostka / 2 ** 20
+
+
+def zmierz_etapy_potoku(
+    nazwa_pliku: str, rozmiar_partii: int = ROZMIAR_PARTII_WYNIKOW
+) -> dict[str, float]:
+    """
+    Mierzy osobno czas każdego etapu przetwarzania pliku FASTA partiami
+    oraz szczytowe zużycie pamięci (RSS) procesu.
+
+    Etapy: parsowanie (iteruj_plik_fasta), walidacja (spakowanie partii
+    i sprawdzenie znaków), zawartosc_gc, deduplikacja, budowa_tabeli
+    (zbuduj_tabele_wynikow) i wykresy (zbieranie HistogramySekwencji
+    w trakcie przetwarzania i zapis PNG bez okien).
 
     Args:
-        obiekt_sekwencji (SekwencjaDNA): Obiekt sekwencji DNA do wyświetlenia.
+        nazwa_pliku (str): Plik FASTA.
+        rozmiar_partii (int): Liczba sekwencji w partii.
+
+    Returns:
+        dict[str, float]: Czas każdego etapu w sekundach, liczby wpisów
+        ("Wczytane", "Niepoprawne", "Duplikaty") oraz "Szczytowy_RSS_MiB"
+        (None, jeśli system nie udostępnia modułu resource).
     """
-    print(f"\n--- Informacje o sekwencji: {obiekt_sekwencji.nazwa} ---")
-    print(f"  Długość: {obiekt_sekwencji.pobierz_dlugosc()} nukleotydów")
-    print(f"  Zawartość GC: {obiekt_sekwencji.oblicz_zawartosc_gc():.2f}%")
-    print(f"  Poprawna: {'Tak' if obiekt_sekwencji.jest_poprawna() else 'Nie (zawiera niepoprawne nukleotydy)'}")
-    print(f"  Typ: {obiekt_sekwencji.pobierz_typ_sekwencji()}")
-    print(f"  Sekwencja (pierwsze 30 znaków): {obiekt_sekwencji.sekwencja[:30]}...")
+    import tempfile
 
+    # Import bibliotek nie powinien być doliczany do pierwszego etapu,
+    # który z nich korzysta.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import numpy as np
+    import pandas  # noqa: F401
 
-def przetworz_sekwencje(
-    slownik_sekwencji: dict[str, SekwencjaDNA]
-) -> pd.DataFrame:
+    wyniki = dict.fromkeys(ETAPY_TESTU_WYDAJNOSCI, 0.0)
+    wyniki.update(Wczytane=0, Niepoprawne=0, Duplikaty=0)
+    zachowane_skroty = set()
+    histogramy = HistogramySekwencji()
+    iterator = iteruj_plik_fasta(nazwa_pliku)
+
+    while True:
+        poczatek = time.perf_counter()
+        partia = list(itertools.islice(iterator, rozmiar_partii))
+        wyniki["parsowanie"] += time.perf_counter() - poczatek
+        if not partia:
+            break
+        wyniki["Wczytane"] += len(partia)
+
+        poczatek = time.perf_counter()
+        bufor, przesuniecia = spakuj_sekwencje(partia)
+        poprawne = oblicz_poprawnosc_bufora(bufor, przesuniecia)
+        wyniki["walidacja"] += time.perf_counter() - poczatek
+
+        poczatek = time.perf_counter()
+        zawartosc_gc = oblicz_zawartosc_gc_bufora(bufor, przesuniecia)
+        statystyki = {"Dlugosc": np.diff(przesuniecia), "Zawartosc_GC": zawartosc_gc,
+                      "Poprawna": poprawne, "Typ_Sekwencji": typy_z_zawartosci_gc(zawartosc_gc)}
+        wyniki["zawartosc_gc"] += time.perf_counter() - poczatek
+
+        poczatek = time.perf_counter()
+        zachowane_indeksy = []
+        for indeks in np.flatnonzero(poprawne).tolist():
+            skrot = skrot_sekwencji(partia[indeks].sekwencja)
+            if skrot in zachowane_skroty:
+                wyniki["Duplikaty"] += 1
+                continue
+            zachowane_skroty.add(skrot)
+            zachowane_indeksy.append(indeks)
+        wyniki["Niepoprawne"] += len(partia) - int(np.count_nonzero(poprawne))
+        wyniki["deduplikacja"] += time.perf_counter() - poczatek
+
+        poczatek = time.perf_counter()
+        tabela_danych = zbuduj_tabele_wynikow(partia, statystyki, zachowane_indeksy)
+        wyniki["budowa_tabeli"] += time.perf_counter() - poczatek
+
+        poczatek = time.perf_counter()
+        histogramy.dodaj_tabele(tabela_danych)
+        wyniki["wykresy"] += time.perf_counter() - poczatek
+
+    with tempfile.TemporaryDirectory() as katalog_wykresow:
+        poczatek = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            wizualizuj_histogramy(histogramy, katalog_wykresow)
+        wyniki["wykresy"] += time.perf_counter() - poczatek
+
+    wyniki["Szczytowy_RSS_MiB"] = szczytowy_rss_mib()
+    return wyniki
+
+
+def zmierz_czas_importu(powtorzenia: int = POWTORZENIA_POMIARU_IMPORTU) -> dict:
     """
-    Przetwarza sekwencje DNA, usuwając wadliwe i zduplikowane wpisy,
-    a następnie konwertuje pozostałe dane do DataFrame.
+    Mierzy czas importu tego modułu w świeżych interpreterach
+    (python -X importtime) i sprawdza, czy import nie ładuje modułów
+    z CIEZKIE_MODULY.
+
+    Czasem importu jest minimum z kilku uruchomień, najmniej zaburzone
+    przez inne procesy. Nie obejmuje modułów ładowanych przy starcie
+    interpretera.
 
     Args:
-        slownik_sekwencji (dict): Słownik sekwencji DNA do przetworzenia.
+        powtorzenia (int): Liczba uruchomień interpretera.
 
     Returns:
-        pd.DataFrame: DataFrame zawierający oczyszczone i przetworzone
-                      sekwencje. Pusty DataFrame, jeśli nie ma danych
-                      do przetworzenia.
+        dict: "Czas_importu_s" (łącznie z importowanymi modułami),
+        "Najwolniejsze" (pary [moduł, czas własny w sekundach]) oraz
+        "Ciezkie_moduly" (zaimportowane moduły z CIEZKIE_MODULY).
     """
-    if not slownik_sekwencji:
-        print("Brak sekwencji do przetworzenia.")
-        return pd.DataFrame()
+    import subprocess
 
-    print("\n--- Przetwarzanie sekwencji ---")
-    przetworzone_dane = []
-    widziane_tresci_sekwencji = set()
-    poczatkowa_liczba = len(slownik_sekwencji)
-    usunietych_duplikatow = 0
-    usunietych_niepoprawnych = 0
+    katalog, nazwa_pliku = os.path.split(os.path.abspath(__file__))
+    nazwa_modulu = os.path.splitext(nazwa_pliku)[0]
+    # Mierzony jest import ze skompilowanego pliku .pyc, tak jak w procesach
+    # roboczych; pierwsze uruchomienie go zapisuje.
+    srodowisko = dict(os.environ)
+    srodowisko.pop("PYTHONDONTWRITEBYTECODE", None)
+    najlepszy = None
+    for _ in range(powtorzenia):
+        wynik = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                                f"import {nazwa_modulu}"], cwd=katalog, env=srodowisko,
+                               capture_output=True, text=True, check=True)
+        moduly = {}
+        for linia in wynik.stderr.splitlines():
+            wlasny, laczny, nazwa = linia.removeprefix("import time:").split("|")
+            if wlasny.strip().isdigit():
+                moduly[nazwa.strip()] = (int(wlasny) / 1e6, int(laczny) / 1e6)
+        if najlepszy is None or moduly[nazwa_modulu][1] < najlepszy[nazwa_modulu][1]:
+            najlepszy = moduly
 
-    for nazwa, obiekt_sekwencji in slownik_sekwencji.items():
-        if not obiekt_sekwencji.jest_poprawna():
-            print(f"  Usuwam wadliwą sekwencję: {nazwa} "
-                  "(zawiera niepoprawne nukleotydy)")
-            usunietych_niepoprawnych += 1
-            continue
+    return {
+        "Czas_importu_s": najlepszy[nazwa_modulu][1],
+        "Najwolniejsze": sorted(([nazwa, wlasny] for nazwa, (wlasny, _) in najlepszy.items()),
+                                key=lambda para: -para[1])[:LICZBA_NAJWOLNIEJSZYCH_MODULOW],
+        "Ciezkie_moduly": sorted(nazwa for nazwa in najlepszy
+                                 if nazwa.split(".")[0] in CIEZKIE_MODULY),
+    }
 
-        if obiekt_sekwencji.sekwencja in widziane_tresci_sekwencji:
-            print(f"  Usuwam duplikat: {nazwa} (treść sekwencji już istnieje)")
-            usunietych_duplikatow += 1
-            continue
 
-        widziane_tresci_sekwencji.add(obiekt_sekwencji.sekwencja)
-        przetworzone_dane.append({
-            "Nazwa": obiekt_sekwencji.nazwa,
-            "Sekwencja": obiekt_sekwencji.sekwencja,
-            "Dlugosc": obiekt_sekwencji.pobierz_dlugosc(),
-            "Zawartosc_GC": obiekt_sekwencji.oblicz_zawartosc_gc(),
-            "Typ_Sekwencji": obiekt_sekwencji.pobierz_typ_sekwencji()
-        })
+def uruchom_testy_wydajnosci(
+    rozmiary: Iterable[int] = ROZMIARY_KORPUSOW_TESTOWYCH,
+    udzialy: Iterable[tuple[float, float]] = UDZIALY_WADLIWYCH_I_DUPLIKATOW_TESTOWYCH,
+    katalog_korpusow: str = KATALOG_KORPUSOW_TESTOWYCH, ziarno: int = 0,
+    sciezka_wynikow: str | None = None
+) -> dict:
+    """
+    Uruchamia zestaw testów wydajności na powtarzalnych korpusach
+    o różnych rozmiarach i udziałach wadliwych oraz zduplikowanych wpisów.
 
-    print(f"  Usunięto duplikatów: {usunietych_duplikatow}")
-    print(f"  Usunięto wadliwych sekwencji: {usunietych_niepoprawnych}")
-    print(f"  Pozostało sekwencji po oczyszczeniu: {len(przetworzone_dane)} "
-          f"z {poczatkowa_liczba} początkowych.")
+    Korpusy są tworzone raz (utworz_korpus_testowy) i ponownie używane
+    przy kolejnych uruchomieniach. Każdy korpus jest mierzony
+    (zmierz_etapy_potoku) w osobnym, świeżo uruchomionym procesie, aby
+    szczytowy RSS dotyczył tylko tego korpusu. Mierzony jest też czas
+    importu modułu (zmierz_czas_importu).
 
-    tabela_danych = pd.DataFrame(przetworzone_dane)
-    return tabela_danych
+    Args:
+        rozmiary (Iterable[int]): Liczby wpisów w korpusach.
+        udzialy (Iterable[tuple[float, float]]): Pary (udział wadliwych,
+                                                 udział duplikatów).
+        katalog_korpusow (str): Katalog na pliki korpusów.
+        ziarno (int): Ziarno generatora korpusów.
+        sciezka_wynikow (str | None): Jeśli podano, wyniki są zapisywane
+                                      do tego pliku JSON.
+
+    Returns:
+        dict: Opis maszyny ("Maszyna"), wynik zmierz_czas_importu ("Import")
+        oraz lista wyników ("Wyniki"), po jednym na korpus.
+    """
+    import multiprocessing
+    import platform
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+
+    os.makedirs(katalog_korpusow, exist_ok=True)
+    wyniki = {
+        "Maszyna": {"Wezel": platform.node(), "Procesor": platform.processor()
+                    or platform.machine(), "Liczba_rdzeni": os.cpu_count(),
+                    "Python": platform.python_version(), "NumPy": np.__version__},
+        "Import": zmierz_czas_importu(),
+        "Wyniki": [],
+    }
+    print(f"  Import modułu: {wyniki['Import']['Czas_importu_s'] * 1000:.1f} ms"
+          + "".join(f", {nazwa} {czas * 1000:.1f} ms"
+                    for nazwa, czas in wyniki["Import"]["Najwolniejsze"]))
+    for nazwa in wyniki["Import"]["Ciezkie_moduly"]:
+        print(f"  OSTRZEŻENIE: Import modułu ładuje '{nazwa}'.")
+    kontekst = multiprocessing.get_context("spawn")
+    for liczba_sekwencji in rozmiary:
+        for udzial_niepoprawnych, udzial_duplikatow in udzialy:
+            nazwa_pliku = os.path.join(
+                katalog_korpusow, f"korpus_{liczba_sekwencji}_{udzial_niepoprawnych}_"
+                                  f"{udzial_duplikatow}_{ziarno}.fa")
+            if not os.path.exists(nazwa_pliku):
+                utworz_korpus_testowy(nazwa_pliku, liczba_sekwencji, udzial_niepoprawnych,
+                                      udzial_duplikatow, ziarno)
+            with ProcessPoolExecutor(max_workers=1, mp_context=kontekst) as pula:
+                pomiar = pula.submit(zmierz_etapy_potoku, nazwa_pliku).result()
+            wyniki["Wyniki"].append({
+                "Liczba_sekwencji": liczba_sekwencji,
+                "Udzial_niepoprawnych": udzial_niepoprawnych,
+                "Udzial_duplikatow": udzial_duplikatow,
+                **pomiar,
+            })
+            etapy = ", ".join(f"{etap} {pomiar[etap]:.3f} s"
+                              for etap in ETAPY_TESTU_WYDAJNOSCI)
+            print(f"  {liczba_sekwencji} wpisów ({udzial_niepoprawnych:.0%} wadliwych, "
+                  f"{udzial_duplikatow:.0%} duplikatów): {etapy}; szczytowy RSS "
+                  f"{pomiar['Szczytowy_RSS_MiB'] or 0:.0f} MiB")
 
+    if sciezka_wynikow is not None:
+        with open(sciezka_wynikow, 'w', encoding='utf-8') as f:
+            json.dump(wyniki, f, indent=2, ensure_ascii=False)
+        print(f"Wyniki testów wydajności zapisano do '{sciezka_wynikow}'.")
+    return wyniki
 
-def wizualizuj_dane(tabela_danych: pd.DataFrame):
+
+def porownaj_z_wynikami_bazowymi(
+    wyniki: dict, wyniki_bazowe: dict, tolerancja: float = TOLERANCJA_REGRESJI
+) -> list[str]:
     """
-    Generuje i wyświetla różne wizualizacje danych z DataFrame.
+    Porównuje wyniki testów wydajności z wynikami bazowymi z tej samej
+    maszyny i wypisuje etapy, które zwolniły ponad tolerancję. Regresją
+    jest też dłuższy import modułu oraz każdy ciężki moduł ładowany
+    przy imporcie.
 
     Args:
-        tabela_danych (pd.DataFrame): DataFrame zawierający przetworzone dane
-                                      sekwencji DNA.
+        wyniki (dict): Wynik uruchom_testy_wydajnosci.
+        wyniki_bazowe (dict): Wcześniejszy wynik (np. wczytany z JSON).
+        tolerancja (float): Dopuszczalny względny wzrost czasu lub pamięci.
+
+    Returns:
+        list[str]: Opisy wykrytych regresji (pusta lista, jeśli ich brak).
     """
-    if tabela_danych.empty:
-        print("Brak danych do wizualizacji.")
-        return
+    if wyniki["Maszyna"] != wyniki_bazowe["Maszyna"]:
+        dziennik.warning("Wyniki bazowe pochodzą z innej maszyny lub innych wersji "
+                         "bibliotek; porównanie może być niemiarodajne.")
 
-    print("\n--- Tworzenie wizualizacji ---")
-
-    plt.figure(figsize=(10, 6))
-    plt.hist(tabela_danych['Dlugosc'], bins=10, edgecolor='black')
-    plt.title('Rozkład długości sekwencji DNA')
-    plt.xlabel('Długość sekwencji (nukleotydy)')
-    plt.ylabel('Liczba sekwencji')
-    plt.grid(axis='y', alpha=0.75)
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure(figsize=(10, 6))
-    plt.hist(tabela_danych['Zawartosc_GC'], bins=10,
-             edgecolor='black', color='lightgreen')
-    plt.title('Rozkład zawartości GC w sekwencjach DNA')
-    plt.xlabel('Zawartość GC (%)')
-    plt.ylabel('Liczba sekwencji')
-    plt.grid(axis='y', alpha=0.75)
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(tabela_danych['Dlugosc'], tabela_danych['Zawartosc_GC'],
-                alpha=0.7, color='skyblue')
-    plt.title('Długość sekwencji vs. Zawartość GC')
-    plt.xlabel('Długość sekwencji (nukleotydy)')
-    plt.ylabel('Zawartość GC (%)')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure(figsize=(8, 5))
-    tabela_danych['Typ_Sekwencji'].value_counts().plot(
-        kind='bar', color=['purple', 'orange', 'cyan'])
-    plt.title('Liczba sekwencji według typu')
-    plt.xlabel('Typ sekwencji')
-    plt.ylabel('Liczba sekwencji')
-    plt.xticks(rotation=45)
-    plt.grid(axis='y', alpha=0.75)
-    plt.tight_layout()
-    plt.show()
+    def klucz(wynik: dict) -> tuple:
+        return (wynik["Liczba_sekwencji"], wynik["Udzial_niepoprawnych"],
+                wynik["Udzial_duplikatow"])
+
+    bazowe = {klucz(wynik): wynik for wynik in wyniki_bazowe["Wyniki"]}
+    regresje = []
+    if "Import" in wyniki:
+        regresje.extend(f"import ładuje '{nazwa}'"
+                        for nazwa in wyniki["Import"]["Ciezkie_moduly"])
+        teraz = wyniki["Import"]["Czas_importu_s"]
+        wczesniej = wyniki_bazowe.get("Import", {}).get("Czas_importu_s")
+        if wczesniej and teraz > wczesniej * (1 + tolerancja):
+            regresje.append(f"Czas_importu_s: {wczesniej:.3f} -> {teraz:.3f} "
+                            f"(+{(teraz / wczesniej - 1):.0%})")
+    for wynik in wyniki["Wyniki"]:
+        wynik_bazowy = bazowe.get(klucz(wynik))
+        if wynik_bazowy is None:
+            continue
+        for miara in (*ETAPY_TESTU_WYDAJNOSCI, "Szczytowy_RSS_MiB"):
+            teraz, wczesniej = wynik.get(miara), wynik_bazowy.get(miara)
+            if not teraz or not wczesniej:
+                continue
+            # Bardzo krótkie etapy są zdominowane przez szum pomiaru.
+            if miara != "Szczytowy_RSS_MiB" and teraz < MINIMALNY_CZAS_POROWNANIA:
+                continue
+            if teraz > wczesniej * (1 + tolerancja):
+                regresje.append(f"{klucz(wynik)} {miara}: {wczesniej:.3f} -> {teraz:.3f} "
+                                f"(+{(teraz / wczesniej - 1):.0%})")
+    for regresja in regresje:
+        print(f"  REGRESJA: {regresja}")
+    if not regresje:
+        print("  Brak regresji względem wyników bazowych.")
+    return regresje
 
 
 def glowna_funkcja():
@@ -477,6 +6533,11 @@ def glowna_funkcja():
     generowaniem pliku, odczytem, przetwarzaniem, wizualizacją
     i interakcją z użytkownikiem.
     """
+    import pandas as pd
+
+    if not dziennik.handlers:
+        skonfiguruj_logowanie()
+
     docelowa_liczba_sekwencji_do_pliku = random.randint(MIN_LOSOWYCH_SEKWENCJI,
                                                         MAX_LOSOWYCH_SEKWENCJI)
 
@@ -555,7 +6616,7 @@ def glowna_funkcja():
 
     if not wyczyszczona_tabela_danych.empty:
         print("\n--- Ostateczna Tabela Danych z czystymi sekwencjami ---")
-        pd.set_option('display.max_rows', None)
+        pd.set_option('display.max_rows', LICZBA_WYSWIETLANYCH_WIERSZY_TABELI)
         pd.set_option('display.max_columns', None)
         pd.set_option('display.width', 1000)
         print(wyczyszczona_tabela_danych)
@@ -570,5 +6631,677 @@ def glowna_funkcja():
     print("\nProgram zakończył działanie. Miłego dnia!")
 
 
+def kod_wyjscia(liczniki: dict[str, int]) -> int:
+    """
+    Zamienia liczbę wadliwych i zduplikowanych wpisów na kod wyjścia,
+    wypisując liczby problemów.
+
+    Args:
+        liczniki (dict[str, int]): Liczniki z oczysc_partie.
+
+    Returns:
+        int: 0, jeśli dane są czyste; w przeciwnym razie
+             KOD_ZNALEZIONO_PROBLEMY.
+    """
+    if not liczniki["Duplikaty"] and not liczniki["Niepoprawne"]:
+        return 0
+    dziennik.warning("Znaleziono problemy: %d wadliwych i %d zduplikowanych wpisów.",
+                     liczniki["Niepoprawne"], liczniki["Duplikaty"])
+    return KOD_ZNALEZIONO_PROBLEMY
+
+
+def sprawdz_plik_wejsciowy(nazwa_pliku: str) -> bool:
+    """
+    Sprawdza, czy plik wejściowy istnieje, wypisując błąd, jeśli nie.
+
+    Args:
+        nazwa_pliku (str): Ścieżka pliku wejściowego.
+
+    Returns:
+        bool: True, jeśli plik istnieje.
+    """
+    if os.path.exists(nazwa_pliku):
+        return True
+    dziennik.error("Plik '%s' nie został znaleziony.", nazwa_pliku)
+    return False
+
+
+def oczysc_partie_wejscia(
+    argumenty: argparse.Namespace, liczniki: dict[str, int],
+    przyrostowe: PrzetwarzaniePrzyrostowe | None = None
+) -> Iterator[tuple[list[SekwencjaDNA], dict[str, np.ndarray], list[int]]]:
+    """
+    Czyści plik wejściowy podpolecenia partiami: cały albo, w trybie
+    przyrostowym, tylko wpisy dopisane od ostatniego punktu kontrolnego.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+        liczniki (dict[str, int]): Liczniki jak w oczysc_partie (w trybie
+                                   przyrostowym przyrostowe.liczniki).
+        przyrostowe (PrzetwarzaniePrzyrostowe | None): Stan przetwarzania
+                                                       przyrostowego.
+
+    Returns:
+        Iterator: Partie jak w oczysc_partie.
+    """
+    if przyrostowe is not None:
+        return przyrostowe.oczysc_partie(procesy=argumenty.procesy,
+                                         pamiec_podreczna=argumenty.pamiec_podreczna)
+    return oczysc_partie(iteruj_plik_sekwencji(argumenty.wejscie, liczniki),
+                         z_odwrotnym_komplementem=argumenty.odwrotny_komplement,
+                         procesy=argumenty.procesy, liczniki=liczniki,
+                         pamiec_podreczna=argumenty.pamiec_podreczna,
+                         parametry_jakosci=parametry_jakosci_z_argumentow(argumenty),
+                         katalog_partycji=argumenty.katalog_partycji)
+
+
+def parametry_jakosci_z_argumentow(argumenty: argparse.Namespace) -> ParametryJakosci | None:
+    """
+    Składa ustawienia filtrów jakości z opcji --min-jakosc, --przycinaj,
+    --okno, --maskuj i --min-dlugosc.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        ParametryJakosci | None: Ustawienia albo None, jeśli nie podano
+                                 żadnego filtra.
+    """
+    if (argumenty.min_jakosc is None and argumenty.przycinaj is None
+            and argumenty.maskuj is None and argumenty.min_dlugosc is None):
+        return None
+    return ParametryJakosci(min_srednia=argumenty.min_jakosc,
+                            prog_przycinania=argumenty.przycinaj,
+                            dlugosc_okna=argumenty.okno, prog_maskowania=argumenty.maskuj,
+                            min_dlugosc=argumenty.min_dlugosc or 1)
+
+
+def utworz_przetwarzanie_przyrostowe(
+    argumenty: argparse.Namespace, przebuduj: bool = False
+) -> PrzetwarzaniePrzyrostowe | None:
+    """
+    Tworzy stan przetwarzania przyrostowego, jeśli podano --punkt-kontrolny.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+        przebuduj (bool): Wymuś przetworzenie pliku od początku.
+
+    Returns:
+        PrzetwarzaniePrzyrostowe | None: Stan lub None bez punktu kontrolnego.
+    """
+    if argumenty.punkt_kontrolny is None:
+        return None
+    return PrzetwarzaniePrzyrostowe(argumenty.wejscie, argumenty.punkt_kontrolny,
+                                    argumenty.odwrotny_komplement, przebuduj,
+                                    argumenty.szybkie_wznowienie)
+
+
+def wybierz_kompresje(argumenty: argparse.Namespace) -> str:
+    """
+    Zwraca format kompresji pliku wynikowego: podany w --kompresja albo
+    wynikający z rozszerzenia pliku.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        str: Format kompresji.
+    """
+    return argumenty.kompresja or kompresja_z_rozszerzenia(argumenty.wyjscie)
+
+
+def polecenie_generuj(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "generuj": tworzy losowy plik FASTA.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    utworz_plik_fasta_wektorowo(argumenty.wyjscie, argumenty.liczba,
+                                argumenty.ziarno, argumenty.procesy)
+    return 0
+
+
+def polecenie_waliduj(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "waliduj": liczy wadliwe i zduplikowane wpisy bez
+    zapisywania wyników.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    przyrostowe = utworz_przetwarzanie_przyrostowe(argumenty)
+    liczniki = {} if przyrostowe is None else przyrostowe.liczniki
+    for _ in oczysc_partie_wejscia(argumenty, liczniki, przyrostowe):
+        pass
+    return kod_wyjscia(liczniki)
+
+
+def polecenie_oczysc(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "oczysc": zapisuje oczyszczone wpisy jako FASTA lub FASTQ
+    (opcjonalnie skompresowane: gzip, BGZF lub zstd), CSV, Parquet lub
+    Arrow IPC. W trybie przyrostowym (FASTA i CSV) nowe wpisy są
+    dopisywane do istniejącego pliku wynikowego.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    if argumenty.punkt_kontrolny is not None and argumenty.format not in ("fasta", "csv"):
+        dziennik.error("Tryb przyrostowy nie obsługuje formatu '%s' (plików Parquet "
+                       "i Arrow nie można dopisywać).", argumenty.format)
+        return KOD_BLEDU_ARGUMENTOW
+    if argumenty.format == "fastq" and wykryj_format_pliku(argumenty.wejscie) != "fastq":
+        dziennik.error("Format FASTQ wymaga pliku wejściowego FASTQ (plik FASTA nie ma "
+                       "jakości).")
+        return KOD_BLEDU_ARGUMENTOW
+    if argumenty.format == "fasta" and argumenty.maskuj is not None:
+        dziennik.error("Opcja --maskuj wymaga formatu wynikowego z jakością (fastq) lub "
+                       "tabeli; w pliku FASTA zamaskowane zasady N byłyby wpisami "
+                       "wadliwymi.")
+        return KOD_BLEDU_ARGUMENTOW
+    przyrostowe = utworz_przetwarzanie_przyrostowe(
+        argumenty, przebuduj=not os.path.exists(argumenty.wyjscie))
+    dopisz = przyrostowe is not None and not przyrostowe.przebudowa
+    liczniki = {} if przyrostowe is None else przyrostowe.liczniki
+    partie = oczysc_partie_wejscia(argumenty, liczniki, przyrostowe)
+
+    if argumenty.format == "fasta":
+        with otworz_plik_wyjsciowy(argumenty.wyjscie, wybierz_kompresje(argumenty),
+                                   dopisz) as f:
+            for partia, _, zachowane_indeksy in partie:
+                f.write("".join(f">{partia[i].nazwa}\n{partia[i].sekwencja}\n"
+                                for i in zachowane_indeksy))
+    elif argumenty.format == "fastq":
+        with otworz_plik_wyjsciowy(argumenty.wyjscie, wybierz_kompresje(argumenty)) as f:
+            for partia, _, zachowane_indeksy in partie:
+                f.write("".join(f"@{partia[i].nazwa}\n{partia[i].sekwencja}\n+\n"
+                                f"{partia[i].jakosc}\n" for i in zachowane_indeksy))
+    elif argumenty.format == "csv":
+        with open(argumenty.wyjscie, 'a' if dopisz else 'w', newline='') as f:
+            for numer, partia in enumerate(partie):
+                zbuduj_tabele_wynikow(*partia).to_csv(
+                    f, header=numer == 0 and not dopisz, index=False)
+    elif zapisz_tabele_kolumnowo((zbuduj_tabele_wynikow(*partia) for partia in partie),
+                                 argumenty.wyjscie, argumenty.format) is None:
+        return KOD_BLEDU_ODCZYTU
+
+    print(f"Oczyszczone dane zapisano do '{argumenty.wyjscie}'.")
+    return kod_wyjscia(liczniki)
+
+
+def polecenie_statystyki(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "statystyki": wypisuje podsumowanie oczyszczonych danych.
+
+    Sumy potrzebne do podsumowania trzymane są w licznikach, więc
+    w trybie przyrostowym są kontynuowane z punktu kontrolnego.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    import numpy as np
+
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    przyrostowe = utworz_przetwarzanie_przyrostowe(argumenty)
+    liczniki = {} if przyrostowe is None else przyrostowe.liczniki
+    liczniki.setdefault("Suma_dlugosci", 0)
+    liczniki.setdefault("Suma_GC", 0.0)
+    for typ in TYPY_SEKWENCJI:
+        liczniki.setdefault(typ, 0)
+    for _, statystyki, zachowane_indeksy in oczysc_partie_wejscia(
+            argumenty, liczniki, przyrostowe):
+        if not zachowane_indeksy:
+            continue
+        dlugosci = statystyki["Dlugosc"][zachowane_indeksy]
+        liczniki["Suma_dlugosci"] += int(dlugosci.sum())
+        liczniki["Suma_GC"] += float(statystyki["Zawartosc_GC"][zachowane_indeksy].sum())
+        liczniki["Min_dlugosc"] = min(int(dlugosci.min()),
+                                      liczniki.get("Min_dlugosc", int(dlugosci.min())))
+        liczniki["Max_dlugosc"] = max(int(dlugosci.max()), liczniki.get("Max_dlugosc", 0))
+        typy, ilosci = np.unique(statystyki["Typ_Sekwencji"][zachowane_indeksy].astype(str),
+                                 return_counts=True)
+        for typ, ilosc in zip(typy.tolist(), ilosci.tolist()):
+            liczniki[typ] += ilosc
+
+    zachowane = liczniki["Zachowane"]
+    print(f"\n--- Statystyki pliku '{argumenty.wejscie}' ---")
+    print(f"  Wpisów po oczyszczeniu: {zachowane} z {liczniki['Wczytane']}")
+    if zachowane:
+        print(f"  Długość: średnio {liczniki['Suma_dlugosci'] / zachowane:.2f} nt "
+              f"(min {liczniki['Min_dlugosc']}, max {liczniki['Max_dlugosc']})")
+        print(f"  Średnia zawartość GC: {liczniki['Suma_GC'] / zachowane:.2f}%")
+        for typ in TYPY_SEKWENCJI:
+            print(f"  {typ}: {liczniki[typ]}")
+    return kod_wyjscia(liczniki)
+
+
+def polecenie_zbierz(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "zbierz": współbieżnie wczytuje wiele plików lub katalogów
+    FASTA i zapisuje jeden oczyszczony plik FASTA.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    import asyncio
+
+    katalogi = [zrodlo for zrodlo in argumenty.zrodla if os.path.isdir(zrodlo)]
+    sciezki = [zrodlo for zrodlo in argumenty.zrodla if not os.path.isdir(zrodlo)]
+    if not all(sprawdz_plik_wejsciowy(sciezka) for sciezka in sciezki):
+        return KOD_BLEDU_ODCZYTU
+    tabela_danych, raport = asyncio.run(wczytuj_pliki_wspolbieznie(
+        sciezki, katalogi, argumenty.obserwuj, watki=argumenty.watki,
+        z_odwrotnym_komplementem=argumenty.odwrotny_komplement,
+        procesy=argumenty.procesy, pamiec_podreczna=argumenty.pamiec_podreczna))
+    with otworz_plik_wyjsciowy(argumenty.wyjscie, wybierz_kompresje(argumenty)) as f:
+        if not tabela_danych.empty:
+            f.write("".join(f">{nazwa}\n{sekwencja}\n" for nazwa, sekwencja in zip(
+                tabela_danych["Nazwa"].tolist(), tabela_danych["Sekwencja"].tolist())))
+    wypisz_raport_wczytywania(raport)
+    print(f"Oczyszczone dane zapisano do '{argumenty.wyjscie}'.")
+    if any(raport_zrodla.get("Bledy") for raport_zrodla in raport["Zrodla"].values()):
+        return KOD_BLEDU_ODCZYTU
+    return kod_wyjscia(raport["Liczniki"])
+
+
+def polecenie_scal(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "scal": czyści wiele plików FASTA poza pamięcią
+    (oczysc_pliki_poza_pamiecia) i zapisuje jeden oczyszczony plik FASTA
+    oraz tabelę pochodzenia i statystyk wszystkich wpisów.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    sciezki = rozwin_zrodla(argumenty.zrodla)
+    if not sciezki:
+        dziennik.error("Nie znaleziono plików FASTA w podanych źródłach.")
+        return KOD_BLEDU_ODCZYTU
+    if not all(sprawdz_plik_wejsciowy(sciezka) for sciezka in sciezki):
+        return KOD_BLEDU_ODCZYTU
+    liczniki = oczysc_pliki_poza_pamiecia(
+        sciezki, argumenty.wyjscie, argumenty.tabela,
+        z_odwrotnym_komplementem=argumenty.odwrotny_komplement,
+        procesy=argumenty.procesy, katalog_partycji=argumenty.katalog_partycji,
+        liczba_partycji=argumenty.partycje, kompresja=wybierz_kompresje(argumenty))
+    print(f"Oczyszczone dane zapisano do '{argumenty.wyjscie}', a tabelę wpisów "
+          f"do '{argumenty.tabela}'.")
+    return kod_wyjscia(liczniki)
+
+
+def polecenie_kmery(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "kmery": liczy widmo k-merów pliku FASTA, zapisuje je
+    jako TSV (k-mer, liczba) i wypisuje najczęstsze k-mery.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    licznik = policz_kmery_pliku(argumenty.wejscie, argumenty.k, argumenty.kanoniczne,
+                                 argumenty.procesy,
+                                 plik_widm_sekwencji=argumenty.na_sekwencje)
+    if argumenty.wyjscie:
+        kody, liczby = licznik.kody_i_liczby()
+        with open(argumenty.wyjscie, 'w', encoding='utf-8') as f:
+            f.writelines(f"{kmer}\t{liczba}\n"
+                         for kmer, liczba in zip(dekoduj_kmery(kody, argumenty.k),
+                                                 liczby.tolist()))
+    print(f"Zliczono {licznik.liczba_kmerow} k-merów (k={argumenty.k}), "
+          f"w tym różnych: {len(licznik.kody_i_liczby()[0])}.")
+    for kmer, liczba in licznik.najczestsze(argumenty.najczestsze):
+        print(f"  {kmer}\t{liczba}")
+    return 0
+
+
+def polecenie_szukaj(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "szukaj": wypisuje wystąpienia motywów (wzorzec, nazwa
+    sekwencji, pozycja od 0) z użyciem indeksu zapisanego obok pliku FASTA.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    for wzorzec in argumenty.wzorce:
+        try:
+            maski_wzorca_iupac(wzorzec)
+        except ValueError as e:
+            dziennik.error("%s", e)
+            return KOD_BLEDU_ARGUMENTOW
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    with IndeksMotywow(argumenty.wejscie, argumenty.k) as indeks:
+        for wzorzec in argumenty.wzorce:
+            trafienia = indeks.znajdz(wzorzec)
+            for nazwa, pozycja in trafienia:
+                print(f"{wzorzec}\t{nazwa}\t{pozycja}")
+            dziennik.info("Wzorzec '%s': %d wystąpień.", wzorzec, len(trafienia))
+    return 0
+
+
+def polecenie_wykresy(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "wykresy": zapisuje wykresy oczyszczonych danych do plików.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    if not sprawdz_plik_wejsciowy(argumenty.wejscie):
+        return KOD_BLEDU_ODCZYTU
+    liczniki = {}
+    histogramy = HistogramySekwencji()
+    for tabela_danych in przetworz_sekwencje_partiami(
+            iteruj_plik_sekwencji(argumenty.wejscie, liczniki),
+            z_odwrotnym_komplementem=argumenty.odwrotny_komplement,
+            procesy=argumenty.procesy, liczniki=liczniki,
+            pamiec_podreczna=argumenty.pamiec_podreczna,
+            parametry_jakosci=parametry_jakosci_z_argumentow(argumenty)):
+        histogramy.dodaj_tabele(tabela_danych)
+    wizualizuj_histogramy(histogramy, argumenty.wyjscie, argumenty.format)
+    return kod_wyjscia(liczniki)
+
+
+def polecenie_testuj(argumenty: argparse.Namespace) -> int:
+    """
+    Podpolecenie "testuj": uruchamia testy wydajności i opcjonalnie
+    porównuje je z wynikami bazowymi.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: KOD_ZNALEZIONO_PROBLEMY, jeśli wykryto regresje, w przeciwnym
+             razie 0. Bez wyników bazowych regresją jest tylko ciężki moduł
+             ładowany przy imporcie.
+    """
+    wyniki_bazowe = None
+    if argumenty.bazowe:
+        with open(argumenty.bazowe, encoding='utf-8') as f:
+            wyniki_bazowe = json.load(f)
+    wyniki = uruchom_testy_wydajnosci(argumenty.rozmiary,
+                                      katalog_korpusow=argumenty.katalog_korpusow,
+                                      ziarno=argumenty.ziarno,
+                                      sciezka_wynikow=argumenty.wyjscie)
+    if wyniki_bazowe is None:
+        return KOD_ZNALEZIONO_PROBLEMY if wyniki["Import"]["Ciezkie_moduly"] else 0
+    regresje = porownaj_z_wynikami_bazowymi(wyniki, wyniki_bazowe, argumenty.tolerancja)
+    return KOD_ZNALEZIONO_PROBLEMY if regresje else 0
+
+
+def zbuduj_parser_argumentow() -> argparse.ArgumentParser:
+    """
+    Tworzy parser argumentów wiersza poleceń.
+
+    Returns:
+        argparse.ArgumentParser: Parser z podpoleceniami generuj, waliduj,
+                                 oczysc, statystyki, zbierz, scal, kmery,
+                                 szukaj, wykresy i testuj.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="projekt",
+        description="Przetwarzanie sekwencji DNA z plików FASTA. Bez podpolecenia "
+                    "uruchamia tryb interaktywny. Kod wyjścia 0 oznacza czyste dane, "
+                    f"{KOD_ZNALEZIONO_PROBLEMY} wadliwe lub zduplikowane wpisy "
+                    f"(ich liczby są wypisywane), {KOD_BLEDU_ARGUMENTOW} błędne argumenty, "
+                    f"a {KOD_BLEDU_ODCZYTU} błąd odczytu lub zapisu.")
+    parser.add_argument("--poziom-logowania", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="minimalny poziom wypisywanych komunikatów")
+    parser.add_argument("--metryki", metavar="PLIK",
+                        help="zapisz liczniki i czasy etapów do pliku")
+    parser.add_argument("--format-metryk", default="json", choices=["json", "prometheus"],
+                        help="format pliku metryk")
+    parser.add_argument("--profil", metavar="PLIK",
+                        help="zapisz profil cProfile przebiegu do pliku")
+    parser.add_argument("--sledz-pamiec", action="store_true",
+                        help="wypisz linie alokujące najwięcej pamięci (tracemalloc)")
+    podpolecenia = parser.add_subparsers(dest="polecenie")
+
+    generuj = podpolecenia.add_parser("generuj", help="tworzy losowy plik FASTA")
+    generuj.add_argument("-o", "--wyjscie", default=NAZWA_PLIKU_FASTA,
+                         help="ścieżka tworzonego pliku FASTA")
+    generuj.add_argument("-n", "--liczba", type=int, default=MIN_LOSOWYCH_SEKWENCJI,
+                         help="liczba wszystkich wpisów")
+    generuj.add_argument("--ziarno", type=int, default=0,
+                         help="ziarno generatora liczb losowych")
+    generuj.set_defaults(funkcja=polecenie_generuj)
+
+    waliduj = podpolecenia.add_parser(
+        "waliduj", help="liczy wadliwe i zduplikowane wpisy")
+    waliduj.set_defaults(funkcja=polecenie_waliduj)
+
+    oczysc = podpolecenia.add_parser("oczysc", help="zapisuje oczyszczone dane")
+    oczysc.add_argument("-o", "--wyjscie", required=True, help="ścieżka pliku wynikowego")
+    oczysc.add_argument("-f", "--format", default="fasta",
+                        choices=["fasta", "fastq", "csv", "parquet", "arrow"],
+                        help="format pliku wynikowego")
+    oczysc.set_defaults(funkcja=polecenie_oczysc)
+
+    statystyki = podpolecenia.add_parser(
+        "statystyki", help="wypisuje podsumowanie oczyszczonych danych")
+    statystyki.set_defaults(funkcja=polecenie_statystyki)
+
+    zbierz = podpolecenia.add_parser(
+        "zbierz", help="współbieżnie czyści wiele plików lub katalogów FASTA")
+    zbierz.add_argument("zrodla", nargs="+", metavar="ZRODLO",
+                        help="plik FASTA lub katalog z plikami "
+                             f"'{WZORZEC_PLIKOW_FASTA}'")
+    zbierz.add_argument("-o", "--wyjscie", required=True,
+                        help="ścieżka oczyszczonego pliku FASTA")
+    zbierz.add_argument("--obserwuj", type=float, default=0.0, metavar="SEKUNDY",
+                        help="jak długo czekać na nowe pliki w katalogach")
+    zbierz.add_argument("--watki", type=int, default=LICZBA_WATKOW_WCZYTYWANIA,
+                        help="liczba wątków parsujących")
+    zbierz.add_argument("--odwrotny-komplement", action="store_true",
+                        help="traktuj odwrotny komplement jak duplikat")
+    zbierz.add_argument("--pamiec-podreczna", metavar="PLIK",
+                        help="baza SQLite z zapamiętanymi statystykami")
+    zbierz.set_defaults(funkcja=polecenie_zbierz)
+
+    scal = podpolecenia.add_parser(
+        "scal", help="czyści wiele plików FASTA poza pamięcią i scala wyniki")
+    scal.add_argument("zrodla", nargs="+", metavar="ZRODLO",
+                      help="plik FASTA, katalog z plikami "
+                           f"'{WZORZEC_PLIKOW_FASTA}' lub wzorzec glob")
+    scal.add_argument("-o", "--wyjscie", required=True,
+                      help="ścieżka oczyszczonego pliku FASTA")
+    scal.add_argument("-t", "--tabela", required=True,
+                      help="ścieżka tabeli CSV z pochodzeniem i statystykami wpisów")
+    scal.add_argument("--katalog-partycji",
+                      help="katalog na tymczasowe partycje; domyślnie katalog "
+                           "pliku wynikowego")
+    scal.add_argument("--partycje", type=int, metavar="N",
+                      help="liczba partycji; domyślnie według rozmiaru danych")
+    scal.add_argument("--odwrotny-komplement", action="store_true",
+                      help="traktuj odwrotny komplement jak duplikat")
+    scal.set_defaults(funkcja=polecenie_scal)
+    for podpolecenie in (oczysc, zbierz, scal):
+        podpolecenie.add_argument("--kompresja", choices=FORMATY_KOMPRESJI,
+                                  help="kompresja wynikowego pliku FASTA; domyślnie "
+                                       "według rozszerzenia (.gz, .bgz, .zst)")
+
+    kmery = podpolecenia.add_parser("kmery", help="liczy widmo k-merów")
+    kmery.add_argument("-i", "--wejscie", default=NAZWA_PLIKU_FASTA,
+                       help="ścieżka pliku FASTA")
+    kmery.add_argument("-k", type=int, required=True,
+                       choices=range(1, MAKS_DLUGOSC_KMERU + 1), metavar="K",
+                       help=f"długość k-meru (1-{MAKS_DLUGOSC_KMERU})")
+    kmery.add_argument("--kanoniczne", action="store_true",
+                       help="utożsamiaj k-mer z jego odwrotnym komplementem")
+    kmery.add_argument("-o", "--wyjscie", metavar="PLIK",
+                       help="zapisz widmo globalne jako TSV")
+    kmery.add_argument("--na-sekwencje", metavar="PLIK",
+                       help="zapisz widma poszczególnych sekwencji jako TSV")
+    kmery.add_argument("--najczestsze", type=int, default=10, metavar="N",
+                       help="liczba wypisywanych najczęstszych k-merów")
+    kmery.set_defaults(funkcja=polecenie_kmery)
+
+    szukaj = podpolecenia.add_parser(
+        "szukaj", help="wyszukuje motywy (także z kodami IUPAC) przez indeks k-merów")
+    szukaj.add_argument("wzorce", nargs="+", metavar="WZORZEC",
+                        help="wzorzec z liter ACGT lub kodów IUPAC")
+    szukaj.add_argument("-i", "--wejscie", default=NAZWA_PLIKU_FASTA,
+                        help="ścieżka pliku FASTA")
+    szukaj.add_argument("-k", type=int, default=DLUGOSC_KMERU_INDEKSU,
+                        choices=range(1, MAKS_DLUGOSC_KMERU_INDEKSU + 1), metavar="K",
+                        help="długość k-meru indeksu "
+                             f"(1-{MAKS_DLUGOSC_KMERU_INDEKSU})")
+    szukaj.set_defaults(funkcja=polecenie_szukaj)
+
+    wykresy = podpolecenia.add_parser("wykresy", help="zapisuje wykresy do plików")
+    wykresy.add_argument("-o", "--wyjscie", default=".",
+                         help="katalog na pliki wykresów")
+    wykresy.add_argument("-f", "--format", default="png", choices=["png", "svg"],
+                         help="format plików wykresów")
+    wykresy.set_defaults(funkcja=polecenie_wykresy)
+
+    testuj = podpolecenia.add_parser(
+        "testuj", help="mierzy wydajność etapów na powtarzalnych korpusach")
+    testuj.add_argument("--rozmiary", type=int, nargs="*",
+                        default=list(ROZMIARY_KORPUSOW_TESTOWYCH), metavar="N",
+                        help="liczby wpisów w korpusach testowych; bez wartości "
+                             "mierzony jest tylko czas importu")
+    testuj.add_argument("--katalog-korpusow", default=KATALOG_KORPUSOW_TESTOWYCH,
+                        help="katalog na wygenerowane korpusy")
+    testuj.add_argument("--ziarno", type=int, default=0,
+                        help="ziarno generatora korpusów")
+    testuj.add_argument("-o", "--wyjscie", metavar="PLIK",
+                        help="zapisz wyniki do pliku JSON")
+    testuj.add_argument("--bazowe", metavar="PLIK",
+                        help="plik JSON z wynikami bazowymi do porównania")
+    testuj.add_argument("--tolerancja", type=float, default=TOLERANCJA_REGRESJI,
+                        help="dopuszczalny względny wzrost czasu lub pamięci")
+    testuj.set_defaults(funkcja=polecenie_testuj)
+
+    for podpolecenie in (waliduj, oczysc, statystyki, wykresy):
+        podpolecenie.add_argument("-i", "--wejscie", default=NAZWA_PLIKU_FASTA,
+                                  help="ścieżka pliku FASTA lub FASTQ")
+        podpolecenie.add_argument("--odwrotny-komplement", action="store_true",
+                                  help="traktuj odwrotny komplement jak duplikat")
+        podpolecenie.add_argument("--pamiec-podreczna", metavar="PLIK",
+                                  help="baza SQLite z zapamiętanymi statystykami")
+        podpolecenie.add_argument("--min-jakosc", type=float, metavar="Q",
+                                  help="odrzuć odczyty FASTQ o średniej jakości Phred "
+                                       "(po przycięciu) niższej niż Q")
+        podpolecenie.add_argument("--przycinaj", type=float, metavar="Q",
+                                  help="przytnij odczyty FASTQ przed pierwszym oknem "
+                                       "o średniej jakości niższej niż Q")
+        podpolecenie.add_argument("--okno", type=int, default=DLUGOSC_OKNA_JAKOSCI,
+                                  choices=range(1, MAKS_DLUGOSC_OKNA_JAKOSCI + 1),
+                                  metavar="N",
+                                  help="długość okna przycinania "
+                                       f"(1-{MAKS_DLUGOSC_OKNA_JAKOSCI})")
+        podpolecenie.add_argument("--maskuj", type=int, metavar="Q",
+                                  choices=range(MAKS_JAKOSC_PHRED + 1),
+                                  help="zastąp przez N zasady zachowanych odczytów "
+                                       f"o jakości niższej niż Q (0-{MAKS_JAKOSC_PHRED})")
+        podpolecenie.add_argument("--min-dlugosc", type=int, metavar="N",
+                                  help="odrzuć odczyty FASTQ krótsze niż N po przycięciu")
+    for podpolecenie in (waliduj, oczysc, statystyki):
+        tryb_deduplikacji = podpolecenie.add_mutually_exclusive_group()
+        tryb_deduplikacji.add_argument("--punkt-kontrolny", metavar="PLIK",
+                                       help="przetwarzaj tylko wpisy dopisane od ostatniego "
+                                            "uruchomienia z tym punktem kontrolnym")
+        tryb_deduplikacji.add_argument("--katalog-partycji", metavar="KATALOG",
+                                       help="deduplikuj przez tymczasowe partycje na "
+                                            "dysku w tym katalogu zamiast w pamięci")
+        podpolecenie.add_argument("--szybkie-wznowienie", action="store_true",
+                                  help="przy --punkt-kontrolny sprawdzaj tylko pierwszy "
+                                       "i ostatni fragment przetworzonego prefiksu "
+                                       "(nie wykrywa zmian w jego środku)")
+    for podpolecenie in (generuj, waliduj, oczysc, statystyki, zbierz, scal, kmery,
+                         wykresy):
+        podpolecenie.add_argument("-p", "--procesy", type=int, default=1,
+                                  help="liczba procesów roboczych")
+    return parser
+
+
+def uruchom_z_wiersza_polecen(argumenty: list[str] | None = None) -> int:
+    """
+    Punkt wejścia wiersza poleceń. Bez podpolecenia uruchamia
+    interaktywną glowna_funkcja.
+
+    Args:
+        argumenty (list[str] | None): Argumenty; domyślnie sys.argv[1:].
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    argumenty = zbuduj_parser_argumentow().parse_args(argumenty)
+    skonfiguruj_logowanie(getattr(logging, argumenty.poziom_logowania))
+    try:
+        with profiluj(argumenty.profil, argumenty.sledz_pamiec):
+            if argumenty.polecenie is None:
+                glowna_funkcja()
+                return 0
+            return wykonaj_podpolecenie(argumenty)
+    finally:
+        if argumenty.metryki:
+            METRYKI.zapisz(argumenty.metryki, argumenty.format_metryk)
+
+
+def wykonaj_podpolecenie(argumenty: argparse.Namespace) -> int:
+    """
+    Otwiera pamięć podręczną (jeśli podano) i wykonuje podpolecenie,
+    zamieniając błędy odczytu i zapisu na kod wyjścia.
+
+    Args:
+        argumenty (argparse.Namespace): Sparsowane argumenty wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia programu.
+    """
+    import sqlite3
+
+    sciezka_pamieci = getattr(argumenty, "pamiec_podreczna", None)
+    try:
+        argumenty.pamiec_podreczna = (PamiecPodrecznaStatystyk(sciezka_pamieci)
+                                      if sciezka_pamieci else None)
+        try:
+            return argumenty.funkcja(argumenty)
+        finally:
+            if argumenty.pamiec_podreczna is not None:
+                argumenty.pamiec_podreczna.zamknij()
+    except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+        dziennik.error("%s", e)
+        return KOD_BLEDU_ODCZYTU
+
+
 if __name__ == "__main__":
-    glowna_funkcja()
+    sys.exit(uruchom_z_wiersza_polecen())